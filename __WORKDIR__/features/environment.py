@@ -0,0 +1,15 @@
+from __future__ import absolute_import, print_function
+import logging
+from behave.log_capture import capture
+
+def before_all(context):
+    # -- HINT: Use behave.config.logging_level from config-file
+    context.config.setup_logging()
+
+@capture
+def after_scenario(context, scenario):
+    logging.debug("THIS_LOG_MESSAGE::debug")
+    logging.info("THIS_LOG_MESSAGE::info")
+    logging.warning("THIS_LOG_MESSAGE::warning")
+    logging.error("THIS_LOG_MESSAGE::error")
+    logging.critical("THIS_LOG_MESSAGE::critical")
@@ -0,0 +1,4 @@
+Feature: F1
+  Scenario: S1
+    Given a step passes
+    When another step passes
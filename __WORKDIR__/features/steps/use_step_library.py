@@ -0,0 +1,2 @@
+import behave4cmd0.passing_steps
+import behave4cmd0.failing_steps
@@ -142,6 +142,10 @@ def run_behave(config, runner_class=None):
         print_undefined_step_snippets(runner.undefined_steps,
                                       colored=config.has_colored_mode())
 
+    step_registry = getattr(runner, "step_registry", None)
+    if config.show_match_statistics and step_registry is not None:
+        print_match_statistics(step_registry)
+
     return_code = 0
     if failed:
         return_code = 1
@@ -162,6 +166,13 @@ def print_tags_help(config):
         print("  means: {0}".format(text))
 
 
+def print_match_statistics(step_registry, file=None):
+    print_ = lambda text: print(text, file=file)
+    print_(u"STEP MATCH STATISTICS:")
+    for line in step_registry.describe_match_statistics().splitlines():
+        print_(u"  %s" % line)
+
+
 def print_language_list(file=None):
     """Print list of supported languages, like:
 
@@ -0,0 +1,57 @@
+# -*- coding: UTF-8 -*-
+"""
+Utility functions for files that are written by behave (caches, histories).
+"""
+
+from __future__ import absolute_import
+import os
+import sys
+import tempfile
+
+
+def get_default_file_mode():
+    """Provides the file mode of a new file (as created with :func:`open()`),
+    which depends on the current umask.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def replace_file(source, destination):
+    """Replaces the destination file with the source file (atomically)."""
+    if hasattr(os, "replace"):
+        os.replace(source, destination)
+    else:   # pragma: no cover
+        # -- PYTHON2: os.rename() cannot replace a file on Windows.
+        if os.path.exists(destination) and sys.platform.startswith("win"):
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+def save_file_atomically(filename, write_data, binary=False, prefix=".tmp_"):
+    """Saves a file atomically (safe for concurrent processes).
+    The data is written into a temporary file in the same directory,
+    that replaces the file afterwards. The file gets the same file mode
+    as a file that is created with :func:`open()`.
+
+    :param filename:    Name of the file to save.
+    :param write_data:  Function that writes the data (into the file object).
+    :param binary:      If true, the file is opened in binary mode.
+    :param prefix:      Filename prefix of the temporary file.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    file_descriptor, temp_filename = tempfile.mkstemp(prefix=prefix,
+                                                      dir=directory)
+    try:
+        with os.fdopen(file_descriptor, "wb" if binary else "w") as this_file:
+            write_data(this_file)
+        # -- HINT: mkstemp() creates files that only the owner can access.
+        os.chmod(temp_filename, get_default_file_mode())
+        replace_file(temp_filename, filename)
+    except Exception:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
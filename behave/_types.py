@@ -1,6 +1,7 @@
 # -*- coding: UTF-8 -*-
 """Basic types (helper classes)."""
 
+import inspect
 import sys
 import six
 if six.PY2:
@@ -10,6 +11,30 @@ else:
     import traceback
 
 
+def isawaitable(value):
+    """Checks if a value is an awaitable object, like the coroutine object
+    that is returned by an ``async def`` function (since Python 3.5).
+
+    :param value:   Value to check.
+    :return: True, if value is awaitable. False, otherwise.
+    """
+    # -- NOTE: inspect.isawaitable() is available since Python 3.5
+    #    Avoids to import asyncio module (initializes logging as side-effect).
+    # pylint: disable=no-member
+    return hasattr(inspect, "isawaitable") and inspect.isawaitable(value)
+
+
+def iscoroutinefunction(func):
+    """Checks if a function is a coroutine-function (``async def``).
+
+    :param func:    Function to check.
+    :return: True, if function is a coroutine-function. False, otherwise.
+    """
+    # pylint: disable=no-member
+    return (hasattr(inspect, "iscoroutinefunction") and
+            inspect.iscoroutinefunction(func))
+
+
 class Unknown(object):
     """Placeholder for unknown/missing information, distinguishable from None.
 
@@ -78,6 +103,23 @@ class ChainedExceptionUtil(ExceptionUtil):
         # -- ASSUMPTION: assert isinstance(exception, Exception)
         return getattr(exception, "__cause__", None)
 
+    @classmethod
+    def clear_tracebacks(cls, exception):
+        """Remove the traceback info of an exception and its chained exceptions
+        (releases the stack frames that are referenced by the tracebacks).
+        """
+        pending = [exception]
+        seen = set()
+        while pending:
+            exception = pending.pop()
+            if exception is None or id(exception) in seen:
+                continue
+            seen.add(id(exception))
+            if cls.has_traceback(exception):
+                exception.__traceback__ = None
+            pending.append(cls.get_cause(exception))
+            pending.append(getattr(exception, "__context__", None))
+
     @staticmethod
     def set_cause(exception, exc_cause):
         assert isinstance(exception, Exception)
@@ -5,10 +5,17 @@ Capture output (stdout, stderr), logs, etc.
 
 from __future__ import absolute_import
 from contextlib import contextmanager
+import logging
 import sys
+import threading
 from six import StringIO, PY2
 from behave.log_capture import LoggingCapture
 from behave.textutil import text as _text
+try:
+    import contextvars
+except ImportError:     # pragma: no cover
+    # -- PYTHON < 3.7: contextvars is not available (use thread-local data).
+    contextvars = None
 
 def add_text_to(value, more_text, separator="\n"):
     if more_text:
@@ -23,6 +30,7 @@ def add_text_to(value, more_text, separator="\n"):
 
 class Captured(object):
     """Stores and aggregates captured output data."""
+    __slots__ = ("stdout", "stderr", "log_output")
     empty = u""
     linesep = u"\n"
 
@@ -188,6 +196,222 @@ class CaptureController(object):
         return self.captured.make_report()
 
 
+# -----------------------------------------------------------------------------
+# CAPTURE SUPPORT FOR THREADS:
+# -----------------------------------------------------------------------------
+class ContextLocal(object):
+    """Holds a value for each thread (like :class:`threading.local`).
+    If :mod:`contextvars` is available, the value is stored in a context
+    variable. Therefore, an asyncio task uses the value of the thread that
+    has submitted it (a task runs with a copy of this context), even if
+    the task is run by an event loop in another thread.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._var = None
+        self._local = None
+        if contextvars is not None:
+            self._var = contextvars.ContextVar(name, default=None)
+        else:
+            self._local = threading.local()
+
+    def get(self):
+        if self._var is not None:
+            return self._var.get()
+        return getattr(self._local, "value", None)
+
+    def set(self, value):
+        if self._var is not None:
+            self._var.set(value)
+        else:
+            self._local.value = value
+
+
+class ThreadOutputStream(object):
+    """Output stream that writes the output of each thread
+    to the capture stream of this thread (if any).
+    Otherwise, the output is written to the original stream.
+    Coroutines that a thread runs on an event loop (in another thread)
+    use the capture stream of this thread, too (see :class:`ContextLocal`).
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._redirected = ContextLocal("behave.capture.stream")
+
+    @property
+    def current_stream(self):
+        return self._redirected.get() or self.stream
+
+    def redirect(self, stream=None):
+        """Redirect the output of the current thread to this stream
+        (or stop redirecting it, if None is used).
+        """
+        self._redirected.set(stream)
+
+    def write(self, text):
+        return self.current_stream.write(text)
+
+    def flush(self):
+        self.current_stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.current_stream, name)
+
+
+class ThreadLoggingHandler(logging.Handler):
+    """Logging handler that dispatches log records to the logging capture
+    of the thread that has emitted the log record
+    (or of the thread that has submitted the emitting coroutine).
+    Log records of threads without logging capture are passed to
+    the other handlers (that this handler replaces).
+    """
+
+    def __init__(self, other_handlers=None):
+        logging.Handler.__init__(self)
+        self._thread_handler = ContextLocal("behave.capture.log_handler")
+        self.other_handlers = list(other_handlers or [])
+
+    def use_handler(self, handler=None):
+        """Use a logging handler for the current thread (or None)."""
+        self._thread_handler.set(handler)
+
+    def emit(self, record):
+        # -- HINT: Log records are emitted in the context of their caller.
+        handler = self._thread_handler.get()
+        if handler is not None:
+            handler.handle(record)
+            return
+
+        # -- NOT CAPTURED: Use the replaced handlers.
+        for other_handler in self.other_handlers:
+            if record.levelno >= other_handler.level:
+                other_handler.handle(record)
+
+
+class ThreadCaptureDispatcher(object):
+    """Replaces the global output streams (stdout, stderr) and logging capture
+    once for all threads. Each thread uses its own capture controller
+    (see :class:`ThreadCaptureController`) to capture its output.
+
+    .. code-block:: python
+
+        dispatcher = ThreadCaptureDispatcher(config)
+        dispatcher.install()
+        try:
+            ...     # Start threads that use: dispatcher.make_capture_controller()
+        finally:
+            dispatcher.uninstall()
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.stdout = None
+        self.stderr = None
+        self.log_handler = None
+        self.old_stdout = None
+        self.old_stderr = None
+        self.old_log_level = None
+        self.old_log_handlers = []
+
+    def install(self):
+        if self.config.stdout_capture:
+            self.old_stdout = sys.stdout
+            self.stdout = sys.stdout = ThreadOutputStream(sys.stdout)
+        if self.config.stderr_capture:
+            self.old_stderr = sys.stderr
+            self.stderr = sys.stderr = ThreadOutputStream(sys.stderr)
+        if self.config.log_capture:
+            self.install_log_handler()
+
+    def install_log_handler(self):
+        """Replace the handlers of the root logger with the dispatching handler
+        (like :meth:`behave.log_capture.LoggingCapture.inveigle()`).
+        If the config var logging_clear_handlers is set, the handlers
+        of all other loggers are removed, too.
+        """
+        root_logger = logging.getLogger()
+        other_handlers = []
+        if self.config.logging_clear_handlers:
+            for logger in logging.Logger.manager.loggerDict.values():
+                for handler in getattr(logger, "handlers", [])[:]:
+                    self.old_log_handlers.append((logger, handler))
+                    logger.removeHandler(handler)
+        for handler in root_logger.handlers[:]:
+            self.old_log_handlers.append((root_logger, handler))
+            root_logger.removeHandler(handler)
+            if not self.config.logging_clear_handlers:
+                other_handlers.append(handler)
+
+        self.log_handler = ThreadLoggingHandler(other_handlers)
+        root_logger.addHandler(self.log_handler)
+        self.old_log_level = root_logger.level
+        root_logger.setLevel(self.config.logging_level or logging.NOTSET)
+
+    def uninstall(self):
+        if self.stdout is not None:
+            sys.stdout = self.old_stdout
+            self.stdout = self.old_stdout = None
+        if self.stderr is not None:
+            sys.stderr = self.old_stderr
+            self.stderr = self.old_stderr = None
+        if self.log_handler is not None:
+            root_logger = logging.getLogger()
+            root_logger.removeHandler(self.log_handler)
+            root_logger.setLevel(self.old_log_level)
+            self.log_handler = self.old_log_level = None
+            for logger, handler in self.old_log_handlers:
+                logger.addHandler(handler)
+            self.old_log_handlers = []
+
+    def make_capture_controller(self):
+        return ThreadCaptureController(self.config, self)
+
+
+class ThreadCaptureController(CaptureController):
+    """Capture controller for one thread.
+    The output of this thread is redirected by the dispatcher
+    instead of replacing the global output streams.
+    """
+
+    def __init__(self, config, dispatcher):
+        super(ThreadCaptureController, self).__init__(config)
+        self.dispatcher = dispatcher
+
+    def setup_capture(self, context):
+        assert context is not None
+        if self.config.stdout_capture:
+            self.stdout_capture = StringIO()
+            context.stdout_capture = self.stdout_capture
+
+        if self.config.stderr_capture:
+            self.stderr_capture = StringIO()
+            context.stderr_capture = self.stderr_capture
+
+        if self.config.log_capture:
+            self.log_capture = LoggingCapture(self.config)
+            context.log_capture = self.log_capture
+            if self.dispatcher.log_handler is not None:
+                self.dispatcher.log_handler.use_handler(self.log_capture)
+
+    def start_capture(self):
+        if self.config.stdout_capture and self.dispatcher.stdout:
+            self.dispatcher.stdout.redirect(self.stdout_capture)
+        if self.config.stderr_capture and self.dispatcher.stderr:
+            self.dispatcher.stderr.redirect(self.stderr_capture)
+
+    def stop_capture(self):
+        if self.config.stdout_capture and self.dispatcher.stdout:
+            self.dispatcher.stdout.redirect(None)
+        if self.config.stderr_capture and self.dispatcher.stderr:
+            self.dispatcher.stderr.redirect(None)
+
+    def teardown_capture(self):
+        if self.config.log_capture and self.dispatcher.log_handler:
+            self.dispatcher.log_handler.use_handler(None)
+
+
 # -----------------------------------------------------------------------------
 # UTILITY FUNCTIONS:
 # -----------------------------------------------------------------------------
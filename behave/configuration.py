@@ -62,6 +62,9 @@ if _TOML_AVAILABLE:  # pragma: no cover
 # CONSTANTS:
 # -----------------------------------------------------------------------------
 DEFAULT_RUNNER_CLASS_NAME = "behave.runner:Runner"
+PARALLEL_RUNNER_CLASS_NAME = "behave.runner_parallel:ParallelRunner"
+THREADED_RUNNER_CLASS_NAME = "behave.runner_parallel:ThreadedRunner"
+ASYNC_RUNNER_CLASS_NAME = "behave.runner_async:AsyncRunner"
 
 
 # -----------------------------------------------------------------------------
@@ -126,6 +129,12 @@ OPTIONS = [
           default=COLOR_DEFAULT, const=COLOR_DEFAULT, nargs="?",
           help="""Use colored mode or not (default: %(default)s).""")),
 
+    (("--combine-regex-matchers",),
+     dict(dest="combine_regex_matchers", action="store_true",
+          help="""Match many regular-expression based step definitions
+                  (step-matcher: "re") with one combined regular expression.
+                  Speeds up the step matching of large step libraries.""")),
+
     (("-d", "--dry-run"),
      dict(action="store_true",
           help="Invokes formatters without executing the steps.")),
@@ -136,11 +145,24 @@ OPTIONS = [
           help="""Define user-specific data for the config.userdata dictionary.
                   Example: -D foo=bar to store it in config.userdata["foo"].""")),
 
+    (("--duration-history",),
+     dict(dest="duration_history", metavar="FILE",
+          help="""Record the scenario durations in FILE (duration history).
+                  Parallel runners run the longest scenarios first
+                  (based on the duration history of the last test run).
+                  """)),
+
     (("-e", "--exclude"),
      dict(metavar="PATTERN", dest="exclude_re",
           help="""Don't run feature files matching regular expression
                   PATTERN.""")),
 
+    (("--feature-cache",),
+     dict(dest="feature_cache", metavar="FILE",
+          help="""Use FILE as persistent cache of parsed feature files.
+                  Unchanged feature files are loaded without parsing them.
+                  """)),
+
     (("-i", "--include"),
      dict(metavar="PATTERN", dest="include_re",
           help="Only run feature files matching regular expression PATTERN.")),
@@ -168,6 +190,11 @@ OPTIONS = [
                   Only supported by test runners that support parallel execution.
                   """)),
 
+    (("--parse-jobs",),
+     dict(metavar="NUMBER", dest="parse_jobs", default=1, type=positive_number,
+          help="""Number of worker processes to parse the feature files
+                  (default: %(default)s).""")),
+
     ((),  # -- CONFIGFILE only
      dict(dest="default_format", default="pretty",
           help="Specify default formatter (default: %(default)s).")),
@@ -331,6 +358,13 @@ With "strict", only tag-expressions v2 are supported (better error diagnostics).
      dict(action="store_true",
           help="Alias for --no-snippets --no-source.")),
 
+    (("--release-run-data",),
+     dict(dest="release_run_data", action="store_true",
+          help="""Release the run-time data of each feature after it was
+                  reported (streaming mode): Tracebacks are reduced to text,
+                  captured output is dropped. Keeps the memory usage flat
+                  in long test runs.""")),
+
     (("-r", "--runner"),
      dict(dest="runner", action="store", metavar="RUNNER_CLASS",
           default=DEFAULT_RUNNER_CLASS_NAME,
@@ -358,6 +392,13 @@ With "strict", only tag-expressions v2 are supported (better error diagnostics).
      dict(action="store_true",
           help="Stop running tests at the first failure.")),
 
+    (("--step-pattern-cache",),
+     dict(dest="step_pattern_cache", metavar="FILE",
+          help="""Use FILE as persistent cache of step patterns that are
+                  known to be unambiguous. Speeds up the startup of test runs
+                  with many step definitions.
+                  """)),
+
     # -- DISABLE-UNUSED-OPTION: Not used anywhere.
     # (("-S", "--strict"),
     # dict(action="store_true",
@@ -388,6 +429,11 @@ With "strict", only tag-expressions v2 are supported (better error diagnostics).
                   switch is used to override a configuration file
                   setting.""")),
 
+    (("--show-match-statistics",),
+     dict(dest="show_match_statistics", action="store_true",
+          help="""Print the step matching statistics (per step type)
+                  at the end of the run (for profiling).""")),
+
     (("-v", "--verbose"),
      dict(action="store_true",
           help="Show the files and features loaded.")),
@@ -737,23 +783,29 @@ class Configuration(object):
     # pylint: disable=too-many-instance-attributes
     defaults = dict(
         color=os.getenv("BEHAVE_COLOR", COLOR_DEFAULT),
+        combine_regex_matchers=False,
         jobs=1,
         show_snippets=True,
         show_skipped=True,
         dry_run=False,
         show_source=True,
         show_timings=True,
+        show_match_statistics=False,
         stdout_capture=True,
         stderr_capture=True,
         log_capture=True,
         logging_format="%(levelname)s:%(name)s:%(message)s",
         logging_level=logging.INFO,
         runner=DEFAULT_RUNNER_CLASS_NAME,
+        release_run_data=False,
         steps_catalog=False,
         summary=True,
         tag_expression_protocol=TagExpressionProtocol.default(),
         junit=False,
         stage=None,
+        step_pattern_cache=None,
+        duration_history=None,
+        feature_cache=None,
         userdata={},
         # -- SPECIAL:
         default_format="pretty",    # -- Used when no formatters are configured.
@@ -854,7 +906,10 @@ class Configuration(object):
         self.more_formatters = None
         self.more_runners = None
         self.runner_aliases = {
-            "default": DEFAULT_RUNNER_CLASS_NAME
+            "async": ASYNC_RUNNER_CLASS_NAME,
+            "default": DEFAULT_RUNNER_CLASS_NAME,
+            "parallel": PARALLEL_RUNNER_CLASS_NAME,
+            "threaded": THREADED_RUNNER_CLASS_NAME,
         }
 
     @classmethod
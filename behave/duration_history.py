@@ -0,0 +1,148 @@
+# -*- coding: UTF-8 -*-
+"""
+Provides a persistent history of scenario durations.
+
+The duration history stores the duration of each scenario of the last
+test run in a file. A test runner can use the duration history of
+the previous test runs to schedule the longest running scenarios first
+(for example: the parallel runner).
+
+EXAMPLE:
+
+.. code-block:: ini
+
+    # -- FILE: behave.ini
+    [behave]
+    duration_history = build/behave.duration_history.json
+"""
+
+from __future__ import absolute_import
+import io
+import json
+import os
+import six
+from behave._fileutil import save_file_atomically
+from behave.model_core import Status
+
+
+# -----------------------------------------------------------------------------
+# DURATION HISTORY:
+# -----------------------------------------------------------------------------
+class DurationHistory(object):
+    """Persistent history of scenario durations (in seconds).
+
+    Scenarios are identified by their feature filename and their name.
+    Therefore, a scenario keeps its history when lines are added
+    or removed in the feature file.
+
+    .. attribute:: entries
+
+        Scenario durations as dict (key: scenario_key, value: duration).
+
+    .. attribute:: mean_duration
+
+        Mean duration of all known scenarios (or zero).
+    """
+    FORMAT_VERSION = 1
+    RECORD_STATUS = (Status.passed, Status.failed)
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.entries = {}
+        self.used_keys = set()
+        self.mean_duration = 0.0
+        self.changed = False
+
+    @staticmethod
+    def make_key(scenario):
+        return u"%s::%s" % (scenario.filename, scenario.name)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries = {}
+        self.used_keys = set()
+        self.mean_duration = 0.0
+        self.changed = True
+
+    def update_mean_duration(self):
+        self.mean_duration = 0.0
+        if self.entries:
+            self.mean_duration = sum(self.entries.values()) / len(self.entries)
+
+    def load(self):
+        """Load the duration history from its file (if it exists).
+        An outdated or corrupted history file is ignored.
+        """
+        if not (self.filename and os.path.isfile(self.filename)):
+            return
+        try:
+            with io.open(self.filename, "r", encoding="UTF-8") as history_file:
+                data = json.load(history_file)
+            if data.get("version") != self.FORMAT_VERSION:
+                return
+            entries = dict((six.text_type(key), float(value))
+                           for key, value in data["scenarios"].items())
+        except Exception:   # pylint: disable=broad-except
+            return
+        self.entries = entries
+        self.update_mean_duration()
+
+    def save(self):
+        """Store the duration history in its file (if it has changed).
+        Entries of scenarios that were not part of this test run
+        are removed. The history file is replaced atomically.
+        """
+        if len(self.used_keys) != len(self.entries):
+            self.entries = dict((key, value) for key, value in self.entries.items()
+                                if key in self.used_keys)
+            self.update_mean_duration()
+            self.changed = True
+        if not (self.filename and self.changed):
+            return
+
+        data = dict(version=self.FORMAT_VERSION, scenarios=self.entries)
+        save_file_atomically(self.filename,
+                             lambda history_file: json.dump(
+                                 data, history_file, indent=1, sort_keys=True),
+                             prefix=".duration_history_")
+        self.changed = False
+
+    def get(self, scenario, default=None):
+        """Provides the duration of a scenario in the last test run.
+
+        :param scenario:    Scenario to use.
+        :param default:     Value to use if the scenario is unknown.
+        :return: Duration in seconds (or default value).
+        """
+        return self.entries.get(self.make_key(scenario), default)
+
+    def estimate(self, scenarios):
+        """Estimates the duration of scenarios (that are run together).
+        Unknown scenarios are estimated with the mean duration of all
+        known scenarios.
+
+        :param scenarios:   Scenarios to use.
+        :return: Estimated duration in seconds.
+        """
+        return sum(self.get(scenario, self.mean_duration)
+                   for scenario in scenarios)
+
+    def update(self, features):
+        """Records the durations of the scenarios that were run.
+        Skipped and untested scenarios keep their last recorded duration.
+
+        :param features:    Features (that were run).
+        """
+        for feature in features:
+            for scenario in feature.walk_scenarios():
+                key = self.make_key(scenario)
+                if key in self.entries:
+                    self.used_keys.add(key)
+                if scenario.status not in self.RECORD_STATUS:
+                    continue
+                self.entries[key] = round(scenario.duration, 6)
+                self.used_keys.add(key)
+                self.changed = True
+        self.update_mean_duration()
@@ -0,0 +1,191 @@
+# -*- coding: UTF-8 -*-
+"""
+Provides a persistent cache of parsed feature files.
+
+Parsing the feature files dominates the startup time of test runs
+with many feature files (and of dry-runs, like: ``--format=steps.usage``).
+This cache stores the parsed :class:`~behave.model.Feature` of each
+feature file in a file. Therefore, the next test run can load unchanged
+feature files without parsing them again.
+
+A cache entry is used only if the size and the modification time
+of the feature file and the (default) language are unchanged.
+
+EXAMPLE:
+
+.. code-block:: ini
+
+    # -- FILE: behave.ini
+    [behave]
+    feature_cache = build/behave.feature_cache
+
+.. note::
+
+    The cache file is ignored if it was created by another behave version
+    or Python version.
+"""
+
+from __future__ import absolute_import
+import os
+import pickle
+import sys
+import time
+from behave import parser
+from behave._fileutil import save_file_atomically
+from behave.version import VERSION as BEHAVE_VERSION
+
+
+# -----------------------------------------------------------------------------
+# FEATURE CACHE:
+# -----------------------------------------------------------------------------
+class FeatureCache(object):
+    """Persistent cache of parsed feature files.
+
+    Cache entries are keyed by the absolute filename of the feature file.
+    Each entry stores the file size, the file modification time,
+    the (default) language and the pickled feature.
+    The feature is unpickled on each lookup (provides a new feature object).
+
+    .. attribute:: hits
+
+        Number of feature files that were loaded from the cache.
+
+    .. attribute:: misses
+
+        Number of feature files that were parsed.
+    """
+    FORMAT_VERSION = 5
+    PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+    # -- RACY FILES: Modification time is too close to the parse time
+    #    (file could be changed again within the same timestamp granularity).
+    RACY_SECONDS = 2.0
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+
+    @classmethod
+    def make_signature(cls):
+        return (cls.FORMAT_VERSION, BEHAVE_VERSION, sys.hexversion,
+                cls.PICKLE_PROTOCOL)
+
+    @staticmethod
+    def make_file_key(filename):
+        """Provides the file properties that invalidate a cache entry."""
+        stat = os.stat(filename)
+        mtime = getattr(stat, "st_mtime_ns", None) or int(stat.st_mtime * 1e9)
+        return (stat.st_size, mtime)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries = {}
+        self.changed = True
+
+    def load(self):
+        """Load the cache entries from the cache file (if it exists).
+        An outdated or corrupted cache file is ignored.
+        """
+        if not (self.filename and os.path.isfile(self.filename)):
+            return
+        try:
+            with open(self.filename, "rb") as cache_file:
+                data = pickle.load(cache_file)
+            if data.get("signature") != self.make_signature():
+                return
+            entries = data["entries"]
+        except Exception:   # pylint: disable=broad-except
+            return
+        self.entries = entries
+
+    def save(self):
+        """Store the cache entries in the cache file (if they have changed).
+        Entries of removed feature files are discarded.
+        The cache file is replaced atomically (safe for concurrent processes).
+        """
+        if not (self.filename and self.changed):
+            return
+
+        self.entries = dict((filename, entry)
+                            for filename, entry in self.entries.items()
+                            if os.path.isfile(filename))
+        data = dict(signature=self.make_signature(), entries=self.entries)
+        save_file_atomically(self.filename,
+                             lambda cache_file: pickle.dump(
+                                 data, cache_file, self.PICKLE_PROTOCOL),
+                             binary=True, prefix=".feature_cache_")
+        self.changed = False
+
+    def get(self, filename, language=None, file_key=None):
+        """Lookup the parsed feature of a feature file.
+
+        :param filename:    Feature filename (as absolute path).
+        :param language:    Default language of the feature file (or None).
+        :param file_key:    Current file key (size, mtime) of the file.
+        :return: Feature object (or None, if unknown or outdated).
+        """
+        entry = self.entries.get(filename, None)
+        if entry is None:
+            return None
+
+        if file_key is None:
+            file_key = self.make_file_key(filename)
+        entry_file_key, entry_language, data = entry
+        if entry_file_key != file_key or entry_language != language:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception:   # pylint: disable=broad-except
+            # -- BAD CACHE ENTRY: Parse the feature file again.
+            del self.entries[filename]
+            self.changed = True
+            return None
+
+    def put(self, filename, language, feature, file_key):
+        """Store the parsed feature of a feature file in the cache.
+        Racy files (modified just before they were parsed) are not stored.
+        """
+        mtime_seconds = file_key[1] / 1e9
+        if time.time() - mtime_seconds < self.RACY_SECONDS:
+            if self.entries.pop(filename, None) is not None:
+                self.changed = True
+            return
+        try:
+            data = pickle.dumps(feature, self.PICKLE_PROTOCOL)
+        except Exception:   # pylint: disable=broad-except
+            return
+        self.entries[filename] = (file_key, language, data)
+        self.changed = True
+
+    def lookup(self, filename, language=None):
+        """Lookup the parsed feature of a feature file (and count hits/misses).
+
+        :param filename:    Feature filename (as absolute path).
+        :param language:    Default language of the feature file (or None).
+        :return: Tuple (feature, file_key). Feature is None on cache miss.
+        """
+        file_key = self.make_file_key(filename)
+        feature = self.get(filename, language, file_key)
+        if feature is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return feature, file_key
+
+    def parse_file(self, filename, language=None):
+        """Parse a feature file by using the cache (if possible).
+        Same interface as :func:`behave.parser.parse_file()`.
+        """
+        filename = os.path.abspath(filename)
+        feature, file_key = self.lookup(filename, language)
+        if feature is not None:
+            return feature
+
+        feature = parser.parse_file(filename, language=language)
+        if feature is not None:
+            self.put(filename, language, feature, file_key)
+        return feature
@@ -82,6 +82,7 @@ A fixture is used when:
 """
 
 import inspect
+from behave._types import isawaitable
 
 
 # -------------------------------------------------------------------------------
@@ -138,6 +139,27 @@ def is_context_manager(func):
     return genfunc and not iscoroutinefunction(func)
 
 
+def is_async_context_manager(func):
+    """Checks if a fixture function is an async generator-function
+    (with setup and cleanup part), like:
+
+    .. code-block:: python
+
+        @fixture
+        async def foo(context, *args, **kwargs):
+            context.foo = await setup_foo()
+            yield context.foo
+            await cleanup_foo()
+
+    :param func:    Function to check.
+    :return: True, if function is an async generator-function (since Python 3.6).
+             False, otherwise.
+    """
+    # pylint: disable=no-member
+    return (hasattr(inspect, "isasyncgenfunction") and
+            inspect.isasyncgenfunction(func))
+
+
 # -------------------------------------------------------------------------------
 # EXCEPTIONS:
 # -------------------------------------------------------------------------------
@@ -177,10 +199,32 @@ def _setup_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
         func_it = fixture_func(context, *fixture_args, **fixture_kwargs)
         context.add_cleanup(cleanup_fixture)
         setup_result = next(func_it) # SETUP-FIXTURE PART (may raise error)
+    elif is_async_context_manager(fixture_func):
+        # -- CASE: Fixture function is a two-step async generator.
+        #  The coroutines are run by the test runner (same event loop).
+        # pylint: disable=protected-access, undefined-variable
+        run_coroutine = context._runner.run_coroutine
+
+        def cleanup_async_fixture():
+            try:
+                run_coroutine(func_it.__anext__())  # CLEANUP-FIXTURE PART
+            except StopAsyncIteration:
+                return False
+            else:
+                message = "Has more than one yield: %r" % fixture_func
+                raise InvalidFixtureError(message)
+
+        func_it = fixture_func(context, *fixture_args, **fixture_kwargs)
+        context.add_cleanup(cleanup_async_fixture)
+        setup_result = run_coroutine(func_it.__anext__())
     else:
         # -- CASE: Fixture is a simple function (setup-only)
         # NOTE: No cleanup is registered (not needed by intention of user)
         setup_result = fixture_func(context, *fixture_args, **fixture_kwargs)
+        if isawaitable(setup_result):
+            # -- CASE: Fixture function is a coroutine-function (setup-only).
+            # pylint: disable=protected-access
+            setup_result = context._runner.run_coroutine(setup_result)
     return setup_result
 
 
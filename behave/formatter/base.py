@@ -95,6 +95,9 @@ class Formatter(object):
     """
     name = None
     description = None
+    # -- HINT: Uses finished scenarios of scenario outlines later on
+    #    (after they have run). Otherwise, the runner may release them.
+    needs_finished_scenarios = True
 
     def __init__(self, stream_opener, config):
         self.stream_opener = stream_opener
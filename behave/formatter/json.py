@@ -25,6 +25,7 @@ except ImportError:
 class JSONFormatter(Formatter):
     name = "json"
     description = "JSON dump of test run"
+    needs_finished_scenarios = False
     dumps_kwargs = {}
     split_text_into_lines = True   # EXPERIMENT for better readability.
 
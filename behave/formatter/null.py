@@ -10,3 +10,4 @@ class NullFormatter(Formatter):
     """
     name = "null"
     description = "Provides formatter that does not output anything."
+    needs_finished_scenarios = False
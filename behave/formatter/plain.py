@@ -20,6 +20,7 @@ class PlainFormatter(Formatter):
     """
     name = "plain"
     description = "Very basic formatter with maximum compatibility"
+    needs_finished_scenarios = False
 
     SHOW_MULTI_LINE = True
     SHOW_TAGS = False
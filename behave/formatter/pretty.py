@@ -61,6 +61,7 @@ class PrettyFormatter(Formatter):
     # pylint: disable=too-many-instance-attributes
     name = "pretty"
     description = "Standard colourised pretty formatter"
+    needs_finished_scenarios = False
 
     def __init__(self, stream_opener, config):
         super(PrettyFormatter, self).__init__(stream_opener, config)
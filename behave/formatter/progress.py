@@ -25,6 +25,7 @@ class ProgressFormatterBase(Formatter):
     A progress formatter show an abbreviated, compact dotted progress bar,
     similar to unittest output (in terse mode).
     """
+    needs_finished_scenarios = False
     # -- MAP: step.status to short dot_status representation.
     dot_status = {
         "passed":    ".",
@@ -13,10 +13,17 @@ import copy
 import inspect
 import re
 import warnings
+try:
+    # -- SINCE: Python 3.11 (sre_parse module is deprecated)
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
 import six
 import parse
 from parse_type import cfparse
-from behave._types import ChainedExceptionUtil, ExceptionUtil
+from behave._types import ChainedExceptionUtil, ExceptionUtil, isawaitable
 from behave.exception import NotSupportedWarning, ResourceExistsError
 from behave.model_core import Argument, FileLocation, Replayable
 
@@ -100,7 +107,10 @@ class Match(Replayable):
                 args.append(arg.value)
 
         with context.use_with_user_mode():
-            self.func(context, *args, **kwargs)
+            result = self.func(context, *args, **kwargs)
+            if isawaitable(result):
+                # -- ASYNC STEP: Coroutine is run by the test runner.
+                context._runner.run_coroutine(result)  # pylint: disable=protected-access
 
     @staticmethod
     def make_location(step_function):
@@ -143,6 +153,157 @@ class MatchWithError(Match):
         raise StepParseError(exc_cause=self.stored_error)
 
 
+class LazyArgument(Argument):
+    """Argument of a :class:`LazyMatch` whose value is type converted
+    on first access (for example: by a formatter in dry-run mode).
+    """
+    __slots__ = ("lazy_match", "index")
+
+    def __init__(self, lazy_match, index, argument):
+        # pylint: disable=super-init-not-called
+        # -- HINT: Argument.value slot is replaced by the value property.
+        self.start = argument.start
+        self.end = argument.end
+        self.original = argument.original
+        self.name = argument.name
+        self.lazy_match = lazy_match
+        self.index = index
+
+    @property
+    def value(self):
+        return self.lazy_match.converted_value(self.index)
+
+
+class LazyMatch(Match):
+    """Match of a step pattern where the type conversion of its arguments
+    is deferred until :meth:`evaluate()` is called.
+
+    The arguments are :class:`LazyArgument` objects. Their values are
+    type converted when they are accessed first (once for this match).
+    Detecting undefined steps performs no type conversion at all.
+
+    .. attribute:: matcher
+
+       The step matcher (step definition) that matched the step.
+
+    .. attribute:: regex_match
+
+       The regular expression match object of the step pattern.
+    """
+    type = "lazy_match"
+
+    def __init__(self, matcher, step_text, regex_match, arguments=None):
+        Match.__init__(self, matcher.func)
+        self.matcher = matcher
+        self.step_text = step_text
+        self.regex_match = regex_match
+        self.unconverted_arguments = arguments
+        if arguments is not None:
+            self.arguments = [LazyArgument(self, index, argument)
+                              for index, argument in enumerate(arguments)]
+        self._converted_values = None
+
+    def evaluate(self):
+        """Performs the type conversion of the step arguments.
+
+        :return: Match with converted arguments (or MatchWithError).
+        """
+        try:
+            arguments = self.matcher.convert_arguments(self.step_text,
+                                                       self.regex_match)
+        except Exception as e:  # pylint: disable=broad-except
+            return MatchWithError(self.func, e)
+        return Match(self.func, arguments)
+
+    def converted_value(self, index):
+        """Provides the type converted value of an argument.
+        All arguments are converted on first use.
+        If the type conversion fails, the matched text is used instead.
+        """
+        if self._converted_values is None:
+            match = self.evaluate()
+            if match.arguments is None:
+                # -- TYPE CONVERSION ERROR: Raised when the step is run.
+                values = [argument.original
+                          for argument in self.unconverted_arguments]
+            else:
+                values = [argument.value for argument in match.arguments]
+            self._converted_values = values
+        return self._converted_values[index]
+
+    def copy(self):
+        """Provides a copy of this step match (with new arguments)."""
+        return LazyMatch(self.matcher, self.step_text, self.regex_match,
+                         self.unconverted_arguments)
+
+    def run(self, context):
+        self.evaluate().run(context)
+
+
+
+
+# -----------------------------------------------------------------------------
+# SECTION: Matcher utility functions
+# -----------------------------------------------------------------------------
+_AT_BEGIN_CODES = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+_AT_END_CODES = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+
+
+def leading_word_of_regex(pattern, flags=0, match_end=False):
+    """Determine the leading word that any text matched by a regular
+    expression (with :func:`re.match()` semantics) must start with.
+    The leading word is the literal text before the first whitespace.
+
+    :param pattern:     Regular expression (as text).
+    :param flags:       Regular expression flags (as int).
+    :param match_end:   Indicates that the regex must match the whole text.
+    :return: Leading word (as string) or None (if it cannot be determined).
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:   # pylint: disable=broad-except
+        return None
+
+    chars = []
+    words_end = None
+    for op_code, value in parsed:
+        if op_code is sre_constants.LITERAL:
+            char = six.unichr(value)
+            if char.isspace():
+                words_end = True
+                break
+            chars.append(char)
+        elif op_code is sre_constants.AT and value in _AT_BEGIN_CODES:
+            if chars:
+                return None
+        elif op_code is sre_constants.AT and value in _AT_END_CODES:
+            words_end = True
+            break
+        else:
+            # -- NON-LITERAL PART: Group, repeat, alternation, char-class, ...
+            words_end = False
+            break
+    else:
+        words_end = match_end
+
+    if not (chars and words_end):
+        return None
+    return u"".join(chars)
+
+
+def leading_word_of_literal(text, match_end=False):
+    """Determine the leading word of a literal text (prefix of a pattern).
+
+    :param text:        Literal text (at the start of a pattern).
+    :param match_end:   Indicates that the literal text is the complete pattern.
+    :return: Leading word (as string) or None (if it cannot be determined).
+    """
+    if not text or text[0].isspace():
+        return None
+    word = text.split(None, 1)[0]
+    if len(word) < len(text) or match_end:
+        return word
+    return None
 
 
 # -----------------------------------------------------------------------------
@@ -160,6 +321,8 @@ class Matcher(object):
        The step function the pattern is being attached to.
     """
     schema = u"@%s('%s')"   # Schema used to describe step definition (matcher)
+    # -- CHANGE-COUNTER: Incremented whenever registered types are changed.
+    registered_types_version = 0
 
     @classmethod
     def register_type(cls, **kwargs):
@@ -208,6 +371,16 @@ class Matcher(object):
             schema = self.schema
         return schema % (step_type, self.pattern)
 
+    def leading_word(self):
+        """Provides the leading word that each step text must start with
+        to be matched by this step definition (matcher).
+        This is used to index step definitions in the step registry.
+
+        NOTE: Must be overridden by matcher classes that support this feature.
+
+        :return: Leading word (as string) or None (if unknown).
+        """
+        return None
 
     def check_match(self, step):
         """Match me against the "step" name supplied.
@@ -231,6 +404,16 @@ class Matcher(object):
             return None     # -- NO-MATCH
         return Match(self.func, result)
 
+    def lazy_match(self, step):
+        """Match me against the "step" name supplied,
+        but defer the type conversion of the arguments (if supported).
+
+        NOTE: Should be overridden by matcher classes that support this feature.
+
+        :return: Match object (or :class:`LazyMatch`) or None (if no match).
+        """
+        return self.match(step)
+
     def __repr__(self):
         return u"<%s: %r>" % (self.__class__.__name__, self.pattern)
 
@@ -241,6 +424,7 @@ class ParseMatcher(Matcher):
     """
     custom_types = {}
     parser_class = parse.Parser
+    FIELD_START_PATTERN = re.compile(u"[{}]")
 
     @classmethod
     def register_type(cls, **kwargs):
@@ -277,10 +461,12 @@ class ParseMatcher(Matcher):
                 assert isinstance(amount, int)
         """
         cls.custom_types.update(**kwargs)
+        Matcher.registered_types_version += 1
 
     @classmethod
     def clear_registered_types(cls):
         cls.custom_types.clear()
+        Matcher.registered_types_version += 1
 
 
     def __init__(self, func, pattern, step_type=None):
@@ -292,13 +478,79 @@ class ParseMatcher(Matcher):
         # -- OVERWRITTEN: Pattern as regex text.
         return self.parser._expression  # pylint: disable=protected-access
 
+    def leading_word(self):
+        # -- HINT: parse.Parser matches the complete step text.
+        if not isinstance(self.parser, parse.Parser):
+            return leading_word_of_regex(self.regex_pattern, match_end=True)
+
+        # -- FAST-PATH: Text before the first field (or brace) is literal text.
+        field_start = self.FIELD_START_PATTERN.search(self.pattern)
+        if field_start is None:
+            return leading_word_of_literal(self.pattern, match_end=True)
+        return leading_word_of_literal(self.pattern[:field_start.start()])
+
     def check_match(self, step):
         # -- FAILURE-POINT: Type conversion of parameters may fail here.
         #    NOTE: Type converter should raise ValueError in case of PARSE ERRORS.
         result = self.parser.parse(step)
         if not result:
             return None
+        return self.make_arguments(step, result)
+
+    def lazy_match(self, step):
+        # -- NO TYPE CONVERSION: Only check if the step pattern matches.
+        result = self.parser.parse(step, evaluate_result=False)
+        if not result:
+            return None
+
+        arguments = self.make_unconverted_arguments(step, result.match)
+        if arguments is None:
+            # -- UNSUPPORTED PARSER: Missing parse.Parser internals.
+            return self.match(step)
+        return LazyMatch(self, step, result.match, arguments)
+
+    def make_unconverted_arguments(self, step, regex_match):
+        """Provides the arguments of a step pattern match without
+        type conversion (matched text is used as value).
+
+        :return: List of arguments (or None, if not supported by parser).
+        """
+        # pylint: disable=protected-access
+        parser = self.parser
+        try:
+            fixed_fields = parser._fixed_fields
+            named_fields = parser._named_fields
+            group_to_name_map = parser._group_to_name_map
+        except AttributeError:
+            return None
 
+        args = []
+        for index in fixed_fields:
+            start, end = regex_match.span(index + 1)
+            text = step[start:end]
+            args.append(Argument(start, end, text, text))
+        for group_name in named_fields:
+            start, end = regex_match.span(group_name)
+            text = step[start:end]
+            name = group_to_name_map[group_name]
+            args.append(Argument(start, end, text, text, name))
+        args.sort(key=lambda x: x.start)
+        return args
+
+    def convert_arguments(self, step, regex_match):
+        """Performs the type conversion of the step arguments
+        of a step pattern match.
+
+        :param step:    Step text (as string).
+        :param regex_match: Regex match object of the step pattern.
+        :return: List of arguments (with type-converted values).
+        """
+        # -- FAILURE-POINT: Type conversion of parameters may fail here.
+        result = self.parser.evaluate_result(regex_match)
+        return self.make_arguments(step, result)
+
+    @staticmethod
+    def make_arguments(step, result):
         args = []
         for index, value in enumerate(result.fixed):
             start, end = result.spans[index]
@@ -338,6 +590,8 @@ class RegexMatcher(Matcher):
         super(RegexMatcher, self).__init__(func, pattern, step_type)
         self.regex = re.compile(self.pattern)
 
+    def leading_word(self):
+        return leading_word_of_regex(self.regex.pattern, self.regex.flags)
 
     def check_match(self, step):
         m = self.regex.match(step)
@@ -385,6 +639,175 @@ class CucumberRegexMatcher(RegexMatcher):
     """
 
 
+class CombinedRegexMatcher(object):
+    """Matches a step text against many regex-based step definitions at once.
+    The regular expressions of all step definitions are combined into one
+    alternation where each alternative ends with an empty sentinel group.
+    Therefore, one :meth:`re.match()` call finds the first step definition
+    (in the given order) that matches. Only this step definition is used
+    afterwards to extract the step parameters.
+
+    Only step definitions that use the matching logic of :class:`RegexMatcher`
+    can be combined (see :meth:`can_combine()`).
+    Regular expressions with backreferences, conditional groups,
+    global inline flags or other regex flags are not combinable.
+    A combined matcher uses at most :attr:`MAX_SIZE` step definitions,
+    because Python 2.7 supports only 100 groups per regular expression.
+
+    .. note::
+
+        The groups in each alternative are converted into non-capturing groups.
+        Otherwise, the regex engine must save/restore all group marks
+        for each alternative (which is slower than sequential matching).
+    """
+    DEFAULT_FLAGS = re.compile(u"").flags
+    MAX_SIZE = 99
+
+    def __init__(self, matchers):
+        self.matchers = list(matchers)
+        parts = []
+        for matcher in self.matchers:
+            pattern = self.make_combinable_pattern(matcher.regex.pattern)
+            assert pattern is not None, "NOT COMBINABLE: %r" % matcher
+            parts.append(u"(?:%s)()" % pattern)
+        self.regex = re.compile(u"|".join(parts))
+
+    @staticmethod
+    def make_non_capturing(pattern):
+        """Convert all (named) groups of a regular expression into
+        non-capturing groups.
+
+        :param pattern: Regular expression (as text).
+        :return: Converted regular expression or None (if not supported).
+        """
+        # pylint: disable=too-many-branches
+        parts = []
+        in_class = False
+        index = 0
+        size = len(pattern)
+        while index < size:
+            char = pattern[index]
+            if char == "\\":
+                next_char = pattern[index+1:index+2]
+                if next_char.isdigit() and not in_class:
+                    return None     # -- BACKREFERENCE: Needs captured group.
+                parts.append(pattern[index:index+2])
+                index += 2
+            elif in_class:
+                in_class = (char != "]")
+                parts.append(char)
+                index += 1
+            elif char == "[":
+                # -- CHAR-CLASS: "]" is a literal char directly after "[" or "[^"
+                in_class = True
+                class_start = index + 1
+                if pattern[class_start:class_start+1] == "^":
+                    class_start += 1
+                if pattern[class_start:class_start+1] == "]":
+                    class_start += 1
+                parts.append(pattern[index:class_start])
+                index = class_start
+            elif pattern.startswith(u"(?P<", index):
+                group_end = pattern.find(u">", index)
+                if group_end < 0:
+                    return None
+                parts.append(u"(?:")
+                index = group_end + 1
+            elif (pattern.startswith(u"(?P=", index) or
+                  pattern.startswith(u"(?(", index)):
+                return None     # -- BACKREFERENCE or CONDITIONAL GROUP
+            elif char == "(" and not pattern.startswith(u"(?", index):
+                parts.append(u"(?:")
+                index += 1
+            else:
+                parts.append(char)
+                index += 1
+        return u"".join(parts)
+
+    @classmethod
+    def make_combinable_pattern(cls, pattern):
+        """Convert a regular expression into an alternative that can be
+        used in the combined regular expression.
+
+        :param pattern: Regular expression (as text).
+        :return: Converted regular expression or None (if not combinable).
+        """
+        new_pattern = cls.make_non_capturing(pattern)
+        if new_pattern is None:
+            return None
+        try:
+            regex = re.compile(pattern)
+            new_regex = re.compile(u"(?:%s)" % new_pattern)
+        except (re.error, TypeError):
+            return None
+        if regex.flags != cls.DEFAULT_FLAGS or new_regex.groups != 0:
+            return None
+        return new_pattern
+
+    @classmethod
+    def can_combine(cls, matcher):
+        """Check if a step definition (matcher) can be combined."""
+        this_class = type(matcher)
+        return (isinstance(matcher, RegexMatcher) and
+                this_class.check_match is RegexMatcher.check_match and
+                this_class.match is Matcher.match and
+                isinstance(getattr(matcher.regex, "pattern", None),
+                           six.string_types) and
+                getattr(matcher.regex, "flags", None) == cls.DEFAULT_FLAGS and
+                cls.make_combinable_pattern(matcher.regex.pattern) is not None)
+
+    def match(self, step):
+        m = self.regex.match(step)
+        if not m:
+            return None
+
+        # -- HINT: Sentinel group number N belongs to the N-th alternative.
+        matcher = self.matchers[m.lastindex - 1]
+        return matcher.match(step)
+
+    def lazy_match(self, step):
+        # -- HINT: Regex matchers provide no type conversion.
+        return self.match(step)
+
+    def __repr__(self):
+        return u"<%s: %d matchers>" % (self.__class__.__name__,
+                                       len(self.matchers))
+
+
+def combine_regex_matchers(matchers, min_size=2):
+    """Replace each sequence of combinable regex-based matchers
+    with a :class:`CombinedRegexMatcher` (ordering is preserved).
+
+    :param matchers:    Sequence of step definitions (matchers).
+    :param min_size:    Minimal size of a sequence that is combined.
+    :return: List of matchers (and combined matchers).
+    """
+    combined = []
+    sequence = []
+
+    def flush_sequence():
+        if len(sequence) >= min_size:
+            try:
+                combined.append(CombinedRegexMatcher(sequence))
+            except (re.error, AssertionError, OverflowError, RuntimeError):
+                # -- FALLBACK: Use each matcher on its own.
+                combined.extend(sequence)
+        else:
+            combined.extend(sequence)
+        del sequence[:]
+
+    for matcher in matchers:
+        if CombinedRegexMatcher.can_combine(matcher):
+            sequence.append(matcher)
+            if len(sequence) >= CombinedRegexMatcher.MAX_SIZE:
+                flush_sequence()
+            continue
+        flush_sequence()
+        combined.append(matcher)
+    flush_sequence()
+    return combined
+
+
 # -----------------------------------------------------------------------------
 # STEP MATCHER FACTORY (for public API)
 # -----------------------------------------------------------------------------
@@ -494,10 +917,12 @@ class StepMatcherFactory(object):
         A type converter should follow the rules of its :class:`Matcher` class.
         """
         self.current_matcher.register_type(**kwargs)
+        Matcher.registered_types_version += 1
 
     def clear_registered_types(self):
         for step_matcher_class in self.matcher_mapping.values():
             step_matcher_class.clear_registered_types()
+        Matcher.registered_types_version += 1
 
     def register_step_matcher_class(self, name, step_matcher_class,
                                     override=False):
@@ -15,6 +15,7 @@ import copy
 import difflib
 import logging
 import itertools
+import re
 import time
 import six
 from six.moves import zip       # pylint: disable=redefined-builtin
@@ -181,6 +182,14 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
         for run_item in self.run_items:
             run_item.reset()
 
+    def release_run_data(self):
+        """Release heavy run-time data after this entity was reported."""
+        super(ScenarioContainer, self).release_run_data()
+        if self.background:
+            self.background.release_run_data()
+        for run_item in self.run_items:
+            run_item.release_run_data()
+
     def _setup_context_for_run(self, context):
         """Setup/Init runner context for run."""
         # -- OVERRIDDEN: By derived classes.
@@ -835,6 +844,12 @@ class Background(BasicStatement, Replayable):
             duration += step.duration
         return duration
 
+    def release_run_data(self):
+        """Release heavy run-time data after this background was reported."""
+        super(Background, self).release_run_data()
+        for step in self.steps:
+            step.release_run_data()
+
     def __repr__(self):
         return '<Background "%s">' % self.name
 
@@ -952,6 +967,13 @@ class Scenario(TagAndStatusStatement, Replayable):
         for step in self.all_steps:
             step.reset()
 
+    def release_run_data(self):
+        """Release heavy run-time data after this scenario was reported."""
+        super(Scenario, self).release_run_data()
+        # -- AVOID: Lazy copy of background steps (if not used until now).
+        for step in itertools.chain(self._background_steps or [], self.steps):
+            step.release_run_data()
+
     @property
     def use_background(self):
         """Indicates if the background is/would be used (if any exists).
@@ -1173,7 +1195,10 @@ class Scenario(TagAndStatusStatement, Replayable):
                     step.status = Status.skipped
                     if dry_run_scenario:
                         step.status = Status.untested
-                    found_step_match = runner.step_registry.find_match(step)
+                    # -- LAZY MATCH: Type conversion on first argument access
+                    #    (by formatters in dry-run mode).
+                    found_step_match = runner.step_registry.find_match(
+                        step, evaluate=False)
                     if not found_step_match:
                         step.status = Status.undefined
                         runner.undefined_steps.append(step)
@@ -1222,6 +1247,90 @@ class Scenario(TagAndStatusStatement, Replayable):
         return failed
 
 
+class PlaceholderValues(object):
+    """Values of the placeholders for rendering a :class:`PlaceholderTemplate`.
+    Row values are used before params (like in
+    :meth:`ScenarioOutlineBuilder.render_template()`).
+
+    :param row:     As placeholder provider (dict-like).
+    :param params:  As additional placeholder provider (as dict).
+    """
+
+    def __init__(self, row=None, params=None):
+        self.row = row
+        self.params = params
+        self._values = None
+
+    @property
+    def values(self):
+        """Placeholder values by name (as dict, computed on first use)."""
+        if self._values is None:
+            values = dict(self.params or {})
+            if self.row:
+                # -- DUPLICATED HEADINGS: First column wins.
+                values.update(reversed(list(self.row.items())))
+            self._values = values
+        return self._values
+
+
+class PlaceholderTemplate(object):
+    """Text template with placeholders, ala "Hello <name>".
+    The text is tokenised once into literal text parts and placeholder names.
+    Therefore, rendering the template is a single join.
+
+    The result is the same as with
+    :meth:`ScenarioOutlineBuilder.render_template()`:
+    Unknown placeholders remain unchanged. Templates or values that could
+    compose new placeholders (by using "<" or ">") are rendered by replacing
+    one placeholder after the other.
+    """
+    PLACEHOLDER_PATTERN = re.compile(u"<([^<>]*)>")
+
+    def __init__(self, text):
+        self.text = text
+        self.has_placeholders = "<" in text and ">" in text
+        parts = self.PLACEHOLDER_PATTERN.split(text)
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+        self.is_simple = not any(("<" in literal or ">" in literal)
+                                 for literal in self.literals)
+
+    def render(self, values):
+        """Render the template with the placeholder values.
+
+        :param values:  Placeholder values (as :class:`PlaceholderValues`).
+        :return: Rendered text, known placeholders are substituted w/ values.
+        """
+        if not self.has_placeholders:
+            return self.text
+        elif not self.is_simple:
+            return ScenarioOutlineBuilder.render_template(self.text,
+                                                          values.row,
+                                                          values.params)
+
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = values.values.get(name, None)
+            if value is None:
+                value = u"<%s>" % name
+            elif "<" in value or ">" in value:
+                # -- OOPS: Value could compose a placeholder.
+                return ScenarioOutlineBuilder.render_template(self.text,
+                                                              values.row,
+                                                              values.params)
+            parts.append(value)
+            parts.append(literal)
+        return u"".join(parts)
+
+
+class PlaceholderTemplates(dict):
+    """Compiled placeholder templates by their text (compiled on first use)."""
+
+    def __missing__(self, text):
+        template = self[text] = PlaceholderTemplate(text)
+        return template
+
+
 class ScenarioOutlineBuilder(object):
     """Helper class to use a ScenarioOutline as a template and
     build its scenarios (as template instances).
@@ -1232,6 +1341,7 @@ class ScenarioOutlineBuilder(object):
         if annotation_schema is None:
             annotation_schema = self.__class__.annotation_schema
         self.annotation_schema = annotation_schema
+        self.templates = PlaceholderTemplates()
 
     @staticmethod
     def render_template(text, row=None, params=None):
@@ -1275,9 +1385,11 @@ class ScenarioOutlineBuilder(object):
         params.setdefault("row.id", row.id)
 
         # -- STEP: Replace placeholders in scenario/example name (if any).
-        examples_name = self.render_template(example.name, row, params)
+        values = PlaceholderValues(row, params)
+        examples_name = self.templates[example.name].render(values)
         params["examples.name"] = examples_name
-        scenario_name = self.render_template(outline_name, row, params)
+        values = PlaceholderValues(row, params)
+        scenario_name = self.templates[outline_name].render(values)
 
         class Data(object):
             def __init__(self, name, index):
@@ -1295,14 +1407,19 @@ class ScenarioOutlineBuilder(object):
         return "<" in tag and ">" in tag
 
     @classmethod
-    def make_row_tags(cls, outline_tags, row, params=None):
+    def make_row_tags(cls, outline_tags, row, params=None, templates=None):
         if not outline_tags:
             return []
+        if templates is None:
+            templates = PlaceholderTemplates()
 
         tags = []
+        values = None
         for tag in outline_tags:
             if cls.is_parametrized_tag(tag):
-                tag = cls.render_template(tag, row, params)
+                if values is None:
+                    values = PlaceholderValues(row, params)
+                tag = templates[tag].render(values)
             if cls.is_parametrized_tag(tag):
                 # -- OOPS: Unknown placeholder, drop tag.
                 continue
@@ -1310,37 +1427,60 @@ class ScenarioOutlineBuilder(object):
             tags.append(new_tag)
         return tags
 
+    @staticmethod
+    def has_table_placeholders(table):
+        if any("<" in cell for cell in table.headings):
+            return True
+        return any("<" in cell for row in table.rows for cell in row.cells)
+
+    @staticmethod
+    def render_table(table, values, templates):
+        """Render the headings and cells of a table template (as new table)."""
+        headings = [templates[cell].render(values) for cell in table.headings]
+        new_table = Table(headings, line=table.line)
+        for table_row in table.rows:
+            cells = [templates[cell].render(values) for cell in table_row.cells]
+            new_table.rows.append(Row(new_table.headings, cells, table_row.line,
+                                      table_row.comments))
+        return new_table
+
     @classmethod
-    def make_step_for_row(cls, outline_step, row, params=None):
+    def make_step_for_row(cls, outline_step, row, params=None, templates=None):
+        """Build the step of a scenario (for an example row) from an outline step.
+        The new step shares the immutable data of the outline step (and its
+        table if it has no placeholders: the table is copied on first run).
+        """
         # -- BASED-ON: new_step = outline_step.set_values(row)
-        new_step = copy.deepcopy(outline_step)
-        new_step.name = cls.render_template(new_step.name, row, params)
-        if new_step.text:
-            new_step.text = cls.render_template(new_step.text, row)
-        if new_step.table:
-            for name, value in row.items():
-                placeholder = u"<%s>" % name
-                for i, cell in enumerate(new_step.table.headings):
-                    new_step.table.headings[i] = cell.replace(placeholder, value)
-                for step_row in new_step.table:
-                    for i, cell in enumerate(step_row.cells):
-                        step_row.cells[i] = cell.replace(placeholder, value)
+        if templates is None:
+            templates = PlaceholderTemplates()
+        row_values = PlaceholderValues(row)
+        name = templates[outline_step.name].render(
+            PlaceholderValues(row, params))
+        text = outline_step.text
+        if text:
+            new_text = templates[text].render(row_values)
+            if new_text is not text:
+                text = Text(new_text, text.content_type, text.line)
+        table = outline_step.table
+        table_is_shared = bool(table) and not cls.has_table_placeholders(table)
+        if table and not table_is_shared:
+            table = cls.render_table(table, row_values, templates)
+
+        new_step = Step(outline_step.filename, outline_step.line,
+                        outline_step.keyword, outline_step.step_type, name,
+                        text=text, table=table)
+        new_step.table_is_shared = table_is_shared
         return new_step
 
-    def build_scenarios(self, scenario_outline):
-        """Build scenarios for a ScenarioOutline from its examples."""
-        # -- BUILD SCENARIOS (once): For this ScenarioOutline from examples.
-        params = {
-            "examples.name": None,
-            "examples.index": None,
-            "row.index": None,
-            "row.id": None,
-        }
-        scenarios = []
+    @staticmethod
+    def collect_rows(scenario_outline):
+        """Collect the example rows of a ScenarioOutline (and number them).
+
+        :return: List of (example, row) tuples (one per scenario to build).
+        """
+        rows = []
         for example_index, example in enumerate(scenario_outline.examples):
             example.index = example_index+1
-            params["examples.name"] = example.name
-            params["examples.index"] = _text(example.index)
             if not example.table:
                 # -- SYNDROME: Examples keyword without table
                 print("ERROR: ScenarioOutline.Examples: Has NO-TABLE syndrome ({0})"\
@@ -1350,30 +1490,157 @@ class ScenarioOutlineBuilder(object):
             for row_index, row in enumerate(example.table):
                 row.index = row_index+1
                 row.id = "%d.%d" % (example.index, row.index)
-                params["row.id"] = row.id
-                params["row.index"] = _text(row.index)
-                scenario_name = self.make_scenario_name(scenario_outline.name,
-                                                        example, row, params)
-                row_tags = self.make_row_tags(scenario_outline.tags, row, params)
-                row_tags.extend(example.tags)
-                new_steps = []
-                for outline_step in scenario_outline.steps:
-                    new_step = self.make_step_for_row(outline_step, row, params)
-                    new_steps.append(new_step)
-
-                # -- STEP: Make Scenario name for this row.
-                # scenario_line = example.line + 2 + row_index
-                scenario_line = row.line
-                scenario = Scenario(scenario_outline.filename, scenario_line,
-                                    scenario_outline.keyword,
-                                    scenario_name, row_tags, new_steps)
-                scenario.feature = scenario_outline.feature
-                scenario.parent = scenario_outline
-                scenario.background = scenario_outline.background
-                scenario.description = scenario_outline.description
-                scenario._row = row     # pylint: disable=protected-access
-                scenarios.append(scenario)
-        return scenarios
+                rows.append((example, row))
+        return rows
+
+    def build_scenario(self, scenario_outline, example, row, with_steps=True):
+        """Build the scenario of a ScenarioOutline for one example row.
+
+        :param scenario_outline:  ScenarioOutline to use (as template).
+        :param example:     Examples object of this row.
+        :param row:         Row of the example (from :meth:`collect_rows()`).
+        :param with_steps:  If False, the scenario is built without steps.
+        :return: Scenario object.
+        """
+        params = {
+            "examples.name": example.name,
+            "examples.index": _text(example.index),
+            "row.index": _text(row.index),
+            "row.id": row.id,
+        }
+        scenario_name = self.make_scenario_name(scenario_outline.name,
+                                                example, row, params)
+        row_tags = self.make_row_tags(scenario_outline.tags, row, params,
+                                      self.templates)
+        row_tags.extend(example.tags)
+        new_steps = []
+        if with_steps:
+            for outline_step in scenario_outline.steps:
+                new_step = self.make_step_for_row(outline_step, row, params,
+                                                  self.templates)
+                new_steps.append(new_step)
+
+        # -- STEP: Make Scenario name for this row.
+        # scenario_line = example.line + 2 + row_index
+        scenario_line = row.line
+        scenario = Scenario(scenario_outline.filename, scenario_line,
+                            scenario_outline.keyword,
+                            scenario_name, row_tags, new_steps)
+        scenario.feature = scenario_outline.feature
+        scenario.parent = scenario_outline
+        scenario.background = scenario_outline.background
+        scenario.description = scenario_outline.description
+        scenario._row = row     # pylint: disable=protected-access
+        return scenario
+
+    def build_scenarios(self, scenario_outline):
+        """Build scenarios for a ScenarioOutline from its examples."""
+        return [self.build_scenario(scenario_outline, example, row)
+                for example, row in self.collect_rows(scenario_outline)]
+
+
+class ReleasedScenario(object):
+    """Placeholder for a scenario of a ScenarioOutline that has finished
+    and was released (to free memory). Keeps only its results.
+    """
+
+    def __init__(self, scenario):
+        self.filename = scenario.filename
+        self.line = scenario.line
+        self.name = scenario.name
+        self.status = scenario.status
+        self.duration = scenario.duration
+
+    def __repr__(self):
+        return '<ReleasedScenario "%s">' % self.name
+
+    def skip(self, reason=None, require_not_executed=False):
+        # -- FINISHED SCENARIO: Nothing left to skip.
+        pass
+
+    def release_run_data(self):
+        # -- RELEASED SCENARIO: Nothing left to release.
+        pass
+
+
+class OutlineScenarios(object):
+    """Lazy sequence of the scenarios of a ScenarioOutline.
+
+    A scenario is built when it is accessed for the first time
+    (by iteration or by index). Each scenario is built only once.
+    A finished scenario can be released (see: :meth:`release()`).
+    """
+
+    def __init__(self, scenario_outline, builder):
+        self.scenario_outline = scenario_outline
+        self.builder = builder
+        self.rows = builder.collect_rows(scenario_outline)
+        self._scenarios = [None] * len(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __bool__(self):
+        return bool(self.rows)
+    __nonzero__ = __bool__  # -- PYTHON2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("OutlineScenarios index out of range")
+
+        scenario = self._scenarios[index]
+        if scenario is None:
+            example, row = self.rows[index]
+            scenario = self.builder.build_scenario(self.scenario_outline,
+                                                   example, row)
+            self._scenarios[index] = scenario
+        return scenario
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return "<OutlineScenarios: %d scenario(s), %d built>" % \
+               (len(self), len(self.built_scenarios()))
+
+    def built_scenarios(self):
+        """Provides the scenarios that were built (or released) until now."""
+        return [scenario for scenario in self._scenarios if scenario is not None]
+
+    def peek(self, index):
+        """Provides the scenario at this index (without building its steps,
+        if it was not built until now). Useful for selection by tags or name.
+        """
+        scenario = self._scenarios[index]
+        if not isinstance(scenario, Scenario):
+            example, row = self.rows[index]
+            scenario = self.builder.build_scenario(self.scenario_outline,
+                                                   example, row,
+                                                   with_steps=False)
+        return scenario
+
+    def all_built(self):
+        """Indicates if all scenarios were built (or released) until now."""
+        return all(scenario is not None for scenario in self._scenarios)
+
+    def release(self, index):
+        """Releases a finished scenario (only its results are kept)."""
+        scenario = self._scenarios[index]
+        if isinstance(scenario, Scenario):
+            self._scenarios[index] = ReleasedScenario(scenario)
+
+    def reset(self):
+        for index, scenario in enumerate(self._scenarios):
+            if isinstance(scenario, ReleasedScenario):
+                # -- REBUILD LATER: As new scenario (without results).
+                self._scenarios[index] = None
+            elif scenario is not None:
+                scenario.reset()
 
 
 class ScenarioOutline(Scenario):
@@ -1464,22 +1731,49 @@ class ScenarioOutline(Scenario):
     def reset(self):
         """Reset runtime temporary data like before a test run."""
         super(ScenarioOutline, self).reset()
+        if isinstance(self._scenarios, OutlineScenarios):
+            self._scenarios.reset()
+            return
         for scenario in self._scenarios:    # -- AVOID: BUILD-SCENARIOS
             scenario.reset()
 
+    def release_run_data(self):
+        """Release heavy run-time data after this scenario outline
+        (and its scenarios) was reported.
+        """
+        super(ScenarioOutline, self).release_run_data()
+        for scenario in self._built_scenarios():    # -- AVOID: BUILD-SCENARIOS
+            scenario.release_run_data()
+
     @property
     def scenarios(self):
         """Return the scenarios with the steps altered to take the values from
         the examples.
+
+        The scenarios are provided as lazy sequence: A scenario is built
+        when it is used for the first time (see: :class:`OutlineScenarios`).
         """
         if self._scenarios:
             return self._scenarios
 
-        # -- BUILD SCENARIOS (once): For this ScenarioOutline from examples.
+        # -- PREPARE SCENARIOS (once): For this ScenarioOutline from examples.
         builder = ScenarioOutlineBuilder(self.annotation_schema)
-        self._scenarios = builder.build_scenarios(self)
+        self._scenarios = OutlineScenarios(self, builder)
         return self._scenarios
 
+    def _built_scenarios(self):
+        """Provides the scenarios that were built until now."""
+        if isinstance(self._scenarios, OutlineScenarios):
+            return self._scenarios.built_scenarios()
+        return self._scenarios
+
+    def _peek_scenarios(self):
+        """Provides all scenarios (unbuilt scenarios without steps)."""
+        scenarios = self.scenarios
+        if isinstance(scenarios, OutlineScenarios):
+            return (scenarios.peek(index) for index in range(len(scenarios)))
+        return scenarios
+
     @property
     def effective_tags(self):
         """Compute effective tags of this ScenarioOutline/ScenarioTemplate.
@@ -1508,12 +1802,20 @@ class ScenarioOutline(Scenario):
 
     def compute_status(self):
         skipped_count = 0
-        for scenario in self._scenarios:    # -- AVOID: BUILD-SCENARIOS
+        untested = False
+        scenarios = self._built_scenarios()
+        for scenario in scenarios:
             scenario_status = scenario.status
-            if scenario_status in (Status.failed, Status.untested):
+            if scenario_status == Status.failed:
                 return scenario_status
+            elif scenario_status == Status.untested:
+                untested = True
             elif scenario_status == Status.skipped:
                 skipped_count += 1
+        if untested or (isinstance(self._scenarios, OutlineScenarios) and
+                        not self._scenarios.all_built()):
+            # -- NOT-BUILT SCENARIOS: Were not run until now (untested).
+            return Status.untested
         if skipped_count > 0 and skipped_count == len(self._scenarios):
             # -- ALL SKIPPED:
             return Status.skipped
@@ -1523,7 +1825,7 @@ class ScenarioOutline(Scenario):
     @property
     def duration(self):
         outline_duration = 0
-        for scenario in self._scenarios:    # -- AVOID: BUILD-SCENARIOS
+        for scenario in self._built_scenarios():    # -- AVOID: BUILD-SCENARIOS
             outline_duration += scenario.duration
         return outline_duration
 
@@ -1537,7 +1839,7 @@ class ScenarioOutline(Scenario):
         if tag_expression.check(self.effective_tags):
             return True
 
-        for scenario in self.scenarios:     # -- REQUIRE: BUILD-SCENARIOS
+        for scenario in self._peek_scenarios():     # -- HINT: Without steps.
             if scenario.should_run_with_tags(tag_expression):
                 return True
         # -- NOTHING SELECTED:
@@ -1552,7 +1854,7 @@ class ScenarioOutline(Scenario):
         if not config.name:
             return True # -- SELECT-ALL: Select by name is not specified.
 
-        for scenario in self.scenarios:     # -- REQUIRE: BUILD-SCENARIOS
+        for scenario in self._peek_scenarios():     # -- HINT: Without steps.
             if scenario.should_run_with_name_select(config):
                 return True
         # -- NOTHING SELECTED:
@@ -1592,9 +1894,14 @@ class ScenarioOutline(Scenario):
         # REASON: context._set_root_attribute(), scenario._row
         self.clear_status()
         failed_count = 0
-        for scenario in self.scenarios:     # -- REQUIRE: BUILD-SCENARIOS
+        scenarios = self.scenarios  # -- HINT: Builds each scenario when used.
+        release = (isinstance(scenarios, OutlineScenarios) and
+                   getattr(runner, "release_outline_scenarios", False) is True)
+        for index, scenario in enumerate(scenarios):
             runner.context._set_root_attribute("active_outline", scenario._row)
             failed = scenario.run(runner)
+            if release:
+                scenarios.release(index)
             if failed:
                 failed_count += 1
                 if runner.config.stop or runner.aborted:
@@ -1720,6 +2027,9 @@ class Step(BasicStatement, Replayable):
 
     .. _`step`: gherkin.html#steps
     """
+    # -- COMPACT: Many steps exist, user-defined attributes use "__dict__".
+    __slots__ = ("step_type", "text", "table", "table_is_shared",
+                 "status", "hook_failed", "duration", "__dict__")
     type = "step"
 
     def __init__(self, filename, line, keyword, step_type, name, text=None,
@@ -1728,6 +2038,7 @@ class Step(BasicStatement, Replayable):
         self.step_type = step_type
         self.text = text
         self.table = table
+        self.table_is_shared = False    # -- COPY-ON-RUN: For outline steps.
 
         self.status = Status.untested
         self.hook_failed = False
@@ -1807,6 +2118,10 @@ class Step(BasicStatement, Replayable):
                 # -- ENSURE:
                 #  * runner.context.text/.table attributes are reset (#66).
                 #  * Even EMPTY multiline text is available in context.
+                if self.table_is_shared:
+                    # -- COPY-ON-RUN: Step function may modify its table.
+                    self.table = copy.deepcopy(self.table)
+                    self.table_is_shared = False
                 runner.context.text = self.text
                 runner.context.table = self.table
                 match.run(runner.context)
@@ -1863,6 +2178,70 @@ class Step(BasicStatement, Replayable):
         return keep_going
 
 
+class TableHeadings(list):
+    """Headings of a :class:`Table` (as list) with a heading-to-index map.
+    The index of a column is looked up in constant time
+    (instead of a linear search over all headings for each cell access).
+    The map is computed on first use and discarded if the headings change.
+    """
+    __slots__ = ("_index_map",)
+
+    def __init__(self, headings=()):
+        super(TableHeadings, self).__init__(headings)
+        self._index_map = None
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    @property
+    def index_map(self):
+        """Column index by heading (first column wins for duplicated headings).
+        """
+        if self._index_map is None:
+            index_map = {}
+            for index, heading in enumerate(self):
+                index_map.setdefault(heading, index)
+            self._index_map = index_map
+        return self._index_map
+
+    def index(self, value, *args):
+        if args:
+            return super(TableHeadings, self).index(value, *args)
+        try:
+            return self.index_map[value]
+        except KeyError:
+            raise ValueError("%r is not in headings" % (value,))
+        except TypeError:
+            # -- UNHASHABLE VALUE: Use linear search.
+            return super(TableHeadings, self).index(value)
+
+    def __contains__(self, value):
+        try:
+            return value in self.index_map
+        except TypeError:
+            return super(TableHeadings, self).__contains__(value)
+
+
+
+def _make_headings_changing_method(name):
+    """Wraps a list method that changes the headings (discards index map)."""
+    list_method = getattr(list, name)
+
+    def changing_method(self, *args, **kwargs):
+        self._index_map = None      # pylint: disable=protected-access
+        return list_method(self, *args, **kwargs)
+    changing_method.__name__ = name
+    return changing_method
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__",
+              "__setslice__", "__delslice__", "append", "extend", "insert",
+              "pop", "remove", "reverse", "sort", "clear"):
+    if hasattr(list, _name):
+        setattr(TableHeadings, _name, _make_headings_changing_method(_name))
+del _name
+
+
 class Table(Replayable):
     """A `table`_ extracted from a *feature file*.
 
@@ -1881,7 +2260,8 @@ class Table(Replayable):
 
     .. attribute:: headings
 
-       The headings of the table as a list of strings.
+       The headings of the table as a list of strings
+       (as :class:`TableHeadings` with constant-time column lookup).
 
     .. attribute:: rows
 
@@ -1897,7 +2277,7 @@ class Table(Replayable):
 
     def __init__(self, headings, line=None, rows=None):
         Replayable.__init__(self)
-        self.headings = headings
+        self.headings = TableHeadings(headings)
         self.line = line
         self.rows = []
         if rows:
@@ -2063,6 +2443,9 @@ class Row(object):
 
     .. _`table`: gherkin.html#table
     """
+    # -- COMPACT: Index and id are only used for rows of Examples tables.
+    __slots__ = ("headings", "cells", "line", "comments", "index", "id")
+
     def __init__(self, headings, cells, line=None, comments=None):
         self.headings = headings
         self.comments = comments
@@ -2073,14 +2456,24 @@ class Row(object):
 
     def __getitem__(self, name):
         try:
-            index = self.headings.index(name)
-        except ValueError:
-            if isinstance(name, int):
-                index = name
-            else:
-                raise KeyError('"%s" is not a row heading' % name)
+            # -- FAST PATH: Table headings provide a heading-to-index map.
+            index = self.headings.index_map[name]
+        except KeyError:
+            index = self._get_unknown_heading_index(name)
+        except (AttributeError, TypeError):
+            # -- HEADINGS AS LIST (or unhashable name): Use linear search.
+            try:
+                index = self.headings.index(name)
+            except ValueError:
+                index = self._get_unknown_heading_index(name)
         return self.cells[index]
 
+    @staticmethod
+    def _get_unknown_heading_index(name):
+        if isinstance(name, int):
+            return name
+        raise KeyError('"%s" is not a row heading' % name)
+
     def __repr__(self):
         return "<Row %r>" % (self.cells,)
 
@@ -2130,6 +2523,10 @@ class Tag(six.text_type):
         o.line = line
         return o
 
+    def __getnewargs__(self):
+        # -- SUPPORT: copy.deepcopy() and pickle of tags (and model elements).
+        return (six.text_type(self), self.line)
+
     @classmethod
     def make_name(cls, text, unescape=False, allowed_chars=None):
         """Translate text into a "valid tag" without whitespace, etc.
@@ -7,9 +7,15 @@ for the model elements in behave.
 import os.path
 import sys
 import six
+from behave._types import ChainedExceptionUtil
 from behave.capture import Captured
 from behave.textutil import text as _text
 from enum import Enum
+if six.PY2:
+    # -- USE PYTHON3 BACKPORT: With unicode traceback support.
+    import traceback2 as traceback
+else:
+    import traceback
 
 
 PLATFORM_WIN = sys.platform.startswith("win")
@@ -114,6 +120,8 @@ class Argument(object):
 
        The end index in the step name of the argument. Used for display.
     """
+    __slots__ = ("start", "end", "original", "value", "name")
+
     def __init__(self, start, end, original, value, name=None):
         self.start = start
         self.end = end
@@ -137,6 +145,7 @@ class FileLocation(object):
       * "{filename}" (if line number is not present)
     """
     __pychecker__ = "missingattrs=line"     # -- Ignore warnings for 'line'.
+    __slots__ = ("filename", "line")
 
     def __init__(self, filename, line=None):
         if PLATFORM_WIN:
@@ -265,10 +274,28 @@ class FileLocation(object):
 # -----------------------------------------------------------------------------
 # ABSTRACT MODEL CLASSES (and concepts):
 # -----------------------------------------------------------------------------
+_relpath_cache = {}
+
+
+def make_relpath(filename):
+    """Compute the relative path of a filename (to the current directory).
+    Model elements of the same file share the same relative path object.
+    """
+    key = (filename, os.getcwd())
+    relpath = _relpath_cache.get(key, None)
+    if relpath is None:
+        relpath = _relpath_cache[key] = os.path.relpath(filename, key[1])
+    return relpath
+
+
 class BasicStatement(object):
+    # -- COMPACT: Attributes are stored in slots (derived classes may add more).
+    __slots__ = ("location", "keyword", "name", "captured",
+                 "exception", "exc_traceback", "error_message", "traceback_text")
+
     def __init__(self, filename, line, keyword, name):
         filename = filename or '<string>'
-        filename = os.path.relpath(filename, os.getcwd())   # -- NEEDS: abspath?
+        filename = make_relpath(filename)   # -- NEEDS: abspath?
         self.location = FileLocation(filename, line)
         assert isinstance(keyword, six.text_type)
         assert isinstance(name, six.text_type)
@@ -280,6 +307,7 @@ class BasicStatement(object):
         self.exception = None
         self.exc_traceback = None
         self.error_message = None
+        self.traceback_text = None
 
     @property
     def filename(self):
@@ -297,11 +325,27 @@ class BasicStatement(object):
         self.exception = None
         self.exc_traceback = None
         self.error_message = None
+        self.traceback_text = None
 
     def store_exception_context(self, exception):
         self.exception = exception
         self.exc_traceback = sys.exc_info()[2]
 
+    def release_run_data(self):
+        """Release the heavy run-time data after this statement was reported
+        (streaming mode): The traceback is reduced to text
+        (as ``traceback_text``) and the captured output is dropped.
+        Status, duration and error message are kept.
+        """
+        if self.exc_traceback is not None:
+            self.traceback_text = _text(
+                u"".join(traceback.format_tb(self.exc_traceback)))
+            self.exc_traceback = None
+        if self.exception is not None:
+            ChainedExceptionUtil.clear_tracebacks(self.exception)
+        if self.captured:
+            self.captured = Captured()
+
     def __hash__(self):
         # -- NEEDED-FOR: PYTHON3
         # return id((self.keyword, self.name))
@@ -422,6 +466,7 @@ class TagAndStatusStatement(BasicStatement):
 
 
 class Replayable(object):
+    __slots__ = ()
     type = None
 
     def replay(self, formatter):
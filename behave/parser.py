@@ -44,8 +44,10 @@ from __future__ import absolute_import, with_statement
 import logging
 import re
 import sys
+import threading
 import six
 from behave import model, i18n
+from behave.compat.collections import OrderedDict
 from behave.textutil import text as _text
 
 
@@ -53,10 +55,33 @@ DEFAULT_LANGUAGE = "en"
 
 
 def parse_file(filename, language=None):
+    # -- HINT: Streams the file line by line (memory stays bounded).
     with open(filename, "rb") as f:
-        # file encoding is assumed to be utf8. Oh, yes.
-        data = f.read().decode("utf8")
-    return parse_feature(data, language, filename)
+        try:
+            return Parser(language).parse_lines(iter_file_lines(f), filename)
+        except ParserError as e:
+            e.filename = filename
+            raise
+
+
+def iter_file_lines(stream):
+    """Provides the lines of a binary file stream as unicode strings
+    (without line terminator). Yields the same lines as
+    ``stream.read().decode("utf8").split("\\n")`` does.
+
+    :param stream:  File stream (opened in binary mode).
+    :return: Iterator of text lines (as unicode).
+    """
+    # file encoding is assumed to be utf8. Oh, yes.
+    # HINT: UTF-8 byte sequences never contain the newline byte.
+    ends_with_newline = True
+    for line in stream:
+        ends_with_newline = line.endswith(b"\n")
+        if ends_with_newline:
+            line = line[:-1]
+        yield line.decode("utf8")
+    if ends_with_newline:
+        yield u""
 
 
 def parse_feature(data, language=None, filename=None):
@@ -167,9 +192,162 @@ class ParserError(Exception):
         __str__ = lambda self: self.__unicode__().encode("utf-8")
 
 
+class ParsedStepsCache(object):
+    """Bounded LRU cache of parsed steps (used by :meth:`Parser.parse_steps()`),
+    keyed by ``(language, filename, steps_text)``.
+    This avoids that :meth:`behave.runner.Context.execute_steps()` parses
+    the same steps text again and again (for example: in a loop).
+
+    Each lookup returns copies of the parsed steps (with own run-time data).
+    Step tables are copied, too (tables can be modified by step functions).
+
+    .. attribute:: hits
+
+        Number of lookups that were answered by the cache.
+
+    .. attribute:: misses
+
+        Number of lookups that required parsing.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    @staticmethod
+    def copy_table(table):
+        table_copy = model.Table(list(table.headings), line=table.line)
+        for row in table.rows:
+            table_copy.rows.append(model.Row(table_copy.headings,
+                                             list(row.cells), row.line,
+                                             row.comments))
+        return table_copy
+
+    @classmethod
+    def copy_steps(cls, steps):
+        steps_copy = model.copy_steps(steps)
+        for step in steps_copy:
+            if step.table:
+                step.table = cls.copy_table(step.table)
+        return steps_copy
+
+    def get(self, key):
+        """Lookup the parsed steps for a key.
+
+        :param key:  Tuple of ``(language, filename, steps_text)``.
+        :return: List of steps (as copy) or None (if unknown).
+        """
+        with self._lock:
+            steps = self._data.pop(key, None)
+            if steps is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data[key] = steps     # -- MARK: Most recently used.
+        return self.copy_steps(steps)
+
+    def put(self, key, steps):
+        if self.maxsize <= 0:
+            return
+        steps = self.copy_steps(steps)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = steps
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)  # -- DROP: Least recently used.
+
+
+class KeywordMatcher(object):
+    """Classifies lines by the keywords of one language
+    (by using precompiled regular expressions).
+
+    Each regular expression contains one alternative per keyword alias
+    in the same order as the keyword loops of the parser used them.
+    The first matching alternative wins (like the first matching alias).
+    """
+    STEP_TYPES = ("given", "when", "then", "and", "but")
+    _matchers = {}
+
+    def __init__(self, keywords):
+        self.keywords = keywords
+        self.step_keywords = [(step_type, keyword)
+                              for step_type in self.STEP_TYPES
+                              for keyword in keywords[step_type]]
+        aliases = [keyword for _, keyword in self.step_keywords]
+        self.step_regex = self.make_regex(aliases)
+        self.lower_step_regex = self.make_regex([a.lower() for a in aliases])
+        self.keyword_regexes = {}
+
+    @classmethod
+    def for_keywords(cls, keywords):
+        """Provides the (cached) keyword matcher for the keywords of a language.
+
+        :param keywords:  Keywords of a language (from :mod:`behave.i18n`).
+        :return: KeywordMatcher object.
+        """
+        matcher = cls._matchers.get(id(keywords), None)
+        if matcher is None or matcher.keywords is not keywords:
+            matcher = cls._matchers[id(keywords)] = cls(keywords)
+        return matcher
+
+    @staticmethod
+    def make_regex(aliases):
+        # -- HINT: One group per alias; match.lastindex identifies the alias.
+        pattern = u"|".join(u"(%s)" % re.escape(alias) for alias in aliases)
+        return re.compile(pattern or u"(?!)", re.UNICODE)
+
+    def match_step_keyword(self, line):
+        """Finds the first step keyword at the begin of a line.
+        The keyword is matched case-sensitive or lowercase
+        (whichever alias comes first).
+
+        :param line:  Line to check (without leading whitespace).
+        :return: Tuple (step_type, keyword) or None (if not found).
+        """
+        index = None
+        match = self.lower_step_regex.match(line.lower())
+        if match:
+            index = match.lastindex
+        match = self.step_regex.match(line)
+        if match and (index is None or match.lastindex < index):
+            index = match.lastindex
+        if index is None:
+            return None
+        return self.step_keywords[index - 1]
+
+    def match_keyword(self, keyword, line):
+        """Checks if a line starts with "{alias}:" of a keyword.
+
+        :param keyword:  Keyword name, like: "feature", "scenario", ...
+        :param line:     Line to check (without leading whitespace).
+        :return: Matching alias (as string) or False.
+        """
+        regex = self.keyword_regexes.get(keyword, None)
+        if regex is None:
+            aliases = self.keywords[keyword]
+            regex = self.make_regex([alias + ":" for alias in aliases])
+            self.keyword_regexes[keyword] = regex
+
+        match = regex.match(line)
+        if match:
+            return self.keywords[keyword][match.lastindex - 1]
+        return False
+
+
 class Parser(object):
     """Feature file parser for behave."""
     # pylint: disable=too-many-instance-attributes
+    steps_cache = ParsedStepsCache()
 
     def __init__(self, language=None, variant=None):
         if not variant:
@@ -194,6 +372,7 @@ class Parser(object):
         self.table = None
         self.examples = None
         self.keywords = None
+        self._keyword_matcher = None
         if self.language:
             self.keywords = i18n.languages[self.language]
         # NOT-NEEDED: self.reset()
@@ -224,10 +403,19 @@ class Parser(object):
         self.examples = None
 
     def parse(self, text, filename=None):
+        return self.parse_lines(text.split("\n"), filename)
+
+    def parse_lines(self, lines, filename=None):
+        """Parse a feature from text lines.
+
+        :param lines:     Iterable of text lines (without line terminator).
+        :param filename:  Filename of the feature file (optional).
+        :return: Parsed feature (or None, if the lines contain no feature).
+        """
         self.reset()
         self.filename = filename
 
-        for line in text.split("\n"):
+        for line in lines:
             self.line += 1
             if not line.strip() and self.state != "multiline_text":
                 # -- SKIP EMPTY LINES, except in multiline string args.
@@ -712,14 +900,19 @@ class Parser(object):
             self.table.add_row(cells, self.line)
         return True
 
+    @property
+    def keyword_matcher(self):
+        matcher = self._keyword_matcher
+        if matcher is None or matcher.keywords is not self.keywords:
+            matcher = KeywordMatcher.for_keywords(self.keywords)
+            self._keyword_matcher = matcher
+        return matcher
+
     def match_keyword(self, keyword, line):
         if not self.keywords:
             self.language = DEFAULT_LANGUAGE
             self.keywords = i18n.languages[DEFAULT_LANGUAGE]
-        for alias in self.keywords[keyword]:
-            if line.startswith(alias + ":"):
-                return alias
-        return False
+        return self.keyword_matcher.match_keyword(keyword, line)
 
     def parse_rule(self, text, filename=None):
         """Parse rule with optional background and scenario(s).
@@ -774,35 +967,33 @@ class Parser(object):
         return tags
 
     def parse_step(self, line):
-        for step_type in ("given", "when", "then", "and", "but"):
-            for kw in self.keywords[step_type]:
-                # try to match the keyword; also attempt a purely lowercase
-                # match if that'll work
-                if not (line.startswith(kw) or
-                        line.lower().startswith(kw.lower())):
-                    # -- CASE: Line does not start w/ a step-keyword.
-                    continue
-                # -- HINT: Trailing SPACE is used for most keywords.
-                # BUT: Keywords in some languages (like Chinese, Japanese, ...)
-                #      do not need a whitespace as word separator.
-                step_text_after_keyword = line[len(kw):].strip()
-                if kw.startswith("*") and self.last_step_type:
-                    # -- CASE: Generic steps and Given/When/Then steps are mixed.
-                    # HINT: Inherit step type from last step.
-                    step_type = self.last_step_type
-                elif step_type in ("and", "but"):
-                    if not self.last_step_type:
-                        raise ParserError(u"No previous step",
-                                          self.line, self.filename)
-                    step_type = self.last_step_type
-                else:
-                    self.last_step_type = step_type
-
-                keyword = kw.rstrip()  # HINT: Strip optional trailing SPACE.
-                step = model.Step(self.filename, self.line,
-                                  keyword, step_type, step_text_after_keyword)
-                return step
-        return None
+        # -- HINT: Matches the keyword (or a purely lowercase keyword match).
+        step_keyword = self.keyword_matcher.match_step_keyword(line)
+        if step_keyword is None:
+            # -- CASE: Line does not start w/ a step-keyword.
+            return None
+
+        step_type, kw = step_keyword
+        # -- HINT: Trailing SPACE is used for most keywords.
+        # BUT: Keywords in some languages (like Chinese, Japanese, ...)
+        #      do not need a whitespace as word separator.
+        step_text_after_keyword = line[len(kw):].strip()
+        if kw.startswith("*") and self.last_step_type:
+            # -- CASE: Generic steps and Given/When/Then steps are mixed.
+            # HINT: Inherit step type from last step.
+            step_type = self.last_step_type
+        elif step_type in ("and", "but"):
+            if not self.last_step_type:
+                raise ParserError(u"No previous step",
+                                  self.line, self.filename)
+            step_type = self.last_step_type
+        else:
+            self.last_step_type = step_type
+
+        keyword = kw.rstrip()  # HINT: Strip optional trailing SPACE.
+        step = model.Step(self.filename, self.line,
+                          keyword, step_type, step_text_after_keyword)
+        return step
 
     def parse_steps(self, text, filename=None):
         """Parse support for execute_steps() functionality that
@@ -817,6 +1008,11 @@ class Parser(object):
         assert isinstance(text, six.text_type)
         if not self.language:
             self.language = DEFAULT_LANGUAGE
+        cache_key = (self.language, filename, text)
+        steps = self.steps_cache.get(cache_key)
+        if steps is not None:
+            return steps
+
         self.reset()
         self.filename = filename
         self.statement = model.Scenario(filename, 0, u"scenario", u"")
@@ -833,4 +1029,5 @@ class Parser(object):
         if self.table:
             self.action_table("")
         steps = self.statement.steps
+        self.steps_cache.put(cache_key, steps)
         return steps
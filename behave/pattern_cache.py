@@ -0,0 +1,195 @@
+# -*- coding: UTF-8 -*-
+"""
+Provides a persistent cache of step patterns that are known to be unambiguous.
+
+When a step definition is added, the step registry checks if an existing
+step definition matches its step text (ambiguous step definition).
+This check compiles the regular expression of each candidate step definition
+and dominates the startup time of short test runs with many step definitions.
+This cache remembers, which step definitions were unambiguous with the same
+candidates in a previous test run. Therefore, the next test run can skip
+the check, and the regular expressions are only compiled when they are used.
+
+EXAMPLE:
+
+.. code-block:: ini
+
+    # -- FILE: behave.ini
+    [behave]
+    step_pattern_cache = build/behave.step_pattern_cache
+
+.. note::
+
+    The cache file contains only step patterns and regular expression texts
+    (as provided by :pypi:`parse` for its step patterns). A cache file with
+    another cache format version or Python version is ignored.
+"""
+
+from __future__ import absolute_import
+import hashlib
+import json
+import os
+import sys
+from behave._fileutil import save_file_atomically
+from behave.matchers import \
+    CFParseMatcher, CucumberRegexMatcher, ParseMatcher, \
+    RegexMatcher, SimplifiedRegexMatcher
+
+
+# -----------------------------------------------------------------------------
+# STEP PATTERN CACHE:
+# -----------------------------------------------------------------------------
+class StepPatternCache(object):
+    """Persistent cache of step definitions that are known to be unambiguous.
+
+    Cache entries are keyed by the step type and the step text (pattern)
+    of a new step definition. The entry value is a digest of the candidate
+    step definitions that were checked: their matcher class and the regular
+    expression that they use. Step patterns of
+    :class:`~behave.matchers.ParseMatcher` classes are represented by the
+    regular expression that :pypi:`parse` generates for them (which depends
+    on the pattern, the matcher class and the registered types).
+
+    Only built-in matcher classes are supported, because their match result
+    depends on the regular expression only.
+
+    .. attribute:: hits
+
+        Number of ambiguity checks that were skipped.
+
+    .. attribute:: misses
+
+        Number of ambiguity checks that were performed.
+    """
+    FORMAT_VERSION = 2
+    MATCHER_CLASSES = (ParseMatcher, CFParseMatcher, RegexMatcher,
+                       SimplifiedRegexMatcher, CucumberRegexMatcher)
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.entries = {}
+        self.used_keys = set()
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+
+    @classmethod
+    def make_signature(cls):
+        return [cls.FORMAT_VERSION, list(sys.version_info[:2])]
+
+    @staticmethod
+    def make_key(step_type, step_text):
+        return u"%s:%s" % (step_type, step_text)
+
+    @classmethod
+    def make_digest(cls, step_definitions):
+        """Compute the digest of the candidate step definitions.
+
+        :param step_definitions:    Step definitions (matchers) to use.
+        :return: Digest (as text) or None (if a matcher class is not supported).
+        """
+        parts = []
+        for step_definition in step_definitions:
+            matcher_class = step_definition.__class__
+            if matcher_class not in cls.MATCHER_CLASSES:
+                return None
+            parts.append(matcher_class.__name__)
+            parts.append(step_definition.regex_pattern)
+        text = u"\0".join(parts)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def clear(self):
+        self.entries = {}
+        self.used_keys = set()
+        self.changed = True
+
+    def load(self):
+        """Load the cache entries from the cache file (if it exists).
+        An outdated or corrupted cache file is ignored.
+        """
+        if not (self.filename and os.path.isfile(self.filename)):
+            return
+        try:
+            with open(self.filename, "r") as cache_file:
+                data = json.load(cache_file)
+            if data.get("signature") != self.make_signature():
+                return
+            entries = dict(data["entries"])
+        except Exception:   # pylint: disable=broad-except
+            return
+        self.entries = entries
+
+    def save(self):
+        """Store the cache entries in the cache file (if they have changed).
+        Entries of step definitions that were not added in this test run
+        are removed. The cache file is replaced atomically
+        (safe for concurrent processes).
+        """
+        if len(self.used_keys) != len(self.entries):
+            self.entries = dict((key, value) for key, value in self.entries.items()
+                                if key in self.used_keys)
+            self.changed = True
+        if not (self.filename and self.changed):
+            return
+
+        data = dict(signature=self.make_signature(), entries=self.entries)
+        save_file_atomically(self.filename,
+                             lambda cache_file: json.dump(data, cache_file,
+                                                          sort_keys=True),
+                             prefix=".step_pattern_cache_")
+        self.changed = False
+
+    def is_unambiguous(self, step_type, step_text, candidates):
+        """Checks if a new step definition was unambiguous in a previous
+        test run (with the same candidate step definitions).
+
+        :param step_type:   Step type of the new step definition.
+        :param step_text:   Step text (pattern) of the new step definition.
+        :param candidates:  Step definitions that may conflict with it.
+        :return: True, if the ambiguity check can be skipped.
+        """
+        key = self.make_key(step_type, step_text)
+        digest = self.entries.get(key, None)
+        if digest is not None and digest == self.make_digest(candidates):
+            self.used_keys.add(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add_unambiguous(self, step_type, step_text, candidates):
+        """Remember that a new step definition is unambiguous
+        (none of the candidate step definitions matches its step text).
+        """
+        digest = self.make_digest(candidates)
+        if digest is None:
+            return  # -- UNSUPPORTED MATCHER CLASS: Check it each time.
+        key = self.make_key(step_type, step_text)
+        self.used_keys.add(key)
+        if self.entries.get(key, None) != digest:
+            self.entries[key] = digest
+            self.changed = True
+
+
+# -----------------------------------------------------------------------------
+# MODULE INSTANCE:
+# -----------------------------------------------------------------------------
+_the_step_pattern_cache = None
+
+
+def get_step_pattern_cache():
+    """Provides the step pattern cache in use (or None)."""
+    return _the_step_pattern_cache
+
+
+def use_step_pattern_cache(pattern_cache):
+    """Use a step pattern cache for the step definitions that are added
+    afterwards (or disable the cache with None).
+
+    :param pattern_cache:   Step pattern cache to use (or None).
+    :return: Previous step pattern cache (or None).
+    """
+    global _the_step_pattern_cache  # pylint: disable=global-statement
+    previous_cache = _the_step_pattern_cache
+    _the_step_pattern_cache = pattern_cache
+    return previous_cache
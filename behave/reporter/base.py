@@ -26,6 +26,10 @@ class Reporter(object):
     :class:`behave.report.formatter_reporter.FormatterAsReporter`.
     """
 
+    # -- HINT: Uses finished scenarios of scenario outlines later on
+    #    (after they have run). Otherwise, the runner may release them.
+    needs_finished_scenarios = True
+
     def __init__(self, config):
         self.config = config
 
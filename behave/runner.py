@@ -5,6 +5,8 @@ This module provides Runner class to run behave feature files (or model elements
 
 from __future__ import absolute_import, print_function, with_statement
 import contextlib
+import linecache
+import logging
 import os.path
 import sys
 import warnings
@@ -13,10 +15,13 @@ import weakref
 import six
 
 from behave.api.runner import ITestRunner
-from behave._types import ExceptionUtil
+from behave._types import ExceptionUtil, iscoroutinefunction
 from behave.capture import CaptureController
+from behave.duration_history import DurationHistory
 from behave.exception import ConfigError
+from behave.feature_cache import FeatureCache
 from behave.formatter._registry import make_formatters
+from behave.pattern_cache import StepPatternCache, use_step_pattern_cache
 from behave.runner_util import \
     collect_feature_locations, parse_features, \
     exec_file, load_step_modules, PathManager
@@ -30,6 +35,10 @@ else:
     import traceback
 
 
+# -- HINT: sys._getframe() is a CPython implementation detail.
+_getframe = getattr(sys, "_getframe", None)
+
+
 class CleanupError(RuntimeError):
     pass
 
@@ -164,6 +173,9 @@ class Context(object):
             "@layer": "testrun",
         }
         self._stack = [root_data]
+        self._class_attributes = frozenset(dir(self.__class__))
+        for attr, value in root_data.items():
+            self._set_value(attr, value)
         self._record = {}
         self._origin = {}
         self._mode = ContextMode.BEHAVE
@@ -276,6 +288,7 @@ class Context(object):
             except Exception as e: # pylint: disable=broad-except
                 # pylint: disable=protected-access
                 context._root["cleanup_errors"] += 1
+                context._update_value("cleanup_errors")
                 cleanup_errors.append(sys.exc_info())
                 on_cleanup_error(context, cleanup_func, e)
 
@@ -294,6 +307,8 @@ class Context(object):
         if layer:
             initial_data["@layer"] = layer
         self._stack.insert(0, initial_data)
+        for attr, value in initial_data.items():
+            self._set_value(attr, value)
 
     def _pop(self):
         """Pop the current layer from the context stack.
@@ -303,7 +318,33 @@ class Context(object):
             self._do_cleanups()
         finally:
             # -- ENSURE: Layer is removed even if cleanup-errors occur.
-            self._stack.pop(0)
+            frame = self._stack.pop(0)
+            for attr in frame:
+                self._update_value(attr)
+
+    def _set_value(self, attr, value):
+        """Stores the visible value of a context attribute in the merged view
+        of the context stack. The merged view is the instance dictionary.
+        Therefore, reading a context attribute needs no stack lookup.
+
+        .. note::
+
+            Attributes with the name of a class attribute (like: a method)
+            are not stored in the merged view (class attribute is used).
+        """
+        if attr not in self._class_attributes:
+            self.__dict__[attr] = value
+
+    def _update_value(self, attr):
+        """Updates the merged view of the context stack for one attribute
+        (after a context layer or the attribute was removed or changed).
+        """
+        for frame in self._stack:
+            if attr in frame:
+                self._set_value(attr, frame[attr])
+                return
+        if attr not in self._class_attributes:
+            self.__dict__.pop(attr, None)
 
     def _use_with_behave_mode(self):
         """Provides a context manager for using the context in BEHAVE mode."""
@@ -323,19 +364,41 @@ class Context(object):
             if frame is self.__dict__["_root"]:
                 continue
             if attr in frame:
-                record = self.__dict__["_record"][attr]
-                params = {
-                    "attr": attr,
-                    "filename": record[0],
-                    "line": record[1],
-                    "function": record[3],
-                }
+                params = self._make_record_params(attr)
                 self._emit_warning(attr, params)
 
         self.__dict__["_root"][attr] = value
+        self._update_value(attr)
         if attr not in self._origin:
             self._origin[attr] = self._mode
 
+    def _record_location(self, attr, depth=2):
+        """Records where a context attribute is set (for masking warnings).
+        Only the filename and line number of the caller are recorded
+        (the source code line is looked up if a warning is emitted).
+        """
+        if _getframe is None:
+            # -- FALLBACK: Python implementation without sys._getframe().
+            stack_limit = depth + 1
+            if six.PY2:
+                stack_limit += 1     # Due to traceback2 usage.
+            stack_frame = traceback.extract_stack(limit=stack_limit)[0]
+            self._record[attr] = (stack_frame[0], stack_frame[1])
+            return
+
+        caller_frame = _getframe(depth)
+        self._record[attr] = (caller_frame.f_code.co_filename,
+                              caller_frame.f_lineno)
+
+    def _make_record_params(self, attr):
+        filename, line = self._record[attr]
+        return {
+            "attr": attr,
+            "filename": filename,
+            "line": line,
+            "function": linecache.getline(filename, line).strip(),
+        }
+
     def _emit_warning(self, attr, params):
         msg = ""
         if self._mode is ContextMode.BEHAVE and self._origin[attr] is not ContextMode.BEHAVE:
@@ -369,9 +432,8 @@ class Context(object):
             except KeyError:
                 raise AttributeError(attr)
 
-        for frame in self._stack:
-            if attr in frame:
-                return frame[attr]
+        # -- HINT: Attributes of the context stack are found in the merged view
+        #    (instance dictionary) without calling this method.
         msg = "'{0}' object has no attribute '{1}'"
         msg = msg.format(self.__class__.__name__, attr)
         raise AttributeError(msg)
@@ -381,24 +443,20 @@ class Context(object):
             self.__dict__[attr] = value
             return
 
-        for frame in self._stack[1:]:
-            if attr in frame:
-                record = self._record[attr]
-                params = {
-                    "attr": attr,
-                    "filename": record[0],
-                    "line": record[1],
-                    "function": record[3],
-                }
-                self._emit_warning(attr, params)
+        values = self.__dict__
+        is_class_attribute = attr in self._class_attributes
+        if attr in values or is_class_attribute:
+            # -- CHECK: Attribute is masking an attribute of an outer layer.
+            for frame in self._stack[1:]:
+                if attr in frame:
+                    params = self._make_record_params(attr)
+                    self._emit_warning(attr, params)
 
-        stack_limit = 2
-        if six.PY2:
-            stack_limit += 1     # Due to traceback2 usage.
-        stack_frame = traceback.extract_stack(limit=stack_limit)[0]
-        self._record[attr] = stack_frame
+        self._record_location(attr, depth=2)
         frame = self._stack[0]
         frame[attr] = value
+        if not is_class_attribute:
+            values[attr] = value   # -- SAME AS: self._set_value(attr, value)
         if attr not in self._origin:
             self._origin[attr] = self._mode
 
@@ -407,6 +465,7 @@ class Context(object):
         if attr in frame:
             del frame[attr]
             del self._record[attr]
+            self._update_value(attr)
         else:
             msg = "'{0}' object has no attribute '{1}' at the current level"
             msg = msg.format(self.__class__.__name__, attr)
@@ -415,6 +474,10 @@ class Context(object):
     def __contains__(self, attr):
         if attr[0] == "_":
             return attr in self.__dict__
+        if attr in self.__dict__:
+            return True
+        elif attr not in self._class_attributes:
+            return False
         for frame in self._stack:
             if attr in frame:
                 return True
@@ -626,6 +689,8 @@ class ModelRunner(object):
         self.context = None
         self.feature = None
         self.hook_failures = 0
+        self.event_loop = None
+        self.release_outline_scenarios = False
 
     @property
     def undefined_steps(self):
@@ -661,11 +726,40 @@ class ModelRunner(object):
         # SIMILAR TO: self.aborted = True
         self.context.abort(reason=reason)
 
+    def run_coroutine(self, coroutine):
+        """Runs a coroutine of an async step, hook or fixture until it is
+        completed. All coroutines of a test run use the same event loop.
+        Therefore, objects that are bound to an event loop (like connections)
+        can be shared between steps.
+
+        :param coroutine:   Coroutine (or awaitable object) to run.
+        :return: Result of the coroutine.
+        """
+        if self.event_loop is None:
+            # -- LAZY-IMPORT: Only needed for async steps (Python >= 3.5).
+            import asyncio  # pylint: disable=import-outside-toplevel
+            self.event_loop = asyncio.new_event_loop()
+        return self.event_loop.run_until_complete(coroutine)
+
+    def close_event_loop(self):
+        """Closes the event loop of the coroutines (if one was used)."""
+        event_loop = self.event_loop
+        if event_loop is None:
+            return
+        self.event_loop = None
+        if hasattr(event_loop, "shutdown_asyncgens"):
+            event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+        event_loop.close()
+
     def run_hook(self, name, context, *args):
         if not self.config.dry_run and (name in self.hooks):
             try:
                 with context.use_with_user_mode():
-                    self.hooks[name](context, *args)
+                    if iscoroutinefunction(self.hooks[name]):
+                        # -- ASYNC HOOK: async def before_scenario(...): ...
+                        self.run_coroutine(self.hooks[name](context, *args))
+                    else:
+                        self.hooks[name](context, *args)
             # except KeyboardInterrupt:
             #     self.abort(reason="KeyboardInterrupt")
             #     if name not in ("before_all", "after_all"):
@@ -728,18 +822,45 @@ class ModelRunner(object):
         """
         return self.capture_controller.captured
 
+    def setup_step_registry(self):
+        """Provides the step registry for this test run (if needed)
+        and applies the step matching options of the configuration.
+        """
+        if self.step_registry is None:
+            self.step_registry = the_step_registry
+        if getattr(self.config, "combine_regex_matchers", False) is True:
+            self.step_registry.combine_regex_matchers = True
+
+    def can_release_outline_scenarios(self):
+        """Checks if the finished scenarios of scenario outlines can be
+        released while running (if no formatter or reporter uses them later).
+        """
+        users = list(self.formatters) + list(self.config.reporters)
+        return not any(getattr(user, "needs_finished_scenarios", True)
+                       for user in users)
+
+    def report_feature(self, feature):
+        """Report a (run or not-run) feature to the reporters.
+        In streaming mode (option: ``--release-run-data``), the run-time data
+        of the feature is released afterwards (keeps memory usage flat).
+        """
+        for reporter in self.config.reporters:
+            reporter.feature(feature)
+        if getattr(self.config, "release_run_data", False) is True:
+            feature.release_run_data()
+
     def run_model(self, features=None):
         # pylint: disable=too-many-branches
         if not self.context:
             self.context = Context(self)
-        if self.step_registry is None:
-            self.step_registry = the_step_registry
+        self.setup_step_registry()
         if features is None:
             features = self.features
 
         # -- ENSURE: context.execute_steps() works in weird cases (hooks, ...)
         context = self.context
         self.hook_failures = 0
+        self.release_outline_scenarios = self.can_release_outline_scenarios()
         self.setup_capture()
         self.run_hook("before_all", context)
 
@@ -766,8 +887,7 @@ class ModelRunner(object):
 
             # -- ALWAYS: Report run/not-run feature to reporters.
             # REQUIRED-FOR: Summary to keep track of untested features.
-            for reporter in self.config.reporters:
-                reporter.feature(feature)
+            self.report_feature(feature)
 
         # -- AFTER-ALL:
         # pylint: disable=protected-access, broad-except
@@ -777,6 +897,7 @@ class ModelRunner(object):
             self.context._do_cleanups()   # Without dropping the last context layer.
         except Exception:
             cleanups_failed = True
+        self.close_event_loop()
 
         if self.aborted:
             print("\nABORTED: By user.")
@@ -812,6 +933,8 @@ class Runner(ModelRunner):
         super(Runner, self).__init__(config)
         self.path_manager = PathManager()
         self.base_dir = None
+        self.step_pattern_cache = None
+        self.duration_history = None
 
     def setup_paths(self):
         # pylint: disable=too-many-branches, too-many-statements
@@ -922,11 +1045,80 @@ class Runner(ModelRunner):
         # NOTE: Default matcher can be overridden in "environment.py" hook.
         steps_dir = os.path.join(self.base_dir, self.config.steps_dir)
         step_paths = [steps_dir] + list(extra_step_paths)
+        self.setup_step_pattern_cache()
         load_step_modules(step_paths)
 
+    def setup_step_pattern_cache(self):
+        """Use the persistent step pattern cache (if configured)."""
+        filename = getattr(self.config, "step_pattern_cache", None)
+        if not filename:
+            return
+        self.step_pattern_cache = StepPatternCache(filename)
+        self.step_pattern_cache.load()
+        use_step_pattern_cache(self.step_pattern_cache)
+
+    def teardown_step_pattern_cache(self):
+        if self.step_pattern_cache is None:
+            return
+        use_step_pattern_cache(None)
+        try:
+            self.step_pattern_cache.save()
+        except (IOError, OSError) as e:
+            logger = logging.getLogger("behave")
+            logger.warning(u"STEP-PATTERN-CACHE: Cannot save %s (%s)",
+                           self.step_pattern_cache.filename, e)
+
+    def setup_duration_history(self):
+        """Load the duration history of scenarios (if configured)."""
+        filename = getattr(self.config, "duration_history", None)
+        if not filename or self.config.dry_run:
+            return
+        self.duration_history = DurationHistory(filename)
+        self.duration_history.load()
+
+    def can_release_outline_scenarios(self):
+        if self.duration_history is not None:
+            return False    # -- NEEDED-BY: Duration history update.
+        return super(Runner, self).can_release_outline_scenarios()
+
+    def teardown_duration_history(self):
+        if self.duration_history is None:
+            return
+        self.duration_history.update(self.features)
+        try:
+            self.duration_history.save()
+        except (IOError, OSError) as e:
+            logger = logging.getLogger("behave")
+            logger.warning(u"DURATION-HISTORY: Cannot save %s (%s)",
+                           self.duration_history.filename, e)
+
     def feature_locations(self):
         return collect_feature_locations(self.config.paths)
 
+    def parse_features(self, feature_locations):
+        """Parse the feature files (by using the feature cache and
+        worker processes, if configured).
+
+        :param feature_locations:   Feature file locations to parse.
+        :return: List of features.
+        """
+        jobs = getattr(self.config, "parse_jobs", 1) or 1
+        filename = getattr(self.config, "feature_cache", None)
+        if not filename:
+            return parse_features(feature_locations, language=self.config.lang,
+                                  jobs=jobs)
+
+        feature_cache = FeatureCache(filename)
+        feature_cache.load()
+        features = parse_features(feature_locations, language=self.config.lang,
+                                  feature_cache=feature_cache, jobs=jobs)
+        try:
+            feature_cache.save()
+        except (IOError, OSError) as e:
+            logger = logging.getLogger("behave")
+            logger.warning(u"FEATURE-CACHE: Cannot save %s (%s)", filename, e)
+        return features
+
     def run(self):
         with self.path_manager:
             self.setup_paths()
@@ -935,22 +1127,28 @@ class Runner(ModelRunner):
     def run_with_paths(self):
         self.context = Context(self)
         self.load_hooks()
-        self.load_step_definitions()
-
-        # -- ENSURE: context.execute_steps() works in weird cases (hooks, ...)
-        # self.setup_capture()
-        # self.run_hook("before_all", self.context)
-
-        # -- STEP: Parse all feature files (by using their file location).
-        feature_locations = [filename for filename in self.feature_locations()
-                             if not self.config.exclude(filename)]
-        features = parse_features(feature_locations, language=self.config.lang)
-        self.features.extend(features)
-
-        # -- STEP: Run all features.
-        stream_openers = self.config.outputs
-        self.formatters = make_formatters(self.config, stream_openers)
-        return self.run_model()
+        try:
+            self.load_step_definitions()
+
+            # -- ENSURE: context.execute_steps() works in weird cases (hooks, ...)
+            # self.setup_capture()
+            # self.run_hook("before_all", self.context)
+
+            # -- STEP: Parse all feature files (by using their file location).
+            feature_locations = [filename for filename in self.feature_locations()
+                                 if not self.config.exclude(filename)]
+            features = self.parse_features(feature_locations)
+            self.features.extend(features)
+
+            # -- STEP: Run all features.
+            stream_openers = self.config.outputs
+            self.formatters = make_formatters(self.config, stream_openers)
+            self.setup_duration_history()
+            failed = self.run_model()
+            self.teardown_duration_history()
+            return failed
+        finally:
+            self.teardown_step_pattern_cache()
 
 
 # -----------------------------------------------------------------------------
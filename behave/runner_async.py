@@ -0,0 +1,164 @@
+# -*- coding: UTF-8 -*-
+"""
+This module provides a test runner for async steps (coroutines)
+that runs scenarios concurrently on one long-lived event loop.
+
+Steps, hooks and fixtures can be coroutine-functions (``async def``).
+Their coroutines are awaited by the test runner
+(without the :func:`~behave.api.async_step.async_run_until_complete`
+step decorator):
+
+.. code-block:: python
+
+    # -- FILE: features/steps/my_async_steps.py
+    # EXAMPLE REQUIRES: Python >= 3.5
+    from behave import when
+
+    @when('I fetch "{url}"')
+    async def step_fetch_url(context, url):
+        async with context.http_session.get(url) as response:
+            context.response_text = await response.text()
+
+.. code-block:: sh
+
+    # -- USE: Runner-alias "async" with up to 16 concurrent scenarios.
+    behave --runner=async --jobs=16 features/
+
+The runner works like this:
+
+* An event loop runs in a background thread during the whole test run.
+* The features are split into work items (one scenario each), like the
+  :class:`~behave.runner_parallel.ParallelRunner` does.
+  The ``--jobs`` option provides the concurrency limit
+  (number of work items that are run at the same time).
+* Each work item is run by a worker thread (see:
+  :class:`~behave.runner_parallel.ThreadedRunner`). If a step (or hook)
+  returns a coroutine, the worker thread submits it to the event loop
+  and waits for its completion. Therefore, the coroutines of all work items
+  are interleaved on the same event loop (overlapping I/O waits).
+* The output (stdout, stderr) and log records of a coroutine are captured
+  for the scenario of its worker thread (Python >= 3.7: The capture target
+  is stored in a context variable that the coroutine task inherits).
+
+.. note::
+
+    A coroutine cannot wait for other steps by using
+    :meth:`context.execute_steps() <behave.runner.Context.execute_steps>`
+    if these steps contain async steps (the event loop would block itself).
+
+.. note::
+
+    Each running scenario occupies one worker thread, that is blocked
+    while its coroutine runs on the event loop. Therefore, the number of
+    concurrent scenarios is limited by the number of worker threads
+    (``--jobs``), even if most scenarios wait for I/O.
+"""
+
+from __future__ import absolute_import
+import threading
+from behave.runner_parallel import ThreadedRunner
+try:
+    import asyncio
+except ImportError:     # pragma: no cover
+    # -- PYTHON2: asyncio is not available.
+    asyncio = None
+
+
+# -----------------------------------------------------------------------------
+# EVENT LOOP THREAD:
+# -----------------------------------------------------------------------------
+class EventLoopThread(object):
+    """Runs a long-lived event loop in a background thread.
+    Other threads submit coroutines to this event loop and wait for
+    their completion. Therefore, the coroutines of several threads
+    run concurrently on the same event loop.
+    """
+
+    def __init__(self, name="behave-event-loop"):
+        self.name = name
+        self.loop = None
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.running:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name=self.name)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def stop(self):
+        """Stops the event loop (and its thread) and closes the event loop."""
+        if not self.running:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        self.loop = None
+        self.thread = None
+
+    def run_coroutine(self, coroutine):
+        """Runs a coroutine on the event loop and waits for its completion.
+
+        :param coroutine:   Coroutine (or awaitable object) to run.
+        :return: Result of the coroutine.
+        :raises RuntimeError: If called in the event loop thread.
+        """
+        assert self.running, "REQUIRE: start() is called before"
+        if threading.current_thread() is self.thread:
+            raise RuntimeError("Cannot wait for a coroutine in the event loop "
+                               "thread (HINT: execute_steps() with async steps)")
+        if not asyncio.iscoroutine(coroutine):
+            # -- CASE: Awaitable object, like: asyncio.Future
+            coroutine = asyncio.wait_for(coroutine, None)
+        # -- HINT: The task runs with a copy of the context of this thread
+        #    (contextvars: output capture of this thread is used).
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        return future.result()
+
+
+# -----------------------------------------------------------------------------
+# ASYNC RUNNER:
+# -----------------------------------------------------------------------------
+class AsyncRunner(ThreadedRunner):
+    """Test runner that awaits the coroutines of async steps, hooks and
+    fixtures on one long-lived event loop, while up to ``--jobs``
+    scenarios are run concurrently.
+
+    If the scenarios are run sequentially (``--jobs=1``), the coroutines
+    are run by the event loop of the runner (in the main thread).
+
+    .. seealso:: :mod:`behave.runner_async`
+    """
+
+    def __init__(self, config):
+        super(AsyncRunner, self).__init__(config)
+        self.event_loop_thread = None
+
+    @staticmethod
+    def is_supported():
+        return asyncio is not None
+
+    def run_coroutine(self, coroutine):
+        if self.event_loop_thread is None:
+            return super(AsyncRunner, self).run_coroutine(coroutine)
+        return self.event_loop_thread.run_coroutine(coroutine)
+
+    def run_model_in_parallel(self, features):
+        # -- HINT: Worker runners are created afterwards (share event loop).
+        self.event_loop_thread = EventLoopThread()
+        self.event_loop_thread.start()
+        try:
+            return super(AsyncRunner, self).run_model_in_parallel(features)
+        finally:
+            self.event_loop_thread.stop()
+            self.event_loop_thread = None
@@ -0,0 +1,1155 @@
+# -*- coding: UTF-8 -*-
+"""
+This module provides a test runner that runs features (and their scenarios)
+in parallel by using a pool of worker processes.
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    # -- USE: Runner-alias "parallel" with 4 worker processes.
+    behave --runner=parallel --jobs=4 features/
+
+.. code-block:: ini
+
+    # -- FILE: behave.ini
+    [behave]
+    runner = parallel
+    jobs = 4
+
+The runner works like this:
+
+* The main process loads the step definitions and parses the feature files.
+* The features are split into work items: one work item per scenario
+  (or per scenario of a scenario outline). A feature (or rule, scenario outline)
+  that is tagged with ``@serial`` is kept together in one work item.
+* The work items are provided by a shared task queue.
+  An idle worker process takes the next remaining work item from this queue.
+  If a duration history is used (option: ``--duration-history``),
+  the longest running work items are scheduled first.
+* Each worker process runs the ``before_all`` hook, the work items
+  that it takes and the ``after_all`` hook at the end.
+  The ``before_feature`` and ``after_feature`` hooks are run
+  for each work item of a feature.
+* A worker process records the formatter protocol and the step results
+  of each work item and sends them back to the main process.
+* The main process merges the work item results of each feature and
+  replays them (in the order of the features) to its formatters and reporters.
+  Therefore, the output looks like the output of a sequential test run.
+
+.. note::
+
+    The worker processes are forked from the main process
+    (requires: :mod:`multiprocessing` with "fork" start method).
+    Otherwise, the features are run sequentially.
+
+The :class:`ThreadedRunner` (runner-alias: "threaded") uses worker threads
+instead of worker processes (useful for I/O-bound steps).
+"""
+
+from __future__ import absolute_import, print_function
+from contextlib import contextmanager
+import copy
+import pickle
+import sys
+import threading
+import six
+from six.moves import queue
+from behave.capture import ThreadCaptureDispatcher
+from behave.matchers import Match, NoMatch
+from behave.model import Feature, Rule, ScenarioOutline
+from behave.model_core import Argument, Status
+# -- HINT: Use the same step registry as the ModelRunner (for step decorators).
+from behave.runner import Context, Runner
+from behave.runner_util import make_process_context
+
+
+# -----------------------------------------------------------------------------
+# MODEL ELEMENT STATE: Snapshots of run-time data (results) of model elements.
+# -----------------------------------------------------------------------------
+STATE_ATTRIBUTES = (
+    "status", "_cached_status", "hook_failed", "should_skip", "skip_reason",
+    "was_dry_run", "duration", "run_starttime", "run_endtime",
+    "error_message", "exception", "captured",
+)
+
+
+def collect_model_elements(feature):
+    """Collects all model elements of a feature that are used while running it
+    (including the scenarios of scenario outlines and the background steps
+    of each scenario).
+
+    The list order is deterministic. Therefore, the index of a model element
+    can be used to identify it in another process with the same features.
+
+    :param feature: Feature to use.
+    :return: List of model elements.
+    """
+    elements = []
+
+    def add_scenario(scenario):
+        elements.append(scenario)
+        elements.extend(scenario.all_steps)
+
+    def add_entity(entity):
+        elements.append(entity)
+        if entity.background:
+            elements.append(entity.background)
+            elements.extend(entity.background.steps)
+        for run_item in entity.run_items:
+            if isinstance(run_item, Rule):
+                add_entity(run_item)
+            elif isinstance(run_item, ScenarioOutline):
+                elements.append(run_item)
+                for scenario in run_item.scenarios:
+                    add_scenario(scenario)
+            else:
+                add_scenario(run_item)
+
+    add_entity(feature)
+    return elements
+
+
+def make_picklable(value, fallback=None):
+    """Ensures that a value can be sent to another process.
+
+    :param value:       Value to check.
+    :param fallback:    Value to use if value cannot be pickled (and unpickled).
+    :return: Value or fallback value.
+    """
+    try:
+        pickle.loads(pickle.dumps(value))
+        return value
+    except Exception:   # pylint: disable=broad-except
+        return fallback
+
+
+def make_picklable_exception(exception):
+    if exception is None:
+        return None
+    fallback = RuntimeError(u"%s: %s" % (exception.__class__.__name__, exception))
+    return make_picklable(exception, fallback)
+
+
+def get_instance_data(element):
+    """Provides the instance attributes of a model element (as dict).
+    Includes the attributes that are stored in slots (if any).
+    """
+    element_data = dict(getattr(element, "__dict__", {}))
+    for cls in type(element).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name in ("__dict__", "__weakref__") or name in element_data:
+                continue
+            if hasattr(element, name):
+                element_data[name] = getattr(element, name)
+    return element_data
+
+
+def snapshot_state(element, picklable=True):
+    """Provides the run-time state (result data) of a model element.
+
+    :param element:     Model element to use.
+    :param picklable:   If true, state can be sent to another process.
+    :return: Run-time state (as dict).
+    """
+    element_data = get_instance_data(element)
+    state = {}
+    for name in STATE_ATTRIBUTES:
+        if name in element_data:
+            state[name] = element_data[name]
+    if "exception" in state:
+        if picklable:
+            state["exception"] = make_picklable_exception(state["exception"])
+        else:
+            state["exc_traceback"] = element_data.get("exc_traceback", None)
+    return state
+
+
+def apply_state(element, state):
+    """Restores the run-time state of a model element from its snapshot."""
+    for name, value in state.items():
+        setattr(element, name, value)
+    if "exception" in state and "exc_traceback" not in state:
+        # -- HINT: Traceback objects cannot be sent to another process.
+        element.exc_traceback = None
+
+
+def make_match_data(match):
+    if match is None or isinstance(match, NoMatch):
+        return None
+
+    arguments = []
+    for argument in match.arguments or []:
+        value = make_picklable(argument.value, argument.original)
+        arguments.append((argument.start, argument.end, argument.original,
+                          value, argument.name))
+    return (match.location, arguments)
+
+
+def make_match(match_data):
+    """Creates a step match (for formatters) from its match data."""
+    if match_data is None:
+        return NoMatch()
+    elif isinstance(match_data, Match):
+        return match_data   # -- CASE: Match was recorded in same process.
+
+    location, arguments = match_data
+    match = Match(None, [Argument(*argument) for argument in arguments])
+    match.location = location
+    return match
+
+
+# -----------------------------------------------------------------------------
+# WORK ITEMS: Split features into parts that can run in parallel.
+# -----------------------------------------------------------------------------
+class WorkItem(object):
+    """Part of a feature that is run by one worker process.
+
+    .. attribute:: index
+
+        Index of this work item (in the list of work items).
+
+    .. attribute:: feature_index
+
+        Index of the feature (in the list of features).
+
+    .. attribute:: scenario_indexes
+
+        Element indexes of the selected scenarios.
+        None, if the complete feature should be run.
+
+    .. attribute:: primary
+
+        Indicates if this is the first work item of a feature.
+        The primary work item runs the scenarios that should not run, too
+        (to provide their skipped results).
+    """
+
+    def __init__(self, index, feature_index, scenario_indexes=None,
+                 primary=True):
+        self.index = index
+        self.feature_index = feature_index
+        self.scenario_indexes = scenario_indexes
+        self.primary = primary
+
+    def __repr__(self):
+        return "<WorkItem %d: feature=%d, scenarios=%r>" % \
+               (self.index, self.feature_index, self.scenario_indexes)
+
+    def locations(self, elements):
+        """Provides the file locations of this work item
+        (as ``file:line`` strings).
+        """
+        if self.scenario_indexes is None:
+            return [elements[0].filename]
+        return [six.text_type(elements[index].location)
+                for index in sorted(self.scenario_indexes)]
+
+
+@contextmanager
+def use_selected_scenarios(feature, selected_scenarios, keep_unselected=False):
+    """Run only the selected scenarios of a feature (in this context).
+    Rules and scenario outlines without selected scenarios are excluded.
+
+    :param feature:             Feature to use.
+    :param selected_scenarios:  Scenarios to run (as set of scenario ids).
+    :param keep_unselected:     Keep rules/outlines without scenarios (if true).
+    """
+    # pylint: disable=protected-access
+    saved_attributes = []
+
+    def select_run_items(entity):
+        run_items = []
+        for run_item in entity.run_items:
+            if isinstance(run_item, Rule):
+                without_run_items = not run_item.run_items
+                selected = (select_run_items(run_item) or
+                            (keep_unselected and without_run_items))
+            elif isinstance(run_item, ScenarioOutline):
+                scenarios = run_item.scenarios
+                selected_outline_scenarios = [scenario for scenario in scenarios
+                                              if id(scenario) in selected_scenarios]
+                if selected_outline_scenarios:
+                    saved_attributes.append((run_item, "_scenarios", scenarios))
+                    run_item._scenarios = selected_outline_scenarios
+                selected = (selected_outline_scenarios or
+                            (keep_unselected and not scenarios))
+            else:
+                selected = id(run_item) in selected_scenarios
+            if selected:
+                run_items.append(run_item)
+
+        saved_attributes.append((entity, "run_items", entity.run_items))
+        entity.run_items = run_items
+        return bool(run_items)
+
+    try:
+        select_run_items(feature)
+        yield feature
+    finally:
+        for model_element, name, value in reversed(saved_attributes):
+            setattr(model_element, name, value)
+
+
+def split_event_segments(events):
+    """Splits the recorded formatter events of a work item into segments
+    that belong to a model element (feature, rule or scenario).
+
+    :param events:  Recorded formatter events.
+    :return: Segments as dict: element_index -> (head_events, tail_events)
+    """
+    segments = {}
+    rule_indexes = []
+    owner_index = 0     # -- FEATURE: Always first model element.
+    for event in events:
+        event_name, element_index = event[:2]
+        tail = False
+        if event_name in ("feature", "rule", "scenario"):
+            owner_index = element_index
+            if event_name == "rule":
+                rule_indexes.append(element_index)
+        elif event_name == "rule_finished" and rule_indexes:
+            owner_index = rule_indexes.pop()
+            tail = True
+        elif event_name == "eof":
+            owner_index = 0
+            tail = True
+
+        segment = segments.setdefault(owner_index, ([], []))
+        segment[int(tail)].append(event)
+        if event_name == "rule_finished":
+            owner_index = rule_indexes[-1] if rule_indexes else 0
+    return segments
+
+
+# -----------------------------------------------------------------------------
+# WORKER PROCESS PARTS:
+# -----------------------------------------------------------------------------
+class FormatterEventRecorder(object):
+    """Records the formatter protocol while a feature is run
+    (in a worker process). Model elements are recorded by their index.
+
+    .. attribute:: picklable
+
+        If true, the recorded events can be sent to another process.
+        Otherwise, step matches and exceptions are recorded as they are.
+    """
+
+    def __init__(self, picklable=True):
+        self.picklable = picklable
+        self.events = []
+        self.element_indexes = {}
+
+    def reset(self, elements):
+        self.events = []
+        self.element_indexes = dict((id(element), index)
+                                    for index, element in enumerate(elements))
+
+    def record(self, event_name, data=None):
+        self.events.append((event_name, None, data))
+
+    def record_element(self, event_name, element):
+        index = self.element_indexes.get(id(element), None)
+        if index is None:
+            return  # -- UNKNOWN ELEMENT: Not part of the feature model.
+        self.events.append((event_name, index,
+                            snapshot_state(element, self.picklable)))
+
+    # -- FORMATTER API:
+    def uri(self, uri):
+        self.record("uri", uri)
+
+    def feature(self, feature):
+        self.record_element("feature", feature)
+
+    def rule(self, rule):
+        self.record_element("rule", rule)
+
+    def rule_finished(self):
+        self.record("rule_finished")
+
+    def background(self, background):
+        self.record_element("background", background)
+
+    def scenario(self, scenario):
+        self.record_element("scenario", scenario)
+
+    def step(self, step):
+        self.record_element("step", step)
+
+    def match(self, match):
+        if not self.picklable:
+            self.record("match", match)
+            return
+        self.record("match", make_match_data(match))
+
+    def result(self, step):
+        self.record_element("result", step)
+
+    def eof(self):
+        self.record("eof")
+
+    def close(self):
+        pass
+
+
+class FeatureResult(object):
+    """Result of a feature that was run by a worker process.
+
+    .. attribute:: feature_index
+
+        Index of the feature (in the list of features).
+
+    .. attribute:: events
+
+        Recorded formatter events as ``(event_name, element_index, data)`` tuples.
+
+    .. attribute:: states
+
+        Run-time state of each model element (after the feature was run).
+
+    .. attribute:: undefined_steps
+
+        Undefined steps, as element index (or as step object).
+
+    .. attribute:: work_item_index
+
+        Index of the work item that provides this result.
+    """
+
+    def __init__(self, feature_index, events=None, states=None, failed=False,
+                 undefined_steps=None, aborted=False, error=None,
+                 work_item_index=None):
+        self.feature_index = feature_index
+        self.work_item_index = work_item_index
+        self.events = events or []
+        self.states = states or []
+        self.failed = failed
+        self.undefined_steps = undefined_steps or []
+        self.aborted = aborted
+        self.error = error
+
+
+# -----------------------------------------------------------------------------
+# PARALLEL RUNNER:
+# -----------------------------------------------------------------------------
+class ParallelRunner(Runner):
+    """Test runner that runs features in parallel by using worker processes.
+    The number of worker processes is provided by the ``--jobs`` option.
+
+    Features are split into work items with one scenario each
+    (if :attr:`split_features` is enabled). Model entities that are tagged
+    with the :attr:`serial_tag` are kept together in one work item.
+
+    .. seealso:: :mod:`behave.runner_parallel`
+    """
+    WORKER_POLL_TIMEOUT = 0.5
+    split_features = True
+    serial_tag = "serial"
+    picklable_results = True
+
+    def __init__(self, config):
+        super(ParallelRunner, self).__init__(config)
+        self.feature_elements = []
+        self.work_items = []
+        self.workers = []
+
+    def should_run_in_parallel(self, features):
+        jobs = getattr(self.config, "jobs", 1) or 1
+        if jobs <= 1 or not features or self.config.dry_run:
+            return False
+        if not self.is_supported():
+            print("PARALLEL-RUNNER: Worker processes are not supported "
+                  "on this platform (running features sequentially).")
+            return False
+        return True
+
+    @staticmethod
+    def is_supported():
+        return make_process_context() is not None
+
+    def run_model(self, features=None):
+        if features is None:
+            features = self.features
+        if not self.should_run_in_parallel(features):
+            return super(ParallelRunner, self).run_model(features)
+
+        self.feature_elements = [collect_model_elements(feature)
+                                 for feature in features]
+        self.work_items = self.make_work_items(features)
+        if len(self.work_items) <= 1:
+            return super(ParallelRunner, self).run_model(features)
+        return self.run_model_in_parallel(features)
+
+    # -- WORK ITEMS:
+    def is_serial(self, model_element):
+        return self.serial_tag in model_element.tags
+
+    def split_feature(self, feature, elements):
+        """Splits a feature into groups of scenarios that can run in parallel.
+        Scenarios that should not run are added to the first group.
+
+        :param feature:     Feature to split.
+        :param elements:    Model elements of this feature.
+        :return: List of scenario groups (as lists of element indexes).
+        """
+        element_indexes = dict((id(element), index)
+                               for index, element in enumerate(elements))
+        scenario_groups = []
+        other_scenarios = []
+
+        def add_scenario_group(scenarios):
+            group = []
+            for scenario in scenarios:
+                if scenario.should_run(self.config):
+                    group.append(element_indexes[id(scenario)])
+                else:
+                    other_scenarios.append(element_indexes[id(scenario)])
+            if group:
+                scenario_groups.append(group)
+
+        def split_entity(entity):
+            for run_item in entity.run_items:
+                if isinstance(run_item, Rule) and self.is_serial(run_item):
+                    add_scenario_group(run_item.walk_scenarios())
+                elif isinstance(run_item, Rule):
+                    split_entity(run_item)
+                elif isinstance(run_item, ScenarioOutline) and \
+                        self.is_serial(run_item):
+                    add_scenario_group(run_item.scenarios)
+                elif isinstance(run_item, ScenarioOutline):
+                    for scenario in run_item.scenarios:
+                        add_scenario_group([scenario])
+                else:
+                    add_scenario_group([run_item])
+
+        split_entity(feature)
+        if scenario_groups:
+            scenario_groups[0].extend(other_scenarios)
+        return scenario_groups
+
+    def make_work_items(self, features):
+        """Splits the features into work items (in the order of the features).
+
+        :param features:    Features to use.
+        :return: List of work items.
+        """
+        work_items = []
+        for feature_index, feature in enumerate(features):
+            scenario_groups = []
+            if self.split_features and not self.is_serial(feature):
+                elements = self.feature_elements[feature_index]
+                scenario_groups = self.split_feature(feature, elements)
+
+            if len(scenario_groups) <= 1:
+                # -- CASE: Run complete feature (serial or not splittable).
+                work_items.append(WorkItem(len(work_items), feature_index))
+                continue
+            for group_index, scenario_indexes in enumerate(scenario_groups):
+                work_items.append(WorkItem(len(work_items), feature_index,
+                                           scenario_indexes,
+                                           primary=(group_index == 0)))
+        return work_items
+
+    def schedule_work_items(self, features):
+        """Determines the order in which the work items are dispatched.
+        If a duration history exists, the work items are ordered by their
+        estimated duration (longest first). This reduces the time where
+        one worker process runs the last long scenario and the others are idle.
+
+        :param features:    Features to use.
+        :return: List of work item indexes (in dispatch order).
+        """
+        work_item_indexes = [work_item.index for work_item in self.work_items]
+        if not self.duration_history:
+            return work_item_indexes
+
+        estimated_durations = {}
+        for work_item in self.work_items:
+            feature = features[work_item.feature_index]
+            if work_item.scenario_indexes is None:
+                scenarios = feature.walk_scenarios()
+            else:
+                elements = self.feature_elements[work_item.feature_index]
+                scenarios = [elements[index]
+                             for index in work_item.scenario_indexes]
+            estimated_durations[work_item.index] = \
+                self.duration_history.estimate(scenarios)
+        # -- HINT: Stable sort keeps model order for equal durations.
+        return sorted(work_item_indexes,
+                      key=lambda index: -estimated_durations[index])
+
+    # -- WORKER PROCESS:
+    def run_worker(self, worker_id, features, task_queue, result_queue):
+        """Runs the work items that are taken by this worker process.
+        The ``before_all`` and ``after_all`` hooks are run once per worker.
+        """
+        # pylint: disable=protected-access, broad-except
+        recorder = FormatterEventRecorder(self.picklable_results)
+        self.setup_worker(recorder)
+        self.setup_capture()
+        self.run_hook("before_all", self.context)
+
+        while True:
+            work_item_index = task_queue.get()
+            if work_item_index is None:
+                break   # -- NO MORE TASKS.
+            result_queue.put(("started", worker_id, work_item_index))
+            work_item = self.work_items[work_item_index]
+            result = self.run_feature_in_worker(features[work_item.feature_index],
+                                                work_item, recorder)
+            result_queue.put(("result", worker_id, result))
+
+        # -- AFTER-ALL:
+        cleanups_failed = False
+        self.run_hook("after_all", self.context)
+        try:
+            self.context._do_cleanups()
+        except Exception:
+            cleanups_failed = True
+        self.close_event_loop()
+        result_queue.put(("done", worker_id,
+                          (self.hook_failures, cleanups_failed, self.aborted,
+                           self.get_worker_match_statistics())))
+
+    def setup_worker(self, recorder):
+        """Prepares this runner (in the worker process) to run work items."""
+        self.formatters = [recorder]
+        self.config.reporters = []
+        self.context = Context(self)
+        self.hook_failures = 0
+        # -- FORKED COPY: Count only the step matching of this worker.
+        self.step_registry.reset_match_statistics()
+
+    def get_worker_match_statistics(self):
+        """Provides the step matching statistics of this worker process
+        (that are merged into the step registry of the main process).
+
+        :return: Tuple (match_statistics, cache_hits, cache_misses)
+        """
+        match_cache = self.step_registry.match_cache
+        return (self.step_registry.match_statistics,
+                match_cache.hits, match_cache.misses)
+
+    def get_worker_feature(self, feature, feature_index):
+        """Provides the feature (and its model elements) that this worker
+        uses to run the work items of a feature.
+        A worker process uses its (forked) copy of the model.
+
+        :return: Tuple (feature, elements)
+        """
+        return feature, self.feature_elements[feature_index]
+
+    def run_feature_in_worker(self, feature, work_item, recorder):
+        feature_index = work_item.feature_index
+        feature, elements = self.get_worker_feature(feature, feature_index)
+        recorder.reset(elements)
+        undefined_steps_initial_size = len(self.undefined_steps)
+        failed = False
+        try:
+            self.feature = feature
+            recorder.uri(feature.filename)
+            if work_item.scenario_indexes is None:
+                failed = feature.run(self)
+            else:
+                selected_scenarios = set(id(elements[index])
+                                         for index in work_item.scenario_indexes)
+                with use_selected_scenarios(feature, selected_scenarios,
+                                            keep_unselected=work_item.primary):
+                    failed = feature.run(self)
+        except KeyboardInterrupt:
+            self.abort(reason="KeyboardInterrupt")
+            failed = True
+
+        undefined_steps = []
+        for step in self.undefined_steps[undefined_steps_initial_size:]:
+            index = recorder.element_indexes.get(id(step), None)
+            if index is None:
+                # -- CASE: Undefined step outside of the feature model.
+                step = copy.copy(step)
+                step.exception = None
+                step.exc_traceback = None
+                if self.picklable_results:
+                    index = make_picklable(step)
+                else:
+                    index = step
+            if index is not None:
+                undefined_steps.append(index)
+
+        states = [snapshot_state(element, self.picklable_results)
+                  for element in elements]
+        return FeatureResult(feature_index, recorder.events, states,
+                             failed=failed, undefined_steps=undefined_steps,
+                             aborted=self.aborted,
+                             work_item_index=work_item.index)
+
+    # -- MAIN PROCESS:
+    @staticmethod
+    def make_queues():
+        """Creates the task queue and the result queue for the workers."""
+        process_context = make_process_context()
+        return process_context.Queue(), process_context.Queue()
+
+    def make_worker(self, worker_id, features, task_queue, result_queue):
+        process_context = make_process_context()
+        return process_context.Process(target=self.run_worker,
+                                       args=(worker_id, features,
+                                             task_queue, result_queue))
+
+    def start_workers(self, features, task_queue, result_queue):
+        jobs = min(self.config.jobs, len(self.work_items))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.workers = []
+        for worker_id in range(jobs):
+            worker = self.make_worker(worker_id, features,
+                                      task_queue, result_queue)
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+    def stop_workers(self, terminate=False):
+        for worker in self.workers:
+            if terminate and worker.is_alive():
+                worker.terminate()
+            worker.join()
+        self.workers = []
+
+    def receive_message(self, result_queue, running, stopped_workers):
+        """Receives the next message from the worker processes.
+        A dead worker process is reported with a "died" message.
+        """
+        while True:
+            try:
+                return result_queue.get(timeout=self.WORKER_POLL_TIMEOUT)
+            except queue.Empty:
+                pass
+
+            for worker_id, worker in enumerate(self.workers):
+                if worker_id in stopped_workers or worker.is_alive():
+                    continue
+                return ("died", worker_id, running.pop(worker_id, None))
+
+    def merge_feature_results(self, feature, results):
+        """Merges the results of the work items of one feature.
+        The formatter events of each scenario are taken from the work item
+        that has run this scenario.
+
+        :param feature: Feature to use.
+        :param results: Results of the work items of this feature.
+        :return: Merged feature result.
+        """
+        # pylint: disable=too-many-locals
+        if len(results) == 1:
+            work_item = self.work_items[results[0].work_item_index]
+            if work_item.scenario_indexes is None:
+                return results[0]
+
+        feature_index = results[0].feature_index
+        elements = self.feature_elements[feature_index]
+        element_indexes = dict((id(element), index)
+                               for index, element in enumerate(elements))
+        segments = [split_event_segments(result.events) for result in results]
+        scenario_owners = {}
+        for result_index, result in enumerate(results):
+            work_item = self.work_items[result.work_item_index]
+            for scenario_index in work_item.scenario_indexes:
+                scenario_owners[scenario_index] = result_index
+
+        # -- STEP: Merge formatter events in the order of the model elements.
+        # FAIL-EARLY: Results after the first failed scenario are dropped.
+        events = []
+        used_scenarios = {}
+        stop_after_failure = self.config.stop
+        stopped = []
+
+        def add_segment_events(element_index, part, owner=None):
+            candidates = segments
+            if owner is not None:
+                candidates = [segments[owner]]
+            for result_segments in candidates:
+                segment = result_segments.get(element_index, None)
+                if segment is not None:
+                    events.extend(segment[part])
+                    return
+
+        def add_scenario_events(scenario):
+            scenario_index = element_indexes[id(scenario)]
+            owner = scenario_owners.get(scenario_index, None)
+            if owner is None or stopped:
+                return
+            used_scenarios[scenario_index] = owner
+            add_segment_events(scenario_index, 0, owner)
+            if stop_after_failure and self.scenario_failed_in_result(
+                    scenario_index, results[owner]):
+                stopped.append(scenario_index)
+
+        def add_entity_events(entity):
+            entity_index = element_indexes[id(entity)]
+            add_segment_events(entity_index, 0)
+            for run_item in entity.run_items:
+                if isinstance(run_item, Rule) and not stopped:
+                    add_entity_events(run_item)
+                elif isinstance(run_item, ScenarioOutline):
+                    for scenario in run_item.scenarios:
+                        add_scenario_events(scenario)
+                elif not isinstance(run_item, Rule):
+                    add_scenario_events(run_item)
+            add_segment_events(entity_index, 1)
+
+        add_entity_events(feature)
+
+        # -- STEP: Merge run-time states of the model elements.
+        # Scenarios that were dropped use their initial state (not run).
+        states = [dict(state) for state in results[0].states]
+        dropped_indexes = set()
+        for scenario_index in scenario_owners:
+            owner = used_scenarios.get(scenario_index, None)
+            scenario = elements[scenario_index]
+            end_index = scenario_index + 1 + len(list(scenario.all_steps))
+            for index in range(scenario_index, end_index):
+                if owner is None:
+                    states[index] = snapshot_state(elements[index])
+                    dropped_indexes.add(index)
+                else:
+                    states[index] = results[owner].states[index]
+
+        for index, element in enumerate(elements):
+            if not isinstance(element, (Feature, Rule, ScenarioOutline)):
+                continue
+            # -- CONTAINER: Status is computed from its merged parts.
+            all_states = [result.states[index] for result in results]
+            state = states[index]
+            state["hook_failed"] = any(state.get("hook_failed", False)
+                                       for state in all_states)
+            failed = any(state.get("_cached_status") == Status.failed
+                         for state in all_states)
+            state["_cached_status"] = (failed and Status.failed
+                                       or Status.untested)
+            for name, select in (("run_starttime", min), ("run_endtime", max)):
+                values = [state[name] for state in all_states
+                          if state.get(name, None) is not None]
+                if values:
+                    state[name] = select(values)
+
+        undefined_steps = []
+        for result in results:
+            undefined_steps.extend(step for step in result.undefined_steps
+                                   if step not in dropped_indexes)
+        return FeatureResult(feature_index, events, states,
+                             failed=any(result.failed for result in results),
+                             undefined_steps=undefined_steps,
+                             aborted=any(result.aborted for result in results))
+
+    def scenario_failed_in_result(self, scenario_index, result):
+        """Checks if a scenario has failed in a work item result."""
+        elements = self.feature_elements[result.feature_index]
+        scenario = elements[scenario_index]
+        if result.states[scenario_index].get("hook_failed", False):
+            return True
+
+        end_index = scenario_index + 1 + len(list(scenario.all_steps))
+        for index in range(scenario_index + 1, end_index):
+            step_status = result.states[index].get("status", None)
+            if step_status in (Status.failed, Status.undefined):
+                return True
+        return False
+
+    def replay_feature_result(self, feature, result):
+        """Replays the recorded formatter protocol of a feature in this process
+        and restores the run-time state of its model elements.
+        """
+        elements = self.feature_elements[result.feature_index]
+        for event_name, element_index, data in result.events:
+            if event_name == "uri":
+                args = (data,)
+            elif event_name == "match":
+                args = (make_match(data),)
+            elif element_index is not None:
+                element = elements[element_index]
+                apply_state(element, data)
+                args = (element,)
+            else:
+                if event_name == "eof":
+                    self.apply_feature_states(elements, result.states)
+                args = ()
+
+            for formatter in self.formatters:
+                formatter_callback = getattr(formatter, event_name, None)
+                if formatter_callback:
+                    formatter_callback(*args)
+
+        self.apply_feature_states(elements, result.states)
+        for undefined_step in result.undefined_steps:
+            if isinstance(undefined_step, int):
+                undefined_step = elements[undefined_step]
+            self.undefined_steps.append(undefined_step)
+
+    @staticmethod
+    def apply_feature_states(elements, states):
+        for element, state in zip(elements, states):
+            apply_state(element, state)
+
+    def run_model_in_parallel(self, features):
+        # pylint: disable=too-many-branches, too-many-locals, too-many-statements
+        if not self.context:
+            self.context = Context(self)
+        self.setup_step_registry()
+        self.hook_failures = 0
+        feature_work_items = [[] for _ in features]
+        for work_item in self.work_items:
+            feature_work_items[work_item.feature_index].append(work_item)
+
+        task_queue, result_queue = self.make_queues()
+        self.start_workers(features, task_queue, result_queue)
+
+        dispatch_order = self.schedule_work_items(features)
+        dispatched = set()
+        results = {}
+        running = {}
+        stopped_workers = set()
+        next_task = 0
+        next_feature = 0
+        dispatching = True
+        run_feature = not self.aborted
+        failed_count = 0
+        cleanups_failed = False
+        undefined_steps_initial_size = len(self.undefined_steps)
+
+        def dispatch_next_task():
+            if dispatching and next_task < len(dispatch_order):
+                work_item_index = dispatch_order[next_task]
+                dispatched.add(work_item_index)
+                task_queue.put(work_item_index)
+                return next_task + 1
+            return next_task
+
+        try:
+            for _ in self.workers:
+                next_task = dispatch_next_task()
+
+            while next_feature < len(features):
+                # -- REPORT FEATURES: In the order of the features.
+                work_items = feature_work_items[next_feature]
+                if all(work_item.index in results for work_item in work_items):
+                    feature = features[next_feature]
+                    feature_results = [results.pop(work_item.index)
+                                       for work_item in work_items]
+                    feature_results = [result for result in feature_results
+                                       if result is not None]
+                    errors = [result.error for result in feature_results
+                              if result.error]
+                    if run_feature and errors:
+                        # -- WORKER PROCESS DIED: Feature result is lost.
+                        for error in errors:
+                            print("PARALLEL-RUNNER: %s" % error)
+                        feature.hook_failed = True
+                        feature.set_status(Status.failed)
+                        failed_count += 1
+                    elif run_feature and feature_results:
+                        result = self.merge_feature_results(feature,
+                                                            feature_results)
+                        self.replay_feature_result(feature, result)
+                        if result.aborted:
+                            self.abort(reason="Aborted in worker process")
+                        if result.failed:
+                            failed_count += 1
+                            if self.config.stop or self.aborted:
+                                # -- FAIL-EARLY: After first failure.
+                                run_feature = False
+                                dispatching = False
+
+                    # -- ALWAYS: Report run/not-run feature to reporters.
+                    self.report_feature(feature)
+                    next_feature += 1
+                    continue
+                not_dispatched = [work_item for work_item in work_items
+                                  if work_item.index not in dispatched and
+                                  work_item.index not in results]
+                if not dispatching and not_dispatched:
+                    for work_item in not_dispatched:
+                        results[work_item.index] = None     # -- NOT RUN.
+                    continue
+
+                message_type, worker_id, data = self.receive_message(
+                    result_queue, running, stopped_workers)
+                if message_type == "started":
+                    running[worker_id] = data
+                elif message_type == "result":
+                    running.pop(worker_id, None)
+                    results[data.work_item_index] = data
+                    next_task = dispatch_next_task()
+                elif message_type == "died":
+                    stopped_workers.add(worker_id)
+                    work_item_index = data
+                    if work_item_index is not None:
+                        work_item = self.work_items[work_item_index]
+                        elements = self.feature_elements[work_item.feature_index]
+                        error = "Worker process died while running: %s" % \
+                                ", ".join(work_item.locations(elements))
+                        results[work_item_index] = FeatureResult(
+                            work_item.feature_index, failed=True, error=error,
+                            work_item_index=work_item_index)
+                    if len(stopped_workers) == len(self.workers):
+                        # -- ALL WORKERS DIED: Remaining features are not run.
+                        dispatching = False
+                        for index in dispatched:
+                            results.setdefault(index, None)
+
+            # -- AFTER-ALL: Stop workers (runs after_all hook in each worker).
+            for _ in range(len(self.workers) - len(stopped_workers)):
+                task_queue.put(None)
+            while len(stopped_workers) < len(self.workers):
+                message_type, worker_id, data = self.receive_message(
+                    result_queue, running, stopped_workers)
+                if message_type == "done":
+                    stopped_workers.add(worker_id)
+                    hook_failures, worker_cleanups_failed, aborted, \
+                        match_statistics = data
+                    self.hook_failures += hook_failures
+                    if match_statistics is not None:
+                        self.step_registry.merge_match_statistics(
+                            *match_statistics)
+                    cleanups_failed = cleanups_failed or worker_cleanups_failed
+                    if aborted and not self.aborted:
+                        self.abort(reason="Aborted in worker process")
+                elif message_type == "died":
+                    stopped_workers.add(worker_id)
+            self.stop_workers()
+        except KeyboardInterrupt:
+            self.abort(reason="KeyboardInterrupt")
+            failed_count += 1
+            self.stop_workers(terminate=True)
+            for feature in features[next_feature:]:
+                self.report_feature(feature)
+
+        if self.aborted:
+            print("\nABORTED: By user.")
+        for formatter in self.formatters:
+            formatter.close()
+        for reporter in self.config.reporters:
+            reporter.end()
+
+        failed = ((failed_count > 0) or self.aborted or (self.hook_failures > 0)
+                  or (len(self.undefined_steps) > undefined_steps_initial_size)
+                  or cleanups_failed)
+        return failed
+
+
+# -----------------------------------------------------------------------------
+# THREADED RUNNER:
+# -----------------------------------------------------------------------------
+class ThreadSafeStepRegistry(object):
+    """Step registry wrapper that serializes step matching for threads
+    (step match caches and statistics are not thread-safe).
+    """
+
+    def __init__(self, step_registry):
+        self.step_registry = step_registry
+        self.lock = threading.Lock()
+
+    def find_match(self, step, evaluate=True):
+        with self.lock:
+            return self.step_registry.find_match(step, evaluate=evaluate)
+
+    def find_step_definition(self, step):
+        with self.lock:
+            return self.step_registry.find_step_definition(step)
+
+    def __getattr__(self, name):
+        return getattr(self.step_registry, name)
+
+
+class ThreadedRunner(ParallelRunner):
+    """Test runner that runs features (and their scenarios) in parallel
+    by using worker threads (instead of worker processes).
+    This is useful for I/O-bound steps, like HTTP requests or database queries.
+
+    Each worker thread uses its own runner object with its own context
+    (and context stack), capture controller and formatter event recorder.
+    The ``before_all`` and ``after_all`` hooks are run once per worker thread.
+    The output of each thread is captured without replacing the global
+    output streams for each scenario (see: :class:`ThreadCaptureDispatcher`).
+
+    Each worker thread runs its work items on its own copy of a feature
+    (the model elements are not shared with other threads).
+
+    .. code-block:: sh
+
+        # -- USE: Runner-alias "threaded" with 8 worker threads.
+        behave --runner=threaded --jobs=8 features/
+    """
+    picklable_results = False
+
+    def __init__(self, config):
+        super(ThreadedRunner, self).__init__(config)
+        self.capture_dispatcher = None
+        self.feature_copies = {}
+
+    @staticmethod
+    def is_supported():
+        return True
+
+    @staticmethod
+    def make_queues():
+        return queue.Queue(), queue.Queue()
+
+    def make_worker_runner(self):
+        """Creates the runner object for one worker thread.
+        The worker runner shares the configuration and hooks with this runner,
+        but uses its own run-time state (and its own copies of the features).
+        """
+        worker_runner = copy.copy(self)
+        worker_runner.workers = []
+        worker_runner.formatters = []
+        worker_runner._undefined_steps = []     # pylint: disable=protected-access
+        worker_runner.context = None
+        worker_runner.feature = None
+        worker_runner.hook_failures = 0
+        worker_runner.event_loop = None
+        worker_runner.feature_copies = {}
+        worker_runner.capture_controller = \
+            self.capture_dispatcher.make_capture_controller()
+        worker_runner.step_registry = ThreadSafeStepRegistry(self.step_registry)
+        return worker_runner
+
+    def make_worker(self, worker_id, features, task_queue, result_queue):
+        worker_runner = self.make_worker_runner()
+        return threading.Thread(target=worker_runner.run_worker,
+                                args=(worker_id, features,
+                                      task_queue, result_queue),
+                                name="behave-worker-%d" % worker_id)
+
+    def setup_worker(self, recorder):
+        # -- HINT: Configuration is shared with other threads (keep reporters).
+        self.formatters = [recorder]
+        self.context = Context(self)
+        self.hook_failures = 0
+
+    def get_worker_match_statistics(self):
+        # -- HINT: Step registry (and its statistics) is shared with this runner.
+        return None
+
+    def get_worker_feature(self, feature, feature_index):
+        feature_copy = self.feature_copies.get(feature_index, None)
+        if feature_copy is None:
+            # -- HINT: Model elements of the copy have the same element index.
+            the_copy = copy.deepcopy(feature)
+            feature_copy = (the_copy, collect_model_elements(the_copy))
+            self.feature_copies[feature_index] = feature_copy
+        return feature_copy
+
+    def stop_workers(self, terminate=False):
+        if terminate:
+            # -- THREADS CANNOT BE TERMINATED: Daemon threads are left behind.
+            self.workers = []
+            return
+        super(ThreadedRunner, self).stop_workers()
+
+    def run_model_in_parallel(self, features):
+        self.capture_dispatcher = ThreadCaptureDispatcher(self.config)
+        self.capture_dispatcher.install()
+        try:
+            return super(ThreadedRunner, self).run_model_in_parallel(features)
+        finally:
+            self.capture_dispatcher.uninstall()
@@ -10,6 +10,7 @@ from __future__ import absolute_import, print_function
 from bisect import bisect
 from collections import OrderedDict
 import glob
+import multiprocessing
 import os.path
 import re
 import sys
@@ -465,7 +466,66 @@ class PathManager(object):
 # -----------------------------------------------------------------------------
 # FUNCTIONS:
 # -----------------------------------------------------------------------------
-def parse_features(feature_files, language=None):
+def make_process_context():
+    """Provides the multiprocessing context with the "fork" start method.
+
+    :return: Multiprocessing context (or None, if not supported).
+    """
+    get_context = getattr(multiprocessing, "get_context", None)
+    if get_context is None:
+        # -- PYTHON2: Uses fork on POSIX platforms.
+        if hasattr(os, "fork"):
+            return multiprocessing
+        return None
+
+    try:
+        return get_context("fork")
+    except ValueError:
+        return None
+
+
+def _parse_feature_file(args):
+    """Parses a feature file in a worker process.
+
+    :return: Tuple (filename, parsed, feature). Parse errors are not sent back
+        (parsed=False). The caller parses the feature file again to raise them.
+    """
+    filename, language = args
+    try:
+        return filename, True, parser.parse_file(filename, language=language)
+    except Exception:   # pylint: disable=broad-except
+        return filename, False, None
+
+
+def parse_features_in_parallel(filenames, language=None, jobs=2):
+    """Parse feature files in a pool of worker processes.
+
+    :param filenames:   Feature filenames to parse.
+    :param language:    Default language to use.
+    :param jobs:        Number of worker processes to use.
+    :return: Features as dict (key: filename, value: feature or None).
+        Feature files with parse errors are not contained.
+    """
+    process_context = make_process_context()
+    if process_context is None or jobs <= 1 or len(filenames) <= 1:
+        return {}
+
+    jobs = min(jobs, len(filenames))
+    chunksize = max(1, len(filenames) // (jobs * 4))
+    pool = process_context.Pool(processes=jobs)
+    try:
+        results = pool.map(_parse_feature_file,
+                           [(filename, language) for filename in filenames],
+                           chunksize)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+    return dict((filename, feature)
+                for filename, parsed, feature in results if parsed)
+
+
+def parse_features(feature_files, language=None, feature_cache=None, jobs=1):
     """
     Parse feature files and return list of Feature model objects.
     Handles:
@@ -475,14 +535,27 @@ def parse_features(feature_files, language=None):
 
     :param feature_files: List of feature file names to parse.
     :param language:      Default language to use.
+    :param feature_cache: Feature cache to use (optional).
+    :param jobs:          Number of worker processes to parse feature files.
     :return: List of feature objects.
     """
-    scenario_collector = FeatureScenarioLocationCollector2()
-    features = []
+    locations = []
     for location in feature_files:
         if not isinstance(location, FileLocation):
             assert isinstance(location, string_types)
             location = FileLocation(os.path.normpath(location))
+        locations.append(location)
+
+    parse_file = parser.parse_file
+    if feature_cache is not None:
+        parse_file = feature_cache.parse_file
+    if jobs > 1:
+        parse_file = _make_parallel_parse_file(locations, language,
+                                               feature_cache, jobs, parse_file)
+
+    scenario_collector = FeatureScenarioLocationCollector2()
+    features = []
+    for location in locations:
 
         if location.filename == scenario_collector.filename:
             scenario_collector.add_location(location)
@@ -496,7 +569,7 @@ def parse_features(feature_files, language=None):
         # -- NEW FEATURE:
         assert isinstance(location, FileLocation)
         filename = os.path.abspath(location.filename)
-        feature = parser.parse_file(filename, language=language)
+        feature = parse_file(filename, language=language)
         if feature:
             # -- VALID FEATURE:
             # SKIP CORNER-CASE: Feature file without any feature(s).
@@ -509,6 +582,47 @@ def parse_features(feature_files, language=None):
     return features
 
 
+def _make_parallel_parse_file(locations, language, feature_cache, jobs,
+                              parse_file):
+    """Parses the feature files of all locations in parallel (if needed).
+
+    :return: Parse function that provides the parsed features.
+    """
+    filenames = []
+    seen_filenames = set()
+    for location in locations:
+        filename = os.path.abspath(location.filename)
+        if filename not in seen_filenames:
+            seen_filenames.add(filename)
+            filenames.append(filename)
+
+    parsed_features = {}
+    file_keys = {}
+    if feature_cache is not None:
+        for filename in filenames:
+            feature, file_keys[filename] = feature_cache.lookup(filename,
+                                                                language)
+            if feature is not None:
+                parsed_features[filename] = feature
+    pending_filenames = [filename for filename in filenames
+                         if filename not in parsed_features]
+    new_features = parse_features_in_parallel(pending_filenames, language, jobs)
+    if feature_cache is not None:
+        for filename, feature in new_features.items():
+            if feature is not None:
+                feature_cache.put(filename, language, feature,
+                                  file_keys[filename])
+    parsed_features.update(new_features)
+
+    def parse_parsed_file(filename, language=None):
+        # -- HINT: Each parsed feature is used only once (like parse_file()).
+        #    A feature file with parse errors is parsed again (raises error).
+        if filename in parsed_features:
+            return parsed_features.pop(filename)
+        return parse_file(filename, language=language)
+    return parse_parsed_file
+
+
 def collect_feature_locations(paths, strict=True):
     """
     Collect feature file names by processing list of paths (from command line).
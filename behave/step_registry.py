@@ -6,7 +6,12 @@ step implementations (step definitions). This is necessary to execute steps.
 """
 
 from __future__ import absolute_import
-from behave.matchers import Match, make_matcher
+import copy
+from behave.compat.collections import OrderedDict
+from behave.matchers import LazyMatch, Match, Matcher, MatchWithError, \
+    CombinedRegexMatcher, ParseMatcher, RegexMatcher, \
+    combine_regex_matchers, make_matcher
+from behave.pattern_cache import get_step_pattern_cache
 from behave.textutil import text as _text
 
 # limit import * to just the decorators
@@ -24,14 +29,329 @@ class AmbiguousStep(ValueError):
     pass
 
 
+def make_index_key(word):
+    """Normalize a (leading) word of a step text or step definition
+    to a key of the :class:`StepDefinitionIndex`.
+
+    Words with characters that have special case-folding rules
+    (that regular expressions with IGNORECASE consider as equal) are rejected.
+
+    :param word: Leading word (as string) to use.
+    :return: Index key (as string) or None (if word is not usable as key).
+    """
+    if not word:
+        return None
+    key = word.lower()
+    if len(key) != len(word):
+        return None
+    for char in key:
+        if char < u"\x80":
+            continue
+        casefold_char = getattr(char, "casefold", char.lower)()
+        if casefold_char != char or char.upper().lower() != char:
+            return None
+    return key
+
+
+def leading_word_of(step_text):
+    parts = step_text.split(None, 1)
+    if not parts or step_text[:1].isspace():
+        return None
+    return parts[0]
+
+
+class StepDefinitionIndex(object):
+    """Indexes the step definitions (matchers) of one step type
+    by the leading word of their step pattern.
+
+    A step definition without a known leading word is a candidate for any step.
+    Each bucket of candidates preserves the ordering of step definitions
+    (first registered step definition wins).
+
+    .. attribute:: combine_regex_matchers
+
+        If enabled, sequences of regex-based step definitions in a bucket
+        are matched with one combined regular expression
+        (see: :class:`~behave.matchers.CombinedRegexMatcher`).
+    """
+
+    def __init__(self, step_definitions=None, combine_regex_matchers=False):
+        self.frozen = False
+        self.step_definitions = []
+        self.wildcards = []
+        self.buckets = {}
+        self.positions = {}
+        self.patterns = {}
+        self.combine_regex_matchers = combine_regex_matchers
+        self._combined_buckets = {}
+        for step_definition in step_definitions or []:
+            self.add(step_definition)
+
+    @staticmethod
+    def make_key_for(step_definition):
+        if not isinstance(step_definition, Matcher):
+            return None
+        return make_index_key(step_definition.leading_word())
+
+    def add(self, step_definition):
+        assert not self.frozen, "FROZEN: Cannot add %r" % step_definition
+        self._combined_buckets.clear()
+        self.positions[step_definition] = len(self.step_definitions)
+        self.step_definitions.append(step_definition)
+        pattern = getattr(step_definition, "pattern", None)
+        self.patterns.setdefault(pattern, []).append(step_definition)
+        key = self.make_key_for(step_definition)
+        if key is None:
+            self.wildcards.append(step_definition)
+            for bucket in self.buckets.values():
+                bucket.append(step_definition)
+            return
+
+        bucket = self.buckets.get(key, None)
+        if bucket is None:
+            bucket = self.buckets[key] = list(self.wildcards)
+        bucket.append(step_definition)
+
+    def freeze(self):
+        """Converts the candidate lists into immutable tuples.
+        No step definitions can be added afterwards.
+        """
+        self.frozen = True
+        self.step_definitions = tuple(self.step_definitions)
+        self.wildcards = tuple(self.wildcards)
+        for key, bucket in self.buckets.items():
+            self.buckets[key] = tuple(bucket)
+
+    def candidates_for(self, step_text):
+        """Selects the step definitions that may match the step text.
+
+        :param step_text:  Step text (step name) to match.
+        :return: List of candidate step definitions (in registration order).
+        """
+        key = make_index_key(leading_word_of(step_text))
+        if key is None:
+            return self.step_definitions
+        return self.buckets.get(key, self.wildcards)
+
+    def ambiguity_candidates_for(self, step_text):
+        """Selects the step definitions that may conflict with a new
+        step definition (if they match its step text).
+        Step definitions with the same pattern are included, too.
+
+        :param step_text:  Step text (pattern) of the new step definition.
+        :return: List of step definitions (in registration order).
+        """
+        candidates = self.candidates_for(step_text)
+        same_pattern_candidates = self.patterns.get(step_text, None)
+        if not same_pattern_candidates:
+            return candidates
+        all_candidates = set(candidates)
+        all_candidates.update(same_pattern_candidates)
+        return sorted(all_candidates, key=self.positions.get)
+
+    def matchers_for(self, step_text):
+        """Selects the matchers that should be used to match the step text.
+        Same as :meth:`candidates_for()` but uses combined regex matchers
+        (if enabled).
+
+        :param step_text:  Step text (step name) to match.
+        :return: List of matchers (in registration order).
+        """
+        candidates = self.candidates_for(step_text)
+        if not self.combine_regex_matchers:
+            return candidates
+
+        bucket_id = id(candidates)
+        matchers = self._combined_buckets.get(bucket_id, None)
+        if matchers is None:
+            matchers = combine_regex_matchers(candidates)
+            self._combined_buckets[bucket_id] = matchers
+        return matchers
+
+
+class StepMatchCache(object):
+    """Bounded LRU cache of step matches, keyed by ``(step_type, step_text)``.
+    A step text without matching step definition is cached, too.
+
+    Only step matches without type converted argument values are cached:
+    the unconverted :class:`~behave.matchers.LazyMatch` of parse-based
+    step definitions and the matches of regex-based step definitions.
+    Therefore, the type conversion of the arguments is performed again
+    for each step (converted values are never shared between steps).
+    Each lookup returns a new match object with a copied list of arguments.
+
+    .. attribute:: hits
+
+        Number of lookups that were answered by the cache.
+
+    .. attribute:: misses
+
+        Number of lookups that required step matching.
+    """
+    NO_MATCH = object()
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.registered_types_version = Matcher.registered_types_version
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def clear(self):
+        self._data.clear()
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _ensure_registered_types_are_unchanged(self):
+        if self.registered_types_version != Matcher.registered_types_version:
+            self.registered_types_version = Matcher.registered_types_version
+            self.clear()
+
+    @staticmethod
+    def copy_match(match):
+        if isinstance(match, LazyMatch):
+            return match.copy()
+        arguments = match.arguments
+        if arguments is not None:
+            arguments = [copy.copy(argument) for argument in arguments]
+        return match.with_arguments(arguments)
+
+    def get(self, key):
+        """Lookup the match for a step key.
+
+        :param key:  Tuple of ``(step_type, step_text)``.
+        :return: Match object, None (no match) or :attr:`NO_MATCH` (unknown).
+        """
+        self._ensure_registered_types_are_unchanged()
+        match = self._data.pop(key, self.NO_MATCH)
+        if match is self.NO_MATCH:
+            self.misses += 1
+            return self.NO_MATCH
+
+        self.hits += 1
+        self._data[key] = match     # -- MARK: Most recently used.
+        if match is None:
+            return None
+        return self.copy_match(match)
+
+    def put(self, key, match):
+        """Store the match for a step key.
+        The match must not contain type converted argument values
+        (use: :class:`~behave.matchers.LazyMatch` or text values).
+        """
+        if not self.enabled:
+            return
+        if match is not None:
+            if (not isinstance(match, Match) or
+                    isinstance(match, MatchWithError)):
+                # -- NOT CACHED: Type conversion errors are rechecked.
+                return
+            match = self.copy_match(match)
+
+        self._data.pop(key, None)
+        self._data[key] = match
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)   # -- DROP: Least recently used.
+
+
+class StepMatchStatistics(object):
+    """Step matching statistics for one step type (used for profiling).
+
+    .. attribute:: lookups
+
+        Number of :meth:`StepRegistry.find_match()` calls.
+
+    .. attribute:: cache_hits
+
+        Number of lookups that were answered by the match cache.
+
+    .. attribute:: matched
+
+        Number of lookups that found a matching step definition.
+
+    .. attribute:: undefined
+
+        Number of lookups that found no matching step definition.
+
+    .. attribute:: tried_candidates
+
+        Number of (step definition) matchers that were tried.
+    """
+
+    def __init__(self, step_type):
+        self.step_type = step_type
+        self.lookups = 0
+        self.cache_hits = 0
+        self.matched = 0
+        self.undefined = 0
+        self.tried_candidates = 0
+
+    def reset(self):
+        self.lookups = 0
+        self.cache_hits = 0
+        self.matched = 0
+        self.undefined = 0
+        self.tried_candidates = 0
+
+    def merge(self, other):
+        """Adds the counters of other statistics (from a worker process)."""
+        self.lookups += other.lookups
+        self.cache_hits += other.cache_hits
+        self.matched += other.matched
+        self.undefined += other.undefined
+        self.tried_candidates += other.tried_candidates
+
+    @property
+    def tried_candidates_per_match(self):
+        matches = self.lookups - self.cache_hits
+        if matches <= 0:
+            return 0.0
+        return float(self.tried_candidates) / matches
+
+    def describe(self):
+        return (u"%-5s: lookups=%d, cache_hits=%d, matched=%d, undefined=%d, "
+                u"tried_candidates=%d (%.1f per match)" % (
+                    self.step_type, self.lookups, self.cache_hits,
+                    self.matched, self.undefined, self.tried_candidates,
+                    self.tried_candidates_per_match))
+
+    def __repr__(self):
+        return u"<%s %s>" % (self.__class__.__name__, self.describe())
+
+
 class StepRegistry(object):
-    def __init__(self):
+    """Registry of step definitions (matchers) for each step type.
+
+    .. attribute:: combine_regex_matchers
+
+        Opt-in mode (default: False). Matches many regex-based step definitions
+        (step-matcher: "re", "re0") with one combined regular expression.
+    """
+    MATCH_CACHE_SIZE = 1024
+
+    def __init__(self, match_cache_size=None, combine_regex_matchers=False):
+        if match_cache_size is None:
+            match_cache_size = self.MATCH_CACHE_SIZE
         self.steps = {
             "given": [],
             "when": [],
             "then": [],
             "step": [],
         }
+        self.match_cache = StepMatchCache(match_cache_size)
+        self.match_statistics = dict((step_type, StepMatchStatistics(step_type))
+                                     for step_type in self.steps)
+        self.combine_regex_matchers = combine_regex_matchers
+        self._indexes = {}
 
     @staticmethod
     def same_step_definition(step, other_pattern, other_location):
@@ -44,47 +364,163 @@ class StepRegistry(object):
         step_type = keyword.lower()
         step_text = _text(step_text)
         step_definitions = self.steps[step_type]
-        for existing in step_definitions:
+        index = self._get_index_for((step_type,), [step_definitions])
+        candidates = index.ambiguity_candidates_for(step_text)
+        pattern_cache = get_step_pattern_cache()
+        check_ambiguity = (pattern_cache is None or
+            not pattern_cache.is_unambiguous(step_type, step_text, candidates))
+        for existing in candidates:
             if self.same_step_definition(existing, step_text, step_location):
                 # -- EXACT-STEP: Same step function is already registered.
                 # This may occur when a step module imports another one.
                 return
-            elif existing.match(step_text):     # -- SIMPLISTIC
+            elif check_ambiguity and existing.lazy_match(step_text):  # -- SIMPLISTIC
                 message = u"%s has already been defined in\n  existing step %s"
                 new_step = u"@%s('%s')" % (step_type, step_text)
                 existing.step_type = step_type
                 existing_step = existing.describe()
                 existing_step += u" at %s" % existing.location
                 raise AmbiguousStep(message % (new_step, existing_step))
-        step_definitions.append(make_matcher(func, step_text))
+        if check_ambiguity and pattern_cache is not None:
+            pattern_cache.add_unambiguous(step_type, step_text, candidates)
+        step_definition = make_matcher(func, step_text)
+        step_definitions.append(step_definition)
+        self._add_to_index((step_type,), [step_definitions], step_definition)
+        self.match_cache.clear()
 
-    def find_step_definition(self, step):
-        candidates = self.steps[step.step_type]
-        more_steps = self.steps["step"]
-        if step.step_type != "step" and more_steps:
-            # -- ENSURE: self.step_type lists are not modified/extended.
-            candidates = list(candidates)
-            candidates += more_steps
+    def _step_definitions_for(self, step_type):
+        step_definitions = [self.steps[step_type]]
+        if step_type != "step":
+            step_definitions.append(self.steps["step"])
+        return step_definitions
 
+    def _make_index_signature(self, step_definitions):
+        signature = tuple((id(x), len(x)) for x in step_definitions)
+        return signature + (self.combine_regex_matchers,)
+
+    def _get_index_for(self, index_key, step_definitions, frozen=False):
+        signature = self._make_index_signature(step_definitions)
+        index_data = self._indexes.get(index_key, None)
+        if index_data is None or index_data[0] != signature:
+            index = StepDefinitionIndex(
+                combine_regex_matchers=self.combine_regex_matchers)
+            for this_step_definitions in step_definitions:
+                for step_definition in this_step_definitions:
+                    index.add(step_definition)
+            if frozen:
+                index.freeze()
+            if index_data is not None:
+                # -- REBUILT INDEX: Cached matches may be outdated.
+                #    HINT: A new index has no cached matches (keep others).
+                self.match_cache.clear()
+            index_data = self._indexes[index_key] = (signature, index)
+        return index_data[1]
+
+    def _add_to_index(self, index_key, step_definitions, step_definition):
+        # -- AVOID: Rebuilding the index after each new step definition.
+        index = self._indexes[index_key][1]
+        index.add(step_definition)
+        signature = self._make_index_signature(step_definitions)
+        self._indexes[index_key] = (signature, index)
+
+    def get_index(self, step_type):
+        """Provides the index of step definitions that are usable
+        for a step type (including generic step definitions).
+        The index provides immutable candidate views and is only rebuilt
+        if the step definitions have changed (after registration).
+        """
+        step_definitions = self._step_definitions_for(step_type)
+        return self._get_index_for(step_type, step_definitions, frozen=True)
+
+    def find_step_definition(self, step):
+        candidates = self.get_index(step.step_type).candidates_for(step.name)
         for step_definition in candidates:
-            if step_definition.match(step.name):
+            if step_definition.lazy_match(step.name):
                 return step_definition
         return None
 
-    def find_match(self, step):
-        candidates = self.steps[step.step_type]
-        more_steps = self.steps["step"]
-        if step.step_type != "step" and more_steps:
-            # -- ENSURE: self.step_type lists are not modified/extended.
-            candidates = list(candidates)
-            candidates += more_steps
+    @staticmethod
+    def is_cacheable_match(step_definition, match):
+        """Checks if a step match contains no type converted argument values.
+        Regex-based step definitions provide the matched text as values.
+        """
+        return (isinstance(match, LazyMatch) or
+                isinstance(step_definition, (RegexMatcher, CombinedRegexMatcher)))
 
-        for step_definition in candidates:
-            result = step_definition.match(step.name)
-            if result:
-                return result
+    def find_match(self, step, evaluate=True):
+        """Find the step definition that matches the step
+        and provides the step match.
 
-        return None
+        :param step:        Step to match (with step_type and name).
+        :param evaluate:    If false, type conversion of the step arguments
+                            is deferred (returns :class:`LazyMatch`, if possible).
+        :return: Match object or None (if step is undefined).
+        """
+        index = self.get_index(step.step_type)
+        statistics = self.match_statistics[step.step_type]
+        statistics.lookups += 1
+        cache_key = (step.step_type, step.name)
+        match = self.match_cache.get(cache_key)
+        if match is not StepMatchCache.NO_MATCH:
+            statistics.cache_hits += 1
+        else:
+            match = None
+            cacheable = True
+            for step_definition in index.matchers_for(step.name):
+                statistics.tried_candidates += 1
+                if evaluate and not isinstance(step_definition, ParseMatcher):
+                    result = step_definition.match(step.name)
+                else:
+                    # -- TYPE CONVERSION: Deferred (performed for each step).
+                    result = step_definition.lazy_match(step.name)
+                if result:
+                    match = result
+                    cacheable = self.is_cacheable_match(step_definition, match)
+                    break
+            if cacheable:
+                self.match_cache.put(cache_key, match)
+
+        if evaluate and isinstance(match, LazyMatch):
+            # -- TYPE CONVERSION: For each step (never shared between steps).
+            #    Type converters may return mutable values or have side effects.
+            match = match.evaluate()
+
+        if match:
+            statistics.matched += 1
+        else:
+            statistics.undefined += 1
+        return match
+
+    def reset_match_statistics(self):
+        for statistics in self.match_statistics.values():
+            statistics.reset()
+        self.match_cache.reset_counters()
+
+    def merge_match_statistics(self, match_statistics, cache_hits=0,
+                               cache_misses=0):
+        """Adds the step matching statistics of another step registry
+        (for example: from a worker process).
+
+        :param match_statistics:    Statistics per step type (as dict).
+        :param cache_hits:      Number of match cache hits to add.
+        :param cache_misses:    Number of match cache misses to add.
+        """
+        for step_type, statistics in match_statistics.items():
+            self.match_statistics[step_type].merge(statistics)
+        self.match_cache.hits += cache_hits
+        self.match_cache.misses += cache_misses
+
+    def describe_match_statistics(self):
+        """Describe the step matching statistics (per step type).
+
+        :return: Textual description (as string).
+        """
+        lines = [self.match_statistics[step_type].describe()
+                 for step_type in ("given", "when", "then", "step")]
+        lines.append(u"cache: size=%d, hits=%d, misses=%d" % (
+            len(self.match_cache), self.match_cache.hits,
+            self.match_cache.misses))
+        return u"\n".join(lines)
 
     def make_decorator(self, step_type):
         def decorator(step_text):
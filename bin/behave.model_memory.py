@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Utility script to measure the memory that is used by behave model objects
+(steps with table rows and step match arguments).
+
+REQUIRES: Python >= 3.4 (tracemalloc module)
+LICENSE:  BSD
+
+EXAMPLE:
+
+    python bin/behave.model_memory.py --steps=100000
+"""
+
+from __future__ import absolute_import, print_function
+from optparse import OptionParser
+import sys
+import tracemalloc
+from behave.model import Step, Table
+from behave.model_core import Argument
+
+
+# ----------------------------------------------------------------------------
+# FUNCTIONS:
+# ----------------------------------------------------------------------------
+def make_steps(count, table_rows=0):
+    """Create steps (and the arguments of their step matches)."""
+    steps = []
+    arguments = []
+    for index in range(count):
+        table = None
+        if table_rows:
+            table = Table([u"name", u"value"])
+            for row_index in range(table_rows):
+                table.add_row([u"name%d" % row_index, u"%d" % row_index],
+                              line=index+row_index+2)
+        step = Step(u"features/example.feature", index+1, u"Given", u"given",
+                    u"a step with %d" % index, table=table)
+        steps.append(step)
+        arguments.append(Argument(14, 14+len(str(index)), u"%d" % index, index))
+    return steps, arguments
+
+
+def measure_memory(count, table_rows=0):
+    """Measure the memory that is used by some steps.
+
+    :return: Allocated memory in bytes.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    steps_and_arguments = make_steps(count, table_rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del steps_and_arguments
+    return after - before
+
+
+# ----------------------------------------------------------------------------
+# MAIN FUNCTION:
+# ----------------------------------------------------------------------------
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--steps", type="int", default=100000,
+                      help="Number of steps to create (default: %default).")
+    parser.add_option("--table-rows", type="int", default=2,
+                      help="Number of table rows per step (default: %default).")
+    options, _ = parser.parse_args(args)
+
+    memory = measure_memory(options.steps, options.table_rows)
+    print("%d steps (with %d table rows): %.1f MB (%d bytes per step)" % \
+          (options.steps, options.table_rows, memory / 1e6,
+           memory // max(1, options.steps)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,7 +27,10 @@ Feature: Runner Help
       And the command output should contain:
         """
         AVAILABLE RUNNERS:
-          default  = behave.runner:Runner
+          async     = behave.runner_async:AsyncRunner
+          default   = behave.runner:Runner
+          parallel  = behave.runner_parallel:ParallelRunner
+          threaded  = behave.runner_parallel:ThreadedRunner
         """
 
     Scenario: Good Runner by using a Runner-Alias
@@ -55,8 +58,11 @@ Feature: Runner Help
       Then it should pass
       And the command output should contain:
         """
-        default  = behave.runner:Runner
-        some     = behave4me.good_runner:SomeRunner
+        async     = behave.runner_async:AsyncRunner
+        default   = behave.runner:Runner
+        parallel  = behave.runner_parallel:ParallelRunner
+        some      = behave4me.good_runner:SomeRunner
+        threaded  = behave.runner_parallel:ThreadedRunner
         """
       And note that "the new runner appears in the sorted list of runners"
       But the command output should not contain "UNAVAILABLE RUNNERS"
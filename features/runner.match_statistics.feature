@@ -0,0 +1,73 @@
+Feature: Show Step Matching Statistics
+
+  As a tester with a large step library
+  I want to see how many step definitions are tried to match the steps
+  So that I can find out if the step matching is slow (profiling).
+
+  . SPECIFICATION:
+  .   * Use "behave --show-match-statistics" (or "show_match_statistics"
+  .     in the config-file) to print the step matching statistics
+  .     (per step type) at the end of the run.
+  .   * Parallel runners merge the statistics of their worker processes.
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/use_steplib_behave4cmd.py" with:
+        """
+        import behave4cmd0.passing_steps
+        """
+    And a file named "features/alice.feature" with:
+        """
+        Feature: Alice
+          Scenario: A1
+            Given a step passes
+            When another step passes
+            Then a step passes
+
+          Scenario: A2
+            Given a step passes
+            And an undefined step
+        """
+
+  Scenario: Show step matching statistics
+    When I run "behave -f progress --no-snippets --show-match-statistics features"
+    Then it should fail with:
+        """
+        STEP MATCH STATISTICS:
+          given: lookups=3, cache_hits=1, matched=2, undefined=1, tried_candidates=2 (1.0 per match)
+          when : lookups=1, cache_hits=0, matched=1, undefined=0, tried_candidates=1 (1.0 per match)
+          then : lookups=1, cache_hits=0, matched=1, undefined=0, tried_candidates=1 (1.0 per match)
+          step : lookups=0, cache_hits=0, matched=0, undefined=0, tried_candidates=0 (0.0 per match)
+          cache: size=4, hits=1, misses=4
+        """
+
+  Scenario: Show step matching statistics with configuration file
+    Given a file named "behave.ini" with:
+        """
+        [behave]
+        show_match_statistics = true
+        """
+    When I run "behave -f progress --no-snippets features"
+    Then it should fail with:
+        """
+        STEP MATCH STATISTICS:
+          given: lookups=3, cache_hits=1, matched=2, undefined=1, tried_candidates=2 (1.0 per match)
+        """
+
+  Scenario: Parallel runner shows merged statistics of its worker processes
+    When I run "behave -f progress --no-snippets --show-match-statistics --runner=parallel --jobs=2 features"
+    Then it should fail with:
+        """
+        STEP MATCH STATISTICS:
+        """
+    And the command output should contain "when : lookups=1, cache_hits=0, matched=1, undefined=0"
+    And the command output should contain "then : lookups=1, cache_hits=0, matched=1, undefined=0"
+    And the command output should contain "step : lookups=0, cache_hits=0, matched=0, undefined=0"
+
+  Scenario: Step matching statistics are not shown by default
+    When I run "behave -f progress --no-snippets features"
+    Then it should fail with:
+        """
+        1 scenario passed, 1 failed, 0 skipped
+        """
+    And the command output should not contain "STEP MATCH STATISTICS:"
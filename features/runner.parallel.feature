@@ -0,0 +1,360 @@
+Feature: Parallel Test Runner (process-pool and thread-pool runner)
+
+  As a tester
+  I want to run features in parallel (by using worker processes or threads)
+  So that the wall-clock time of a test run is reduced.
+
+  . SPECIFICATION:
+  .   * Use "behave --runner=parallel --jobs=N" (or runner/jobs in config-file)
+  .   * Each worker process runs "before_all" and "after_all" hooks once.
+  .   * Features are split into scenarios (work items) that are distributed
+  .     over the worker processes (an idle worker takes the next work item).
+  .   * A feature, rule or scenario outline with tag "@serial"
+  .     is run completely by one worker process.
+  .   * Use "behave --runner=threaded --jobs=N" to run features in worker threads
+  .     (useful for I/O-bound steps).
+  .   * Use "behave --runner=async --jobs=N" to run async steps (coroutines)
+  .     of up to N scenarios concurrently on one event loop.
+  .   * Formatters and reporters show features in the same order
+  .     as in a sequential test run.
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/use_steplib_behave4cmd.py" with:
+        """
+        import behave4cmd0.passing_steps
+        import behave4cmd0.failing_steps
+        """
+    And a file named "features/environment.py" with:
+        """
+        from __future__ import print_function
+
+        def before_all(ctx):
+            print("HOOK: before_all")
+
+        def after_all(ctx):
+            print("HOOK: after_all")
+        """
+    And a file named "features/alice.feature" with:
+        """
+        Feature: Alice
+          Scenario: A1
+            Given a step passes
+            When another step passes
+
+          Scenario Outline: A2 -- <name>
+            Given a step passes
+            Examples:
+              | name |
+              | one  |
+              | two  |
+        """
+    And a file named "features/bob.feature" with:
+        """
+        Feature: Bob
+          Scenario: B1
+            Given a step passes
+            When a step fails
+            Then another step passes
+        """
+    And a file named "features/charly.feature" with:
+        """
+        Feature: Charly
+          Scenario: C1
+            Given a step passes
+            When an undefined step is used
+        """
+
+  Scenario: Run features with parallel runner
+    When I run "behave --runner=parallel --jobs=2 -f plain --no-timings features/"
+    Then it should fail with:
+        """
+        Failing scenarios:
+          features/bob.feature:2  B1
+          features/charly.feature:2  C1
+
+        1 feature passed, 2 failed, 0 skipped
+        3 scenarios passed, 2 failed, 0 skipped
+        6 steps passed, 1 failed, 1 skipped, 1 undefined
+        """
+    And the command output should contain:
+        """
+        Feature: Alice
+
+          Scenario: A1
+            Given a step passes ... passed
+            When another step passes ... passed
+
+          Scenario Outline: A2 -- one -- @1.1
+            Given a step passes ... passed
+
+          Scenario Outline: A2 -- two -- @1.2
+            Given a step passes ... passed
+
+        Feature: Bob
+
+          Scenario: B1
+            Given a step passes ... passed
+            When a step fails ... failed
+        Assertion Failed: EXPECT: Failing step
+
+        Feature: Charly
+
+          Scenario: C1
+            Given a step passes ... passed
+            When an undefined step is used ... undefined
+        """
+    And the command output should contain 2 times:
+        """
+        HOOK: before_all
+        """
+    And the command output should contain:
+        """
+        You can implement step definitions for undefined steps with these snippets:
+
+        @when(u'an undefined step is used')
+        """
+
+  Scenario: Split feature into scenarios that run in parallel
+    Given a file named "features/environment.py" with:
+        """
+        from __future__ import print_function
+
+        def before_feature(ctx, feature):
+            print("HOOK: before_feature %s" % feature.name)
+        """
+    When I run "behave --runner=parallel --jobs=2 -f plain --no-timings features/alice.feature"
+    Then it should pass with:
+        """
+        1 feature passed, 0 failed, 0 skipped
+        3 scenarios passed, 0 failed, 0 skipped
+        4 steps passed, 0 failed, 0 skipped, 0 undefined
+        """
+    And the command output should contain 3 times:
+        """
+        HOOK: before_feature Alice
+        """
+    And the command output should contain:
+        """
+        Feature: Alice
+
+          Scenario: A1
+            Given a step passes ... passed
+            When another step passes ... passed
+
+          Scenario Outline: A2 -- one -- @1.1
+            Given a step passes ... passed
+
+          Scenario Outline: A2 -- two -- @1.2
+            Given a step passes ... passed
+        """
+
+  Scenario: Feature with @serial tag is run by one worker process
+    Given a file named "features/environment.py" with:
+        """
+        from __future__ import print_function
+
+        def before_feature(ctx, feature):
+            print("HOOK: before_feature %s" % feature.name)
+        """
+    And a file named "features/serial.feature" with:
+        """
+        @serial
+        Feature: Serial
+          Scenario: S1
+            Given a step passes
+
+          Scenario: S2
+            Given another step passes
+        """
+    When I run "behave --runner=parallel --jobs=2 -f plain --no-timings features/serial.feature features/alice.feature"
+    Then it should pass with:
+        """
+        2 features passed, 0 failed, 0 skipped
+        5 scenarios passed, 0 failed, 0 skipped
+        """
+    And the command output should contain 1 times:
+        """
+        HOOK: before_feature Serial
+        """
+    And the command output should contain 3 times:
+        """
+        HOOK: before_feature Alice
+        """
+
+  Scenario: Record duration history for scheduling of next test run
+    When I run "behave --runner=parallel --jobs=2 -f plain --duration-history=build/duration_history.json features/alice.feature"
+    Then it should pass
+    And a file named "build/duration_history.json" should exist
+    And the file "build/duration_history.json" should contain:
+        """
+        "features/alice.feature::A1":
+        """
+    When I run "behave --runner=parallel --jobs=2 -f plain --no-timings --duration-history=build/duration_history.json features/alice.feature"
+    Then it should pass with:
+        """
+        1 feature passed, 0 failed, 0 skipped
+        3 scenarios passed, 0 failed, 0 skipped
+        """
+
+  Scenario: Run features with threaded runner
+    When I run "behave --runner=threaded --jobs=2 -f plain --no-timings features/"
+    Then it should fail with:
+        """
+        Failing scenarios:
+          features/bob.feature:2  B1
+          features/charly.feature:2  C1
+
+        1 feature passed, 2 failed, 0 skipped
+        3 scenarios passed, 2 failed, 0 skipped
+        6 steps passed, 1 failed, 1 skipped, 1 undefined
+        """
+    And the command output should contain:
+        """
+        Feature: Alice
+
+          Scenario: A1
+            Given a step passes ... passed
+            When another step passes ... passed
+
+          Scenario Outline: A2 -- one -- @1.1
+            Given a step passes ... passed
+
+          Scenario Outline: A2 -- two -- @1.2
+            Given a step passes ... passed
+
+        Feature: Bob
+
+          Scenario: B1
+            Given a step passes ... passed
+            When a step fails ... failed
+        Assertion Failed: EXPECT: Failing step
+
+        Feature: Charly
+
+          Scenario: C1
+            Given a step passes ... passed
+            When an undefined step is used ... undefined
+        """
+    And the command output should contain 2 times:
+        """
+        HOOK: before_all
+        """
+
+  @use.with_python.min_version=3.5
+  Scenario: Run async steps with async runner
+    Given a file named "features/steps/async_steps.py" with:
+        """
+        import asyncio
+        from behave import step
+
+        @step('an async step waits {duration:f} seconds')
+        async def step_async_step_waits(context, duration):
+            await asyncio.sleep(duration)
+        """
+    And a file named "features/async.feature" with:
+        """
+        Feature: Async
+          Scenario: D1
+            Given an async step waits 0.5 seconds
+
+          Scenario: D2
+            Given an async step waits 0.5 seconds
+
+          Scenario: D3
+            Given an async step waits 0.5 seconds
+        """
+    When I run "behave --runner=async --jobs=3 -f plain --no-timings features/async.feature"
+    Then it should pass with:
+        """
+        1 feature passed, 0 failed, 0 skipped
+        3 scenarios passed, 0 failed, 0 skipped
+        3 steps passed, 0 failed, 0 skipped, 0 undefined
+        """
+    And the command output should contain:
+        """
+        Feature: Async
+
+          Scenario: D1
+            Given an async step waits 0.5 seconds ... passed
+
+          Scenario: D2
+            Given an async step waits 0.5 seconds ... passed
+
+          Scenario: D3
+            Given an async step waits 0.5 seconds ... passed
+        """
+
+  @use.with_python.min_version=3.7
+  Scenario: Async runner captures output of async steps for each scenario
+    Given a file named "features/steps/async_steps.py" with:
+        """
+        from __future__ import print_function
+        import asyncio
+        import logging
+        from behave import step
+
+        @step('an async step logs "{text}" after {duration:f} seconds')
+        async def step_async_step_logs(context, text, duration):
+            print("BEFORE: %s" % text)
+            await asyncio.sleep(duration)
+            print("AFTER: %s" % text)
+            logging.getLogger("async").warning("LOG: %s", text)
+        """
+    And a file named "features/async.feature" with:
+        """
+        Feature: Async
+          Scenario: D1
+            Given an async step logs "D1" after 0.3 seconds
+            Then a step fails
+
+          Scenario: D2
+            Given an async step logs "D2" after 0.1 seconds
+            Then a step fails
+
+          Scenario: D3
+            Given an async step logs "D3" after 0.2 seconds
+            Then a step fails
+        """
+    When I run "behave --runner=async --jobs=3 -f plain --no-timings features/async.feature"
+    Then it should fail with:
+        """
+        0 features passed, 1 failed, 0 skipped
+        0 scenarios passed, 3 failed, 0 skipped
+        3 steps passed, 3 failed, 0 skipped, 0 undefined
+        """
+    And the command output should contain:
+        """
+          Scenario: D1
+            Given an async step logs "D1" after 0.3 seconds ... passed
+            Then a step fails ... failed
+        Assertion Failed: EXPECT: Failing step
+        Captured stdout:
+        BEFORE: D1
+        AFTER: D1
+
+        Captured logging:
+        WARNING:async:LOG: D1
+
+          Scenario: D2
+            Given an async step logs "D2" after 0.1 seconds ... passed
+            Then a step fails ... failed
+        Assertion Failed: EXPECT: Failing step
+        Captured stdout:
+        BEFORE: D2
+        AFTER: D2
+
+        Captured logging:
+        WARNING:async:LOG: D2
+
+          Scenario: D3
+            Given an async step logs "D3" after 0.2 seconds ... passed
+            Then a step fails ... failed
+        Assertion Failed: EXPECT: Failing step
+        Captured stdout:
+        BEFORE: D3
+        AFTER: D3
+
+        Captured logging:
+        WARNING:async:LOG: D3
+        """
@@ -120,3 +120,28 @@ Feature: Runner should stop after first failure if --stop option is used
             1 scenario passed, 1 failed, 0 skipped, 4 untested
             4 steps passed, 1 failed, 1 skipped, 0 undefined, 8 untested
             """
+
+    Scenario: Stop running after first failure in a Scenario Outline
+        Given a file named "features/outline_fails.feature" with:
+            """
+            Feature: Outline
+                Scenario Outline: O1 with <name>
+                    Given a step <outcome>
+
+                    Examples:
+                      | name  | outcome |
+                      | Alice | fails   |
+                      | Bob   | passes  |
+                      | Carl  | passes  |
+            """
+        When I run "behave -f plain -T --stop features/outline_fails.feature"
+        Then it should fail with:
+            """
+            0 features passed, 1 failed, 0 skipped
+            0 scenarios passed, 1 failed, 0 skipped, 2 untested
+            0 steps passed, 1 failed, 0 skipped, 0 undefined, 2 untested
+            """
+        And the command output should contain:
+            """
+            features/outline_fails.feature:7  O1 with Alice -- @1.1
+            """
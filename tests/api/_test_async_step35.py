@@ -11,7 +11,10 @@ from hamcrest import assert_that, close_to
 import pytest
 
 from behave._stepimport import use_step_import_modules, SimpleStepContainer
-from behave.runner import Context, Runner
+from behave.configuration import Configuration
+from behave.fixture import use_fixture
+from behave.matchers import Match
+from behave.runner import Context, Runner, scoped_context_layer
 from .testing_support import StopWatch
 from .testing_support_async import AsyncStepTheory
 
@@ -157,3 +160,69 @@ class TestAsyncStepRunPy35:
         context = Context(runner=Runner(config={}))
         with pytest.raises(ZeroDivisionError):
             when_async_step_raises_exception(context)
+
+
+@py35_or_newer
+class TestAsyncStepRunByRunnerPy35(object):
+    """Async steps, hooks and fixtures without async_run_until_complete()."""
+
+    @staticmethod
+    def make_runner():
+        return Runner(Configuration("", load_config=False))
+
+    def test_async_step_is_awaited(self):
+        import asyncio  # pylint: disable=import-outside-toplevel
+        traced_loops = []
+
+        async def step_impl(context):
+            await asyncio.sleep(0)
+            traced_loops.append(asyncio.get_event_loop())
+
+        runner = self.make_runner()
+        context = Context(runner)
+        Match(step_impl, []).run(context)
+        Match(step_impl, []).run(context)
+        assert len(traced_loops) == 2
+        assert traced_loops[0] is traced_loops[1]
+        assert traced_loops[0] is runner.event_loop
+        runner.close_event_loop()
+        assert runner.event_loop is None
+
+    def test_async_step_failure_is_detected(self):
+        async def step_fails(context):
+            assert False, "XFAIL in async-step"
+
+        runner = self.make_runner()
+        with pytest.raises(AssertionError):
+            Match(step_fails, []).run(Context(runner))
+        runner.close_event_loop()
+
+    def test_async_hook_is_awaited(self):
+        async def before_scenario(context, scenario):
+            context.traced.append(scenario)
+
+        runner = self.make_runner()
+        runner.hooks["before_scenario"] = before_scenario
+        context = Context(runner)
+        context.traced = []
+        runner.run_hook("before_scenario", context, "S1")
+        assert context.traced == ["S1"]
+        assert runner.hook_failures == 0
+        runner.close_event_loop()
+
+    def test_async_fixture_performs_setup_and_cleanup(self):
+        traced = []
+
+        async def foo(context, name):
+            traced.append("setup:%s" % name)
+            yield name
+            traced.append("cleanup:%s" % name)
+
+        runner = self.make_runner()
+        context = Context(runner)
+        with scoped_context_layer(context):
+            the_fixture = use_fixture(foo, context, "Alice")
+            assert the_fixture == "Alice"
+            assert traced == ["setup:Alice"]
+        assert traced == ["setup:Alice", "cleanup:Alice"]
+        runner.close_event_loop()
@@ -4,24 +4,33 @@ Unittests for :mod:`behave.capture` module.
 """
 
 from __future__ import absolute_import, print_function
+import logging
 import sys
-from behave.capture import Captured, CaptureController
+import threading
+from behave.capture import \
+    Captured, CaptureController, ThreadCaptureDispatcher, ThreadOutputStream
 from mock import Mock
+from six import StringIO
 import pytest
 
 # -----------------------------------------------------------------------------
 # TEST SUPPORT:
 # -----------------------------------------------------------------------------
+def create_capture_config():
+    config = Mock()
+    config.stdout_capture = True
+    config.stderr_capture = True
+    config.log_capture = True
+    config.logging_filter = None
+    config.logging_level = "INFO"
+    config.logging_format = "%(levelname)s:%(name)s:%(message)s"
+    config.logging_datefmt = None
+    config.logging_clear_handlers = False
+    return config
+
 def create_capture_controller(config=None):
     if not config:
-        config = Mock()
-        config.stdout_capture = True
-        config.stderr_capture = True
-        config.log_capture = True
-        config.logging_filter = None
-        config.logging_level = "INFO"
-        config.logging_format = "%(levelname)s:%(name)s:%(message)s"
-        config.logging_datefmt = None
+        config = create_capture_config()
     return CaptureController(config)
 
 def setup_capture_controller(capture_controller, context=None):
@@ -280,3 +289,115 @@ HELLO
 Captured stderr:
 Alice"""
         assert report == expected
+
+
+class TestThreadOutputStream(object):
+
+    def test_write__redirects_output_of_current_thread_only(self):
+        stream = StringIO()
+        thread_stream = StringIO()
+        output_stream = ThreadOutputStream(stream)
+
+        def write_in_other_thread():
+            output_stream.write("OTHER\n")
+
+        output_stream.redirect(thread_stream)
+        output_stream.write("HELLO\n")
+        thread = threading.Thread(target=write_in_other_thread)
+        thread.start()
+        thread.join()
+        output_stream.redirect(None)
+        output_stream.write("BYE\n")
+
+        assert thread_stream.getvalue() == "HELLO\n"
+        assert stream.getvalue() == "OTHER\nBYE\n"
+
+
+class TestThreadCaptureController(object):
+
+    def test_capturing__in_several_threads(self):
+        config = create_capture_config()
+        dispatcher = ThreadCaptureDispatcher(config)
+        captured = {}
+
+        def run_capture(name):
+            capture_controller = dispatcher.make_capture_controller()
+            setup_capture_controller(capture_controller)
+            capture_controller.start_capture()
+            for index in range(3):
+                sys.stdout.write("%s:stdout:%d\n" % (name, index))
+                sys.stderr.write("%s:stderr:%d\n" % (name, index))
+                logging.getLogger("test").info("%s:log:%d", name, index)
+            capture_controller.stop_capture()
+            captured[name] = capture_controller.captured
+            capture_controller.teardown_capture()
+
+        dispatcher.install()
+        try:
+            threads = [threading.Thread(target=run_capture, args=(name,))
+                       for name in ("Alice", "Bob")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            dispatcher.uninstall()
+
+        for name in ("Alice", "Bob"):
+            assert captured[name].stdout == "".join(
+                "%s:stdout:%d\n" % (name, index) for index in range(3))
+            assert captured[name].stderr == "".join(
+                "%s:stderr:%d\n" % (name, index) for index in range(3))
+            assert captured[name].log_output == "\n".join(
+                "INFO:test:%s:log:%d" % (name, index) for index in range(3))
+
+    @pytest.mark.parametrize("clear_handlers", [False, True])
+    def test_captured_log_record_does_not_reach_existing_handler(self,
+                                                                 clear_handlers):
+        config = create_capture_config()
+        config.logging_clear_handlers = clear_handlers
+        dispatcher = ThreadCaptureDispatcher(config)
+        existing_handler = logging.StreamHandler(StringIO())
+        root_logger = logging.getLogger()
+        root_logger.addHandler(existing_handler)
+        captured = {}
+
+        def run_capture():
+            capture_controller = dispatcher.make_capture_controller()
+            setup_capture_controller(capture_controller)
+            capture_controller.start_capture()
+            logging.getLogger("test").info("CAPTURED")
+            capture_controller.stop_capture()
+            captured["log"] = capture_controller.captured.log_output
+            capture_controller.teardown_capture()
+
+        dispatcher.install()
+        try:
+            thread = threading.Thread(target=run_capture)
+            thread.start()
+            thread.join()
+            logging.getLogger("test").info("NOT_CAPTURED")
+        finally:
+            dispatcher.uninstall()
+            root_logger.removeHandler(existing_handler)
+
+        output = existing_handler.stream.getvalue()
+        assert captured["log"] == "INFO:test:CAPTURED"
+        if clear_handlers:
+            assert output == ""
+        else:
+            assert output == "NOT_CAPTURED\n"
+
+    def test_uninstall_restores_existing_handlers(self):
+        config = create_capture_config()
+        dispatcher = ThreadCaptureDispatcher(config)
+        existing_handler = logging.NullHandler()
+        root_logger = logging.getLogger()
+        root_logger.addHandler(existing_handler)
+        try:
+            dispatcher.install()
+            assert existing_handler not in root_logger.handlers
+            dispatcher.uninstall()
+            assert existing_handler in root_logger.handlers
+        finally:
+            root_logger.removeHandler(existing_handler)
@@ -243,10 +243,13 @@ class TestConfigFileParser(object):
         config_options_names = [opt[0] for opt in config_options]
         expected_names = [
             "color",
+            "combine_regex_matchers",
             "default_format",
             "default_tags",
             "dry_run",
+            "duration_history",
             "exclude_re",
+            "feature_cache",
             "format",
             "include_re",
             "jobs",
@@ -261,10 +264,13 @@ class TestConfigFileParser(object):
             "logging_level",
             "name",
             "outfiles",
+            "parse_jobs",
             "paths",
             "quiet",
+            "release_run_data",
             "runner",
             "scenario_outline_annotation_schema",
+            "show_match_statistics",
             "show_multiline",
             "show_skipped",
             "show_snippets",
@@ -273,6 +279,7 @@ class TestConfigFileParser(object):
             "stage",
             "stderr_capture",
             "stdout_capture",
+            "step_pattern_cache",
             "steps_catalog",
             "stop",
             "summary",
@@ -0,0 +1,115 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.duration_history`.
+"""
+
+from __future__ import absolute_import
+import pytest
+from behave.duration_history import DurationHistory
+from behave.model_core import Status
+from behave.parser import parse_feature
+
+
+FEATURE_TEXT = u"""
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+
+  Scenario: A2
+    Given a step passes
+
+  Scenario: A3
+    Given a step passes
+"""
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    return str(tmp_path/"duration_history.json")
+
+
+def make_feature_with_durations(*durations):
+    feature = parse_feature(FEATURE_TEXT, filename=u"features/alice.feature")
+    for scenario, duration in zip(feature.scenarios, durations):
+        step = scenario.steps[0]
+        if duration is None:
+            step.status = Status.skipped
+        else:
+            step.status = Status.passed
+            step.duration = duration
+        scenario.clear_status()
+    return feature
+
+
+class TestDurationHistory(object):
+    # pylint: disable=no-self-use
+
+    def test_update_records_durations_of_scenarios_that_were_run(self):
+        feature = make_feature_with_durations(1.5, 0.5, None)
+        history = DurationHistory()
+        history.update([feature])
+
+        scenario1, scenario2, scenario3 = feature.scenarios
+        assert len(history) == 2
+        assert history.get(scenario1) == 1.5
+        assert history.get(scenario2) == 0.5
+        assert history.get(scenario3) is None
+        assert history.changed
+
+    def test_save_and_load(self, history_file):
+        feature = make_feature_with_durations(1.5, 0.5, 2.0)
+        history1 = DurationHistory(history_file)
+        history1.update([feature])
+        history1.save()
+
+        history2 = DurationHistory(history_file)
+        history2.load()
+        assert history2.entries == history1.entries
+        assert not history1.changed
+
+    def test_load_ignores_corrupted_history_file(self, history_file):
+        with open(history_file, "w") as f:
+            f.write("{ NOT JSON")
+        history = DurationHistory(history_file)
+        history.load()
+        assert len(history) == 0
+
+    def test_estimate_uses_mean_duration_for_unknown_scenarios(self):
+        feature = make_feature_with_durations(1.5, 0.5, None)
+        history = DurationHistory()
+        history.update([feature])
+
+        scenario1, _, scenario3 = feature.scenarios
+        assert history.estimate([scenario1]) == 1.5
+        assert history.estimate([scenario3]) == 1.0
+        assert history.estimate(feature.scenarios) == 3.0
+        assert DurationHistory().estimate(feature.scenarios) == 0.0
+
+    def test_load_computes_mean_duration(self, history_file):
+        feature = make_feature_with_durations(1.5, 0.5, 4.0)
+        history1 = DurationHistory(history_file)
+        history1.update([feature])
+        history1.save()
+        assert history1.mean_duration == 2.0
+
+        history2 = DurationHistory(history_file)
+        assert history2.mean_duration == 0.0
+        history2.load()
+        assert history2.mean_duration == 2.0
+
+    def test_save_removes_entries_of_scenarios_that_were_not_run(self, history_file):
+        feature = make_feature_with_durations(1.5, 0.5, None)
+        history1 = DurationHistory(history_file)
+        history1.entries[u"features/gone.feature::Gone"] = 9.0
+        history1.entries[u"features/alice.feature::A3"] = 3.0
+        history1.update([feature])
+        history1.save()
+
+        history2 = DurationHistory(history_file)
+        history2.load()
+        assert sorted(history2.entries) == [
+            u"features/alice.feature::A1",
+            u"features/alice.feature::A2",
+            u"features/alice.feature::A3",
+        ]
+        assert history2.mean_duration == (1.5 + 0.5 + 3.0) / 3
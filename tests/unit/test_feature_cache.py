@@ -0,0 +1,164 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.feature_cache`.
+"""
+
+from __future__ import absolute_import
+import io
+import os
+import time
+import pytest
+from behave.feature_cache import FeatureCache
+from behave.model_core import FileLocation, Status
+from behave.runner_util import make_process_context, parse_features
+
+
+FEATURE_TEXT = u"""
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+    When another step passes
+
+  Scenario: A2
+    Then a step passes
+"""
+
+
+def write_feature_file(filename, text=FEATURE_TEXT, age=60):
+    with io.open(filename, "w", encoding="UTF-8") as feature_file:
+        feature_file.write(text)
+    # -- AVOID RACY FILE: Modification time must be older than parse time.
+    past_time = time.time() - age
+    os.utime(filename, (past_time, past_time))
+
+
+@pytest.fixture
+def feature_cache_file(tmp_path):
+    return str(tmp_path/"feature_cache.data")
+
+
+@pytest.fixture
+def feature_file(tmp_path):
+    filename = str(tmp_path/"alice.feature")
+    write_feature_file(filename)
+    return filename
+
+
+class TestFeatureCache(object):
+    # pylint: disable=no-self-use, redefined-outer-name
+
+    def test_parse_file_returns_equal_feature_from_cache(self, feature_cache_file,
+                                                         feature_file):
+        feature_cache1 = FeatureCache(feature_cache_file)
+        feature1 = feature_cache1.parse_file(feature_file)
+        feature_cache1.save()
+
+        feature_cache2 = FeatureCache(feature_cache_file)
+        feature_cache2.load()
+        feature2 = feature_cache2.parse_file(feature_file)
+        assert feature_cache1.misses == 1
+        assert feature_cache2.hits == 1
+        assert feature2 is not feature1
+        assert feature2.name == feature1.name
+        assert feature2.filename == feature1.filename
+        assert [s.name for s in feature2.scenarios] == [u"A1", u"A2"]
+        assert feature2.scenarios[0].steps == feature1.scenarios[0].steps
+        assert feature2.scenarios[0].feature is feature2
+
+    def test_parse_file_parses_changed_file_again(self, feature_cache_file,
+                                                  feature_file):
+        feature_cache = FeatureCache(feature_cache_file)
+        feature_cache.parse_file(feature_file)
+        write_feature_file(feature_file,
+                           FEATURE_TEXT.replace(u"Alice", u"Alice2"), age=30)
+        feature = feature_cache.parse_file(feature_file)
+        assert feature_cache.misses == 2
+        assert feature.name == u"Alice2"
+
+    def test_parse_file_with_other_language_is_not_from_cache(self,
+                                                              feature_cache_file,
+                                                              feature_file):
+        feature_cache = FeatureCache(feature_cache_file)
+        feature_cache.parse_file(feature_file, language="en")
+        feature_cache.parse_file(feature_file, language=None)
+        assert feature_cache.hits == 0
+        assert feature_cache.misses == 2
+
+    def test_parse_file_does_not_store_racy_file(self, feature_cache_file,
+                                                 feature_file):
+        write_feature_file(feature_file, age=0)
+        feature_cache = FeatureCache(feature_cache_file)
+        feature_cache.parse_file(feature_file)
+        assert len(feature_cache) == 0
+        assert feature_cache.changed is False
+
+    def test_parse_file_removes_entry_of_racy_file(self, feature_cache_file,
+                                                   feature_file):
+        feature_cache1 = FeatureCache(feature_cache_file)
+        feature_cache1.parse_file(feature_file)
+        feature_cache1.save()
+
+        write_feature_file(feature_file, age=0)
+        feature_cache2 = FeatureCache(feature_cache_file)
+        feature_cache2.load()
+        feature_cache2.parse_file(feature_file)
+        assert feature_cache2.changed is True
+        feature_cache2.save()
+
+        feature_cache3 = FeatureCache(feature_cache_file)
+        feature_cache3.load()
+        assert len(feature_cache3) == 0
+
+    def test_load_ignores_cache_file_with_other_signature(self, feature_cache_file,
+                                                          feature_file):
+        feature_cache1 = FeatureCache(feature_cache_file)
+        feature_cache1.parse_file(feature_file)
+        feature_cache1.save()
+
+        FeatureCache.FORMAT_VERSION += 1
+        try:
+            feature_cache2 = FeatureCache(feature_cache_file)
+            feature_cache2.load()
+        finally:
+            FeatureCache.FORMAT_VERSION -= 1
+        assert not feature_cache2.entries
+
+    def test_load_ignores_corrupted_cache_file(self, feature_cache_file):
+        with open(feature_cache_file, "wb") as cache_file:
+            cache_file.write(b"CORRUPTED")
+        feature_cache = FeatureCache(feature_cache_file)
+        feature_cache.load()
+        assert not feature_cache.entries
+
+    def test_save_discards_entries_of_removed_files(self, feature_cache_file,
+                                                    feature_file):
+        feature_cache = FeatureCache(feature_cache_file)
+        feature_cache.parse_file(feature_file)
+        assert len(feature_cache) == 1
+        os.remove(feature_file)
+        feature_cache.save()
+        assert len(feature_cache) == 0
+
+
+def test_parse_features_uses_feature_cache(feature_cache_file, feature_file):
+    feature_cache = FeatureCache(feature_cache_file)
+    parse_features([FileLocation(feature_file, 7)], feature_cache=feature_cache)
+    features = parse_features([feature_file], feature_cache=feature_cache)
+    assert feature_cache.hits == 1
+    # -- ENSURE: Scenario selection of the first run is not in the cache.
+    statuses = [s.status for s in features[0].scenarios]
+    assert statuses == [Status.untested, Status.untested]
+
+
+@pytest.mark.skipif(make_process_context() is None,
+                    reason="REQUIRES: multiprocessing with fork start method")
+def test_parse_features_in_parallel_uses_feature_cache(feature_cache_file, tmp_path):
+    filenames = [str(tmp_path/"alice.feature"), str(tmp_path/"bob.feature")]
+    for filename in filenames:
+        write_feature_file(filename)
+    feature_cache = FeatureCache(feature_cache_file)
+    parse_features(filenames, feature_cache=feature_cache, jobs=2)
+    assert sorted(feature_cache.entries.keys()) == filenames
+    features = parse_features(filenames, feature_cache=feature_cache, jobs=2)
+    assert feature_cache.hits == 2
+    assert [os.path.abspath(feature.filename) for feature in features] == filenames
@@ -0,0 +1,45 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave._fileutil`.
+"""
+
+from __future__ import absolute_import
+import os
+import stat
+import sys
+import pytest
+from behave._fileutil import get_default_file_mode, save_file_atomically
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"),
+                    reason="POSIX file modes are required")
+@pytest.mark.parametrize("umask", [0o022, 0o077])
+def test_save_file_atomically_uses_umask_file_mode(tmp_path, umask):
+    filename = str(tmp_path/"some.data")
+    old_umask = os.umask(umask)
+    try:
+        save_file_atomically(filename, lambda f: f.write("DATA"))
+        expected_mode = get_default_file_mode()
+    finally:
+        os.umask(old_umask)
+    assert expected_mode == 0o666 & ~umask
+    assert stat.S_IMODE(os.stat(filename).st_mode) == expected_mode
+
+
+def test_save_file_atomically_replaces_file(tmp_path):
+    filename = str(tmp_path/"subdir"/"some.data")
+    save_file_atomically(filename, lambda f: f.write(b"OLD"), binary=True)
+    save_file_atomically(filename, lambda f: f.write(b"NEW"), binary=True)
+    with open(filename, "rb") as this_file:
+        assert this_file.read() == b"NEW"
+    assert os.listdir(str(tmp_path/"subdir")) == ["some.data"]
+
+
+def test_save_file_atomically_removes_temp_file_on_error(tmp_path):
+    def write_data(this_file):
+        raise ValueError("OOPS")
+
+    filename = str(tmp_path/"some.data")
+    with pytest.raises(ValueError):
+        save_file_atomically(filename, write_data)
+    assert os.listdir(str(tmp_path)) == []
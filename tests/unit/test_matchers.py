@@ -1,13 +1,15 @@
 # -*- coding: UTF-8 -*-
 from __future__ import absolute_import, with_statement
+import re
 import pytest
 from mock import Mock, patch
 import parse
 from behave.exception import NotSupportedWarning
 from behave.matchers import (
-    Match, Matcher,
+    Match, Matcher, LazyMatch, MatchWithError,
     ParseMatcher, CFParseMatcher,
-    RegexMatcher, SimplifiedRegexMatcher, CucumberRegexMatcher)
+    RegexMatcher, SimplifiedRegexMatcher, CucumberRegexMatcher,
+    CombinedRegexMatcher, combine_regex_matchers)
 from behave import matchers, runner
 
 
@@ -148,6 +150,50 @@ class TestParseMatcher(object):
         m.run(context)
         assert self.recorded_args == ((context, 'foo', 11, 3.14159), {})
 
+    def test_lazy_match_defers_type_conversion(self):
+        converted = []
+        def parse_number(text):
+            converted.append(text)
+            return int(text)
+        parse_number.pattern = r"\d+"
+
+        this_matcher_class = self.STEP_MATCHER_CLASS
+        pattern = "has {count:Number} items of {name}"
+        matcher = this_matcher_class(self.record_args, pattern)
+        matcher.parser = matcher.parser_class(pattern, dict(Number=parse_number))
+
+        m = matcher.lazy_match("has 42 items of foo")
+        assert isinstance(m, LazyMatch)
+        assert converted == []
+        have = [(a.start, a.end, a.original, a.name) for a in m.arguments]
+        assert have == [(4, 6, "42", "count"), (16, 19, "foo", "name")]
+        assert converted == []
+
+        m2 = m.evaluate()
+        assert converted == ["42"]
+        assert not isinstance(m2, LazyMatch)
+        assert [a.value for a in m2.arguments] == [42, "foo"]
+        assert matcher.lazy_match("has no items") is None
+
+        # -- LAZY ARGUMENT VALUES: Converted on first access (once).
+        assert [a.value for a in m.arguments] == [42, "foo"]
+        assert [a.value for a in m.arguments] == [42, "foo"]
+        assert converted == ["42", "42"]
+
+    def test_lazy_match_evaluate_with_conversion_error(self):
+        def parse_number(text):
+            raise ValueError("BAD NUMBER: %s" % text)
+        parse_number.pattern = r"\d+"
+
+        this_matcher_class = self.STEP_MATCHER_CLASS
+        pattern = "has {:Number} items"
+        matcher = this_matcher_class(self.record_args, pattern)
+        matcher.parser = matcher.parser_class(pattern, dict(Number=parse_number))
+
+        m = matcher.lazy_match("has 42 items")
+        assert m.arguments[0].value == "42"
+        assert isinstance(m.evaluate(), MatchWithError)
+
 
 class TestCFParseMatcher(TestParseMatcher):
     STEP_MATCHER_CLASS = CFParseMatcher
@@ -398,3 +444,119 @@ def test_step_matcher_current_matcher():
 
     # -- CLEANUP: Revert to default matcher
     step_matcher_factory.use_default_step_matcher()
+
+
+@pytest.mark.parametrize("matcher_class, pattern, expected", [
+    (ParseMatcher, u"the user {name} is logged in", u"the"),
+    (ParseMatcher, u"passes", u"passes"),
+    (ParseMatcher, u"{count:d} apples", None),
+    (ParseMatcher, u"item{number:d} exists", None),
+    (CFParseMatcher, u"a step. with dot", u"a"),
+    (SimplifiedRegexMatcher, u"I do (?P<what>.*)", u"I"),
+    (SimplifiedRegexMatcher, u"ab? c", None),
+    (SimplifiedRegexMatcher, u"foo|bar baz", None),
+    (CucumberRegexMatcher, u"^I do$", u"I"),
+    (CucumberRegexMatcher, u"^I do", u"I"),
+    (CucumberRegexMatcher, u"^Ido", None),
+])
+def test_matcher_leading_word(matcher_class, pattern, expected):
+    matcher = matcher_class(None, pattern)
+    assert matcher.leading_word() == expected
+
+
+class TestCombinedRegexMatcher(object):
+    # pylint: disable=invalid-name, no-self-use
+
+    @staticmethod
+    def step_func1(context, *args, **kwargs):
+        pass
+
+    @staticmethod
+    def step_func2(context, *args, **kwargs):
+        pass
+
+    def make_matchers(self):
+        return [
+            SimplifiedRegexMatcher(self.step_func1, r"I have (?P<count>\d+) items"),
+            SimplifiedRegexMatcher(self.step_func2, r"I have (\w+) (red|blue) items"),
+            CucumberRegexMatcher(self.step_func1, r"^I (?P<verb>\w+)"),
+        ]
+
+    @pytest.mark.parametrize("step_text", [
+        u"I have 10 items",
+        u"I have many red items",
+        u"I eat apples",
+        u"Nobody has items",
+    ])
+    def test_match_returns_same_match_as_sequential_matching(self, step_text):
+        matchers = self.make_matchers()
+        combined = CombinedRegexMatcher(matchers)
+        expected = None
+        for matcher in matchers:
+            expected = matcher.match(step_text)
+            if expected:
+                break
+
+        match = combined.match(step_text)
+        assert match == expected
+        if expected:
+            actual_args = [(a.start, a.end, a.original, a.value, a.name)
+                           for a in match.arguments]
+            expected_args = [(a.start, a.end, a.original, a.value, a.name)
+                             for a in expected.arguments]
+            assert actual_args == expected_args
+
+    @pytest.mark.parametrize("pattern, expected", [
+        (r"I (?P<a>\w+) and (?P<b>x|y)", r"I (?:\w+) and (?:x|y)"),
+        (r"I (?:\w+)(?=!)", r"I (?:\w+)(?=!)"),
+        (r"[(?P<]x", r"[(?P<]x"),
+        (r"\(?P<a>x\)", r"\(?P<a>x\)"),
+        (r"(a)\1", None),
+        (r"(?P<a>.)(?P=a)", None),
+        (r"(?i)some step", None),
+    ])
+    def test_make_combinable_pattern(self, pattern, expected):
+        assert CombinedRegexMatcher.make_combinable_pattern(pattern) == expected
+
+    def test_combine_regex_matchers_preserves_ordering(self):
+        matchers = self.make_matchers()
+        parse_matcher = ParseMatcher(self.step_func2, u"I {verb} it")
+        regex_matcher = CucumberRegexMatcher(self.step_func2, r"(?i)^I do$")
+        all_matchers = matchers[:2] + [parse_matcher] + matchers[2:] + [regex_matcher]
+
+        combined = combine_regex_matchers(all_matchers)
+        assert len(combined) == 4
+        assert isinstance(combined[0], CombinedRegexMatcher)
+        assert combined[0].matchers == matchers[:2]
+        assert combined[1:] == [parse_matcher, matchers[2], regex_matcher]
+
+    def test_combine_regex_matchers_excludes_matcher_with_regex_flags(self):
+        class IgnoreCaseRegexMatcher(RegexMatcher):
+            def __init__(self, func, pattern, step_type=None):
+                super(IgnoreCaseRegexMatcher, self).__init__(func, pattern, step_type)
+                self.regex = re.compile(pattern, re.IGNORECASE)
+
+        matchers = self.make_matchers()[:2]
+        ignorecase_matcher = IgnoreCaseRegexMatcher(self.step_func1, r"I go$")
+        assert not CombinedRegexMatcher.can_combine(ignorecase_matcher)
+
+        combined = combine_regex_matchers([ignorecase_matcher] + matchers)
+        assert combined[0] is ignorecase_matcher
+        assert combined[0].match(u"I GO") is not None
+
+    def test_combine_regex_matchers_limits_size_of_combined_matchers(self):
+        size = CombinedRegexMatcher.MAX_SIZE + 1
+        matchers = [SimplifiedRegexMatcher(self.step_func1, u"step %d" % index)
+                    for index in range(size)]
+        combined = combine_regex_matchers(matchers)
+        assert [len(matcher.matchers) for matcher in combined[:1]] == [size - 1]
+        assert combined[1:] == matchers[-1:]
+        assert combined[0].regex.groups <= 100
+
+    def test_combine_regex_matchers_falls_back_if_regex_cannot_be_compiled(self):
+        matchers = self.make_matchers()[:2]
+        # -- CASE: Python 2.7 rejects regular expressions with > 100 groups.
+        with patch.object(CombinedRegexMatcher, "__init__",
+                          side_effect=AssertionError("too many groups")):
+            combined = combine_regex_matchers(matchers)
+        assert combined == matchers
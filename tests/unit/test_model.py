@@ -2,16 +2,18 @@
 # pylint: disable=no-self-use, line-too-long
 
 from __future__ import absolute_import, print_function, with_statement
+import copy
+import pickle
 import unittest
 import pytest
 from mock import Mock, patch
 import six
 from six.moves import range     # pylint: disable=redefined-builtin
 from six.moves import zip       # pylint: disable=redefined-builtin
-from behave.model_core import Status
+from behave.model_core import Argument, Status
 from behave.model import Feature, Scenario, ScenarioOutline, Step
-from behave.model import Table, Row
-from behave.matchers import NoMatch
+from behave.model import Table, TableHeadings, Row
+from behave.matchers import LazyMatch, NoMatch, ParseMatcher
 from behave.runner import Context
 from behave.capture import CaptureController
 from behave.configuration import Configuration
@@ -245,6 +247,39 @@ class TestScenarioRun(unittest.TestCase):
             assert scenario.run(self.runner)
             assert steps[1].status == Status.skipped
 
+    def test_dry_run_provides_formatters_with_lazy_converted_step_arguments(self):
+        self.config.dry_run = True
+        self.config.stdout_capture = False
+        self.config.log_capture = False
+        self.config.tag_expression.check.return_value = True  # pylint: disable=no-member
+
+        converted = []
+        def parse_number(text):
+            converted.append(text)
+            return int(text)
+        parse_number.pattern = r"\d+"
+
+        step = Step("foo.feature", 18, u"Given", u"given", u"10 users exist")
+        scenario = Scenario("foo.feature", 17, u"Scenario", u"foo",
+                            steps=[step])
+        ParseMatcher.register_type(NumberForDryRunTest=parse_number)
+        try:
+            my_step_registry = step_registry.StepRegistry()
+            my_step_registry.add_step_definition("given",
+                                                 "{count:NumberForDryRunTest} users exist",
+                                                 lambda ctx, count: None)
+            self.runner.step_registry = my_step_registry
+            scenario.run(self.runner)
+        finally:
+            ParseMatcher.custom_types.pop("NumberForDryRunTest")
+
+        match = self.formatters[0].match.call_args[0][0]
+        assert step.status == Status.untested
+        assert isinstance(match, LazyMatch)
+        assert converted == []
+        assert match.arguments[0].value == 10
+        assert converted == ["10"]
+
     def test_failed_step_causes_context_failure_to_be_set(self):
         self.config.stdout_capture = False
         self.config.log_capture = False
@@ -562,6 +597,18 @@ class TestStepRun(unittest.TestCase):
         step.run(self.runner)
         assert self.context.table == step.table
 
+    def test_run_copies_shared_table_before_step_uses_it(self):
+        table = Table([u"name"], rows=[[u"Alice"]])
+        step = Step("foo.feature", 17, u"Given", "given", u"foo", table=table)
+        step.table_is_shared = True
+        self.runner.step_registry.find_match.return_value = Mock()
+        step.run(self.runner)
+
+        assert self.context.table is step.table
+        assert step.table is not table
+        assert step.table == table
+        assert step.table_is_shared is False
+
     def test_run_sets_text_if_present(self):
         step = Step("foo.feature", 17, u"Given", "given", u"foo",
                     text=Mock(name="text"))
@@ -706,6 +753,33 @@ class TestTableModel(unittest.TestCase):
     def test_table_row_items(self):
         assert list(self.table[0].items()) == list(zip(self.HEAD, self.DATA[0]))
 
+    def test_table_row_name_after_add_column(self):
+        self.table.add_column(u"color", [u"white", u"grey", u"green"])
+        assert self.table[0]["color"] == "white"
+        assert self.table.get_column_index(u"color") == 3
+
+    def test_table_row_name_after_remove_column(self):
+        self.table.remove_column(u"type of stuff")
+        assert self.table[0]["awesomeness"] == "large"
+        assert not self.table.has_column(u"type of stuff")
+        with pytest.raises(KeyError):
+            # pylint: disable=pointless-statement
+            self.table[0]["type of stuff"]
+
+    def test_table_row_name_with_duplicated_heading_uses_first_column(self):
+        table = Table([u"name", u"name"], 0, [[u"Alice", u"Bob"]])
+        assert table[0]["name"] == u"Alice"
+
+    def test_table_row_name_after_pickle_and_copy(self):
+        tables = [pickle.loads(pickle.dumps(self.table, pickle.HIGHEST_PROTOCOL)),
+                  copy.deepcopy(self.table)]
+        for table in tables:
+            assert isinstance(table.headings, TableHeadings)
+            assert table == self.table
+            table.headings[0] = u"kind of stuff"
+            assert table[0]["kind of stuff"] == "fluffy"
+
+
 
 class TestModelRow(unittest.TestCase):
     # pylint: disable=invalid-name, bad-whitespace
@@ -762,3 +836,52 @@ class TestModelRow(unittest.TestCase):
         assert data1["name"] == u"Alice"
         assert data1["sex"] == u"female"
         assert data1["age"] == u"12"
+
+
+class TestCompactModel(object):
+    """Model classes with many instances store their attributes in slots."""
+
+    @staticmethod
+    def make_step(**kwargs):
+        return Step("foo.feature", 17, u"Given", "given", u"foo", **kwargs)
+
+    def test_step_has_no_instance_dict_attributes(self):
+        step = self.make_step()
+        assert step.__dict__ == {}
+        assert not hasattr(Row([u"name"], [u"Alice"]), "__dict__")
+        assert not hasattr(step.location, "__dict__")
+        assert not hasattr(Argument(0, 3, u"foo", u"foo"), "__dict__")
+
+    def test_step_supports_user_defined_attributes(self):
+        step = self.make_step()
+        step.scenario = "SCENARIO"
+        assert step.scenario == "SCENARIO"
+
+    def test_pickle_step_keeps_attributes(self):
+        step = self.make_step(table=Table([u"name"], rows=[[u"Alice"]]))
+        step.status = Status.passed
+        step.duration = 1.5
+        step.table_is_shared = True
+        step.scenario = "SCENARIO"
+        other_step = pickle.loads(pickle.dumps(step, pickle.HIGHEST_PROTOCOL))
+        assert other_step == step
+        assert other_step.location == step.location
+        assert other_step.status == Status.passed
+        assert other_step.duration == 1.5
+        assert other_step.table == step.table
+        assert other_step.table_is_shared is True
+        assert other_step.scenario == "SCENARIO"
+
+    def test_copy_step_shares_table(self):
+        step = self.make_step(table=Table([u"name"], rows=[[u"Alice"]]))
+        other_step = copy.copy(step)
+        assert other_step.table is step.table
+        assert other_step.location is step.location
+
+    def test_pickle_row_keeps_index_and_id(self):
+        row = Row([u"name"], [u"Alice"], line=10)
+        row.index = 1
+        row.id = "1.1"
+        other_row = pickle.loads(pickle.dumps(row, pickle.HIGHEST_PROTOCOL))
+        assert other_row == row
+        assert (other_row.line, other_row.index, other_row.id) == (10, 1, "1.1")
@@ -4,10 +4,15 @@ Additional unit tests for :mod:`behave.model`.
 """
 
 from __future__ import absolute_import, print_function
-from behave.model import ScenarioOutline, ScenarioOutlineBuilder, Table, Tag, Row
+from behave.model import Scenario, ScenarioOutline, ScenarioOutlineBuilder, \
+    Table, Tag, Row, OutlineScenarios, ReleasedScenario, \
+    PlaceholderTemplate, PlaceholderValues
+from behave.model_core import Status
 from behave.model_describe import ModelDescriptor
+from behave.tag_expression import make_tag_expression
 from behave.textutil import text
-from behave.parser import parse_step, parse_tags
+from behave.parser import parse_feature, parse_step, parse_tags
+from mock import Mock
 import six
 import pytest
 
@@ -144,6 +149,22 @@ Given a simple data table
         params = dict(param_1="Cell_1", param_2="Hello", param_3="Alice")
         self.assert_make_step_for_row(step_text, expected_text, params)
 
+    def test_make_step_for_row__shares_table_without_placeholders(self):
+        step = parse_step(u"Given a table:\n  | name |\n  | Alice |\n")
+        row = make_row(name="Bob")
+        new_step = ScenarioOutlineBuilder.make_step_for_row(step, row)
+        assert new_step.table is step.table
+        assert new_step.table_is_shared is True
+
+    def test_make_step_for_row__copies_table_with_placeholders(self):
+        step = parse_step(u"Given a table:\n  | name |\n  | <name> |\n")
+        row = make_row(name="Bob")
+        new_step = ScenarioOutlineBuilder.make_step_for_row(step, row)
+        assert new_step.table is not step.table
+        assert new_step.table_is_shared is False
+        assert new_step.table[0]["name"] == u"Bob"
+        assert step.table[0]["name"] == u"<name>"
+
 
     @pytest.mark.parametrize("tag_template,expected", [
         (u"@use.with_category1=<param_1>", u"use.with_category1=PARAM_1"),
@@ -178,6 +199,221 @@ Given a simple data table
         self.assert_make_row_tags(tag_template, expected_tags, params)
 
 
+class TestPlaceholderTemplate(object):
+    """Ensures that a :class:`behave.model:PlaceholderTemplate` provides
+    the same result as :meth:`ScenarioOutlineBuilder.render_template()`.
+    """
+
+    @pytest.mark.parametrize("template_text", [
+        u"Hello Alice",
+        u"Hello <name>",
+        u"<name> and <other> and <name>",
+        u"Hello <unknown>",
+        u"<name><other>",
+        u"<<name>>",
+        u"<<other>>",
+        u"a > b < c",
+        u"Hello <>",
+        u"<row.id>: <name> -- <examples.name>",
+    ])
+    def test_render__is_same_as_render_template(self, template_text):
+        row = Row([u"name", u"other", u"name"], [u"Alice", u"name", u"Bob"])
+        params = {"row.id": u"1.2", "examples.name": u"E1", "name": u"Charly"}
+        expected = ScenarioOutlineBuilder.render_template(template_text,
+                                                          row, params)
+        template = PlaceholderTemplate(template_text)
+        assert template.render(PlaceholderValues(row, params)) == expected
+
+    @pytest.mark.parametrize("value", [u"<other>", u"x>", u"<y"])
+    def test_render__with_value_like_placeholder(self, value):
+        template_text = u"<name><other>"
+        row = Row([u"name", u"other"], [value, u"Bob"])
+        expected = ScenarioOutlineBuilder.render_template(template_text, row)
+        template = PlaceholderTemplate(template_text)
+        assert template.render(PlaceholderValues(row)) == expected
+
+    def test_render__without_placeholders_returns_text(self):
+        template_text = u"Hello Alice"
+        template = PlaceholderTemplate(template_text)
+        assert template.render(PlaceholderValues()) is template_text
+
+
+class TestOutlineScenarios(object):
+    """Unit tests for the lazy scenarios of a ScenarioOutline."""
+    FEATURE_TEXT = u"""
+Feature: F1
+  @outline @tag_<name>
+  Scenario Outline: Use <name>
+    Given a person with name "<name>"
+
+    Examples:
+      | name  |
+      | Alice |
+      | Bob   |
+      | Carl  |
+"""
+
+    def make_scenario_outline(self):
+        feature = parse_feature(self.FEATURE_TEXT)
+        return feature.scenarios[0]
+
+    def test_status_is_untested_while_scenarios_are_not_run(self):
+        feature = parse_feature(self.FEATURE_TEXT)
+        scenario_outline = feature.scenarios[0]
+        scenarios = scenario_outline.scenarios
+        scenarios[0].steps[0].status = Status.passed
+        # -- BETWEEN ROWS: Later rows are not built or run until now.
+        assert scenario_outline.status == Status.untested
+        assert feature.status == Status.untested
+
+        scenarios[1].steps[0].status = Status.failed
+        scenarios[2].steps[0].status = Status.passed
+        assert scenario_outline.status == Status.failed
+        assert feature.status == Status.failed
+
+    def test_status_is_failed_if_a_scenario_failed_before_others_are_run(self):
+        # -- CASE: --stop option aborts the run after the first failed row.
+        feature = parse_feature(self.FEATURE_TEXT)
+        scenario_outline = feature.scenarios[0]
+        scenarios = scenario_outline.scenarios
+        scenarios[0].steps[0].status = Status.failed
+        assert not scenarios.all_built()
+        assert scenario_outline.status == Status.failed
+        assert feature.status == Status.failed
+
+    def test_scenarios_are_built_when_used(self):
+        scenario_outline = self.make_scenario_outline()
+        scenarios = scenario_outline.scenarios
+        assert isinstance(scenarios, OutlineScenarios)
+        assert len(scenarios) == 3
+        assert scenarios.built_scenarios() == []
+
+        scenario = scenarios[1]
+        assert scenario.name == u"Use Bob -- @1.2 "
+        assert scenario.steps[0].name == u'a person with name "Bob"'
+        assert scenarios.built_scenarios() == [scenario]
+        assert scenarios[1] is scenario
+        assert scenarios[-2] is scenario
+
+    def test_scenarios_are_same_as_built_scenarios(self):
+        scenario_outline = self.make_scenario_outline()
+        builder = ScenarioOutlineBuilder(scenario_outline.annotation_schema)
+        expected = builder.build_scenarios(scenario_outline)
+        scenarios = list(scenario_outline.scenarios)
+        assert [s.name for s in scenarios] == [s.name for s in expected]
+        assert [s.tags for s in scenarios] == [s.tags for s in expected]
+        assert [s.steps for s in scenarios] == [s.steps for s in expected]
+        assert scenario_outline.scenarios[1:] == scenarios[1:]
+
+    def test_index_out_of_range_raises_index_error(self):
+        scenario_outline = self.make_scenario_outline()
+        with pytest.raises(IndexError):
+            scenario_outline.scenarios[3]
+
+    def test_should_run_with_tags_does_not_build_scenarios(self):
+        scenario_outline = self.make_scenario_outline()
+        tag_expression = make_tag_expression("@tag_Bob")
+        assert scenario_outline.should_run_with_tags(tag_expression)
+        assert scenario_outline.scenarios.built_scenarios() == []
+
+    def test_run_releases_finished_scenarios_if_enabled(self):
+        scenario_outline = self.make_scenario_outline()
+        runner = Mock()
+        runner.release_outline_scenarios = True
+        runner.config.stop = False
+        runner.aborted = False
+        for scenario in scenario_outline.scenarios:
+            scenario.run = Mock(return_value=False)
+            scenario.set_status(Status.passed)
+        scenario_outline.run(runner)
+
+        released = scenario_outline.scenarios.built_scenarios()
+        assert all(isinstance(s, ReleasedScenario) for s in released)
+        assert [s.status for s in released] == [Status.passed] * 3
+        assert scenario_outline.status == Status.passed
+
+    def test_reset_rebuilds_released_scenarios(self):
+        scenario_outline = self.make_scenario_outline()
+        scenarios = scenario_outline.scenarios
+        scenarios[0].set_status(Status.failed)
+        scenarios.release(0)
+        scenario_outline.reset()
+        assert isinstance(scenarios[0], Scenario)
+        assert scenarios[0].status == Status.untested
+
+
+class TestReleaseRunData(object):
+    FEATURE_TEXT = u"""
+Feature: Alice
+  Background:
+    Given a background step passes
+
+  Scenario: A1
+    When a step fails
+
+  Scenario Outline: A2 <name>
+    Then a step with "<name>" passes
+
+    Examples:
+      | name  |
+      | Alice |
+      | Bob   |
+"""
+
+    @staticmethod
+    def make_failed(statement):
+        try:
+            raise ValueError("OOPS")
+        except ValueError as e:
+            statement.store_exception_context(e)
+        if isinstance(statement, Scenario):
+            statement.set_status(Status.failed)
+        else:
+            statement.status = Status.failed
+        statement.error_message = u"ValueError: OOPS"
+        statement.captured.stdout = u"CAPTURED OUTPUT"
+
+    def test_release_run_data_reduces_traceback_to_text(self):
+        feature = parse_feature(self.FEATURE_TEXT)
+        scenario = feature.scenarios[0]
+        step = scenario.steps[0]
+        self.make_failed(step)
+        feature.release_run_data()
+
+        assert step.status == Status.failed
+        assert step.error_message == u"ValueError: OOPS"
+        assert step.exc_traceback is None
+        assert u"make_failed" in step.traceback_text
+        assert isinstance(step.exception, ValueError)
+        assert getattr(step.exception, "__traceback__", None) is None
+        assert not step.captured
+
+    def test_release_run_data_uses_background_steps_and_outline_scenarios(self):
+        feature = parse_feature(self.FEATURE_TEXT)
+        scenario = feature.scenarios[0]
+        background_step = scenario.background_steps[0]
+        outline_scenario = feature.scenarios[1].scenarios[0]
+        outline_step = outline_scenario.steps[0]
+        for statement in (background_step, outline_scenario, outline_step):
+            self.make_failed(statement)
+        feature.release_run_data()
+
+        for statement in (background_step, outline_scenario, outline_step):
+            assert statement.exc_traceback is None
+            assert not statement.captured
+        # -- ENSURE: Unused outline scenarios are not built.
+        assert len(feature.scenarios[1].scenarios.built_scenarios()) == 1
+
+    def test_reset_after_release_run_data(self):
+        feature = parse_feature(self.FEATURE_TEXT)
+        step = feature.scenarios[0].steps[0]
+        self.make_failed(step)
+        feature.release_run_data()
+        feature.reset()
+        assert step.status == Status.untested
+        assert step.traceback_text is None
+
+
 class TestTag(object):
     """
     Translation rules are:
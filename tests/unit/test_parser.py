@@ -5,6 +5,7 @@ Unit tests for Gherkin parser: :mod:`behave.parser`.
 """
 
 from __future__ import absolute_import, print_function
+import io
 import pytest
 from behave import i18n, model, parser
 
@@ -1744,3 +1745,146 @@ Given another step
             parser.parse_steps(text)
 
         assert exc.match("TABLE-START without step detected")
+
+
+class TestParsedStepsCache(object):
+    STEPS_TEXT = u'''
+Given a step with a table:
+  | name  | city   |
+  | Alice | Paris  |
+When another step
+'''.lstrip()
+
+    def test_parse_steps_again_returns_equal_but_distinct_steps(self):
+        steps1 = parser.parse_steps(self.STEPS_TEXT, filename="cached.feature")
+        steps2 = parser.parse_steps(self.STEPS_TEXT, filename="cached.feature")
+        assert steps1 == steps2
+        assert steps1[0] is not steps2[0]
+        assert steps1[0].table is not steps2[0].table
+        assert steps1[0].table.rows[0] is not steps2[0].table.rows[0]
+        assert steps1[0].table == steps2[0].table
+
+    def test_parse_steps_returns_copies_with_own_runtime_data(self):
+        steps1 = parser.parse_steps(self.STEPS_TEXT, filename="cached.feature")
+        steps1[0].status = model.Status.failed
+        steps1[0].table.rows[0].cells[0] = u"CHANGED"
+        steps2 = parser.parse_steps(self.STEPS_TEXT, filename="cached.feature")
+        assert steps2[0].status == model.Status.untested
+        assert steps2[0].table.rows[0].cells[0] == u"Alice"
+
+    def test_cache_hit_and_miss_are_counted(self):
+        cache = parser.ParsedStepsCache()
+        steps = parser.parse_steps(u"Given a step")
+        assert cache.get(("en", None, u"Given a step")) is None
+        cache.put(("en", None, u"Given a step"), steps)
+        assert cache.get(("en", None, u"Given a step")) == steps
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_cache_key_contains_language(self):
+        cache = parser.ParsedStepsCache()
+        steps = parser.parse_steps(u"Given a step")
+        cache.put(("en", None, u"Given a step"), steps)
+        assert cache.get(("de", None, u"Given a step")) is None
+
+    def test_cache_drops_least_recently_used_steps(self):
+        cache = parser.ParsedStepsCache(maxsize=2)
+        steps = parser.parse_steps(u"Given a step")
+        cache.put("A", steps)
+        cache.put("B", steps)
+        cache.get("A")
+        cache.put("C", steps)
+        assert len(cache) == 2
+        assert cache.get("B") is None
+        assert cache.get("A") == steps
+
+
+class TestKeywordMatcher(object):
+    STEP_TYPES = ("given", "when", "then", "and", "but")
+
+    @classmethod
+    def match_step_keyword_by_loop(cls, keywords, line):
+        for step_type in cls.STEP_TYPES:
+            for keyword in keywords[step_type]:
+                if line.startswith(keyword) or \
+                   line.lower().startswith(keyword.lower()):
+                    return (step_type, keyword)
+        return None
+
+    @staticmethod
+    def make_lines(keywords):
+        aliases = set(alias for values in keywords.values() for alias in values)
+        lines = [u"", u"plain text", u"* step"]
+        for alias in aliases:
+            for text in (alias, alias.lower(), alias.upper(), alias.strip()):
+                lines.extend([text, text + u"step", text + u": name"])
+        return lines
+
+    @pytest.mark.parametrize("language", sorted(i18n.languages.keys()))
+    def test_match_step_keyword_like_keyword_loop(self, language):
+        keywords = i18n.languages[language]
+        matcher = parser.KeywordMatcher.for_keywords(keywords)
+        for line in self.make_lines(keywords):
+            expected = self.match_step_keyword_by_loop(keywords, line)
+            assert matcher.match_step_keyword(line) == expected, line
+
+    @pytest.mark.parametrize("language", sorted(i18n.languages.keys()))
+    def test_match_keyword_like_keyword_loop(self, language):
+        keywords = i18n.languages[language]
+        matcher = parser.KeywordMatcher.for_keywords(keywords)
+        for line in self.make_lines(keywords):
+            for keyword in ("feature", "rule", "background", "scenario",
+                            "scenario_outline", "examples"):
+                expected = next((alias for alias in keywords[keyword]
+                                 if line.startswith(alias + u":")), False)
+                assert matcher.match_keyword(keyword, line) == expected, line
+
+    def test_for_keywords_returns_cached_matcher(self):
+        keywords = i18n.languages["de"]
+        matcher = parser.KeywordMatcher.for_keywords(keywords)
+        assert parser.KeywordMatcher.for_keywords(keywords) is matcher
+
+
+class TestParseFile(object):
+
+    @pytest.mark.parametrize("data", [
+        b"", b"\n", b"Feature: A", b"Feature: A\n", b"Feature: A\r\n  Scenario: S\r\n",
+        b"Feature: A\n\n  Scenario: S\n    Given a step\n",
+        u"Feature: Äpfel\n  Scenario: 名\n".encode("utf8"),
+    ])
+    def test_iter_file_lines_provides_same_lines_as_split(self, data):
+        lines = list(parser.iter_file_lines(io.BytesIO(data)))
+        assert lines == data.decode("utf8").split(u"\n")
+
+    def test_parse_file_provides_same_feature_as_parse_feature(self, tmp_path):
+        text = u'''
+Feature: Alice
+  Scenario: A1
+    Given a step with text:
+      """
+      Hello
+
+      World
+      """
+    When a step with a table:
+      | name  |
+      | Alice |
+'''
+        filename = str(tmp_path/"alice.feature")
+        with io.open(filename, "w", encoding="UTF-8", newline="") as f:
+            f.write(text)
+        feature1 = parser.parse_file(filename)
+        feature2 = parser.parse_feature(text, filename=filename)
+        assert feature1.name == feature2.name
+        assert feature1.scenarios[0].steps == feature2.scenarios[0].steps
+        assert feature1.scenarios[0].steps[0].text == u"Hello\n\nWorld"
+        assert feature1.scenarios[0].steps[1].table == \
+            feature2.scenarios[0].steps[1].table
+
+    def test_parse_file_reports_parser_error_with_filename_and_line(self, tmp_path):
+        filename = str(tmp_path/"bad.feature")
+        with io.open(filename, "w", encoding="UTF-8") as f:
+            f.write(u"Feature: Bad\n  Scenario: S1\n    Given a step\n    Examples:\n")
+        with pytest.raises(parser.ParserError) as exc:
+            parser.parse_file(filename)
+        assert exc.value.filename == filename
+        assert exc.value.line == 4
@@ -0,0 +1,150 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.pattern_cache`.
+"""
+
+from __future__ import absolute_import
+import json
+import pytest
+from behave.matchers import ParseMatcher
+from behave.pattern_cache import \
+    StepPatternCache, get_step_pattern_cache, use_step_pattern_cache
+from behave.step_registry import AmbiguousStep, StepRegistry
+
+
+@pytest.fixture
+def pattern_cache_file(tmp_path):
+    yield str(tmp_path/"step_pattern_cache.data")
+    use_step_pattern_cache(None)
+
+
+def make_step_registry(step_patterns, pattern_cache=None):
+    use_step_pattern_cache(pattern_cache)
+    registry = StepRegistry()
+    for step_pattern in step_patterns:
+        registry.add_step_definition("given", step_pattern, lambda ctx: None)
+    use_step_pattern_cache(None)
+    return registry
+
+
+class TestStepPatternCache(object):
+    # pylint: disable=no-self-use
+    STEP_PATTERNS = [
+        u"I have {count:d} {fruits}",
+        u"I have {count:d} {fruits} in {place}",
+        u"I eat {count:d} {fruits}",
+    ]
+
+    def test_second_run_skips_ambiguity_checks(self, pattern_cache_file):
+        pattern_cache1 = StepPatternCache(pattern_cache_file)
+        pattern_cache1.load()
+        make_step_registry(self.STEP_PATTERNS, pattern_cache1)
+        pattern_cache1.save()
+
+        pattern_cache2 = StepPatternCache(pattern_cache_file)
+        pattern_cache2.load()
+        registry = make_step_registry(self.STEP_PATTERNS, pattern_cache2)
+        assert pattern_cache1.misses == 3
+        assert pattern_cache2.hits == 3
+        assert pattern_cache2.misses == 0
+        assert len(registry.steps["given"]) == 3
+
+    def test_cache_file_contains_only_public_data(self, pattern_cache_file):
+        pattern_cache = StepPatternCache(pattern_cache_file)
+        make_step_registry(self.STEP_PATTERNS, pattern_cache)
+        pattern_cache.save()
+        with open(pattern_cache_file) as cache_file:
+            data = json.load(cache_file)
+        assert data["signature"] == StepPatternCache.make_signature()
+        assert sorted(data["entries"]) == sorted(
+            u"given:%s" % step_pattern for step_pattern in self.STEP_PATTERNS)
+
+    def test_ambiguous_step_is_detected_with_other_candidates(self, pattern_cache_file):
+        pattern_cache1 = StepPatternCache(pattern_cache_file)
+        make_step_registry([u"I have 10 apples"], pattern_cache1)
+        pattern_cache1.save()
+
+        pattern_cache2 = StepPatternCache(pattern_cache_file)
+        pattern_cache2.load()
+        with pytest.raises(AmbiguousStep):
+            make_step_registry(self.STEP_PATTERNS[:1] + [u"I have 10 apples"],
+                               pattern_cache2)
+        assert pattern_cache2.hits == 0
+
+    def test_changed_custom_type_invalidates_entry(self, pattern_cache_file):
+        def parse_fruit(text):
+            return text
+        step_patterns = [u"I have {fruit:FruitForCacheTest}", u"I have pears"]
+
+        parse_fruit.pattern = r"apples"
+        ParseMatcher.register_type(FruitForCacheTest=parse_fruit)
+        try:
+            pattern_cache1 = StepPatternCache(pattern_cache_file)
+            make_step_registry(step_patterns, pattern_cache1)
+            pattern_cache1.save()
+
+            parse_fruit.pattern = r"\w+"
+            pattern_cache2 = StepPatternCache(pattern_cache_file)
+            pattern_cache2.load()
+            with pytest.raises(AmbiguousStep):
+                make_step_registry(step_patterns, pattern_cache2)
+        finally:
+            ParseMatcher.custom_types.pop("FruitForCacheTest")
+
+    def test_save_removes_unused_entries(self, pattern_cache_file):
+        pattern_cache1 = StepPatternCache(pattern_cache_file)
+        make_step_registry(self.STEP_PATTERNS, pattern_cache1)
+        pattern_cache1.save()
+
+        pattern_cache2 = StepPatternCache(pattern_cache_file)
+        pattern_cache2.load()
+        make_step_registry(self.STEP_PATTERNS[:2], pattern_cache2)
+        pattern_cache2.save()
+        assert len(pattern_cache2.entries) == 2
+
+    def test_load_ignores_cache_file_with_other_signature(self, pattern_cache_file):
+        pattern_cache1 = StepPatternCache(pattern_cache_file)
+        make_step_registry(self.STEP_PATTERNS, pattern_cache1)
+        pattern_cache1.save()
+
+        StepPatternCache.FORMAT_VERSION += 1
+        try:
+            pattern_cache2 = StepPatternCache(pattern_cache_file)
+            pattern_cache2.load()
+        finally:
+            StepPatternCache.FORMAT_VERSION -= 1
+        assert not pattern_cache2.entries
+
+    def test_load_ignores_corrupted_cache_file(self, pattern_cache_file):
+        with open(pattern_cache_file, "wb") as cache_file:
+            cache_file.write(b"CORRUPTED")
+        pattern_cache = StepPatternCache(pattern_cache_file)
+        pattern_cache.load()
+        assert not pattern_cache.entries
+
+    def test_save_without_changes_creates_no_file(self, pattern_cache_file):
+        pattern_cache = StepPatternCache(pattern_cache_file)
+        pattern_cache.save()
+        assert pattern_cache.changed is False
+        with pytest.raises(IOError):
+            open(pattern_cache_file, "rb")
+
+    def test_unsupported_matcher_class_is_checked_each_time(self):
+        class OtherParseMatcher(ParseMatcher):
+            pass
+        step_definition = OtherParseMatcher(None, u"I have {count:d} apples")
+        assert StepPatternCache.make_digest([step_definition]) is None
+
+        pattern_cache = StepPatternCache()
+        pattern_cache.add_unambiguous("given", u"I have 10 apples",
+                                      [step_definition])
+        assert not pattern_cache.entries
+
+
+def test_use_step_pattern_cache_returns_previous_cache(pattern_cache_file):
+    pattern_cache = StepPatternCache(pattern_cache_file)
+    previous_cache = use_step_pattern_cache(pattern_cache)
+    assert previous_cache is None
+    assert get_step_pattern_cache() is pattern_cache
+    use_step_pattern_cache(None)
+    assert get_step_pattern_cache() is None
@@ -167,6 +167,56 @@ class TestRunner(object):
         # pylint: enable=too-many-format-args
         assert my_locals["spam"] == filename
 
+    @pytest.mark.parametrize("needs, expected", [
+        ((False, False), True),
+        ((False, True), False),
+        ((True, False), False),
+    ])
+    def test_can_release_outline_scenarios(self, needs, expected):
+        config = Mock()
+        config.reporters = [Mock(needs_finished_scenarios=needs[1])]
+        r = runner.Runner(config)
+        r.formatters = [Mock(needs_finished_scenarios=needs[0])]
+        assert r.can_release_outline_scenarios() == expected
+
+    def test_can_release_outline_scenarios_fails_with_duration_history(self):
+        config = Mock()
+        config.reporters = []
+        r = runner.Runner(config)
+        r.duration_history = Mock()
+        assert not r.can_release_outline_scenarios()
+
+    @pytest.mark.parametrize("release_run_data", [True, False])
+    def test_report_feature_releases_run_data_in_streaming_mode(self,
+                                                               release_run_data):
+        config = Mock()
+        config.reporters = [Mock()]
+        config.release_run_data = release_run_data
+        r = runner.Runner(config)
+        feature = Mock()
+        r.report_feature(feature)
+        config.reporters[0].feature.assert_called_with(feature)
+        assert feature.release_run_data.called == release_run_data
+
+    def test_teardown_duration_history_warns_if_save_fails(self, caplog):
+        r = runner.Runner(Mock())
+        r.duration_history = Mock(filename="build/durations.json")
+        r.duration_history.save.side_effect = IOError("NOT-WRITABLE")
+        r.teardown_duration_history()
+        assert "DURATION-HISTORY: Cannot save build/durations.json (NOT-WRITABLE)" \
+            in caplog.text
+
+    @pytest.mark.parametrize("combine_regex_matchers", [True, False])
+    def test_setup_step_registry_applies_combine_regex_matchers(self,
+                                                    combine_regex_matchers):
+        from behave.step_registry import StepRegistry
+        config = Mock()
+        config.combine_regex_matchers = combine_regex_matchers
+        r = runner.Runner(config)
+        r.step_registry = StepRegistry()
+        r.setup_step_registry()
+        assert r.step_registry.combine_regex_matchers == combine_regex_matchers
+
     def test_run_returns_true_if_everything_passed(self):
         r = runner.Runner(Mock())
         r.setup_capture = Mock()
@@ -196,6 +246,8 @@ class TestRunWithPaths(unittest.TestCase):
         self.config.format = ["plain", "progress"]
         self.config.logging_format = None
         self.config.logging_datefmt = None
+        self.config.feature_cache = None
+        self.config.parse_jobs = 1
         self.runner = runner.Runner(self.config)
         self.load_hooks = self.runner.load_hooks = Mock()
         self.load_step_definitions = self.runner.load_step_definitions = Mock()
@@ -0,0 +1,142 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.runner_async`.
+"""
+
+from __future__ import absolute_import
+import logging
+import sys
+import threading
+import time
+import pytest
+from behave.capture import ThreadCaptureDispatcher, contextvars
+from behave.configuration import Configuration
+from behave.runner_async import AsyncRunner, EventLoopThread, asyncio
+from .test_capture import create_capture_config, setup_capture_controller
+
+
+requires_asyncio = pytest.mark.skipif(asyncio is None,
+                                      reason="Needs asyncio")
+requires_contextvars = pytest.mark.skipif(contextvars is None,
+                                          reason="Needs contextvars")
+
+
+class WriteOutputAwaitable(object):
+    """Awaitable object that writes output and a log record
+    (when it is resumed by the event loop).
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.thread = None
+
+    def __await__(self):
+        yield   # -- SUSPEND: Other coroutines run in the meantime.
+        self.thread = threading.current_thread()
+        sys.stdout.write("%s:stdout\n" % self.text)
+        sys.stderr.write("%s:stderr\n" % self.text)
+        logging.getLogger("test").info("%s:log", self.text)
+
+
+@requires_asyncio
+class TestEventLoopThread(object):
+
+    def test_run_coroutine_returns_result(self):
+        loop_thread = EventLoopThread()
+        loop_thread.start()
+        try:
+            assert loop_thread.run_coroutine(asyncio.sleep(0, result=42)) == 42
+        finally:
+            loop_thread.stop()
+        assert not loop_thread.running
+        assert loop_thread.loop is None
+
+    def test_run_coroutine_raises_error_of_coroutine(self):
+        loop_thread = EventLoopThread()
+        loop_thread.start()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                loop_thread.run_coroutine(asyncio.wait_for(asyncio.sleep(1),
+                                                           timeout=0.01))
+        finally:
+            loop_thread.stop()
+
+    def test_coroutines_of_several_threads_run_concurrently(self):
+        loop_thread = EventLoopThread()
+        loop_thread.start()
+        threads = [threading.Thread(target=loop_thread.run_coroutine,
+                                    args=(asyncio.sleep(0.2),))
+                   for _ in range(5)]
+        start_time = time.time()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            loop_thread.stop()
+        assert time.time() - start_time < 0.6
+
+    @requires_contextvars
+    def test_coroutines_use_output_capture_of_submitting_thread(self):
+        config = create_capture_config()
+        dispatcher = ThreadCaptureDispatcher(config)
+        loop_thread = EventLoopThread()
+        captured = {}
+        awaitables = {}
+
+        def run_capture(name):
+            capture_controller = dispatcher.make_capture_controller()
+            setup_capture_controller(capture_controller)
+            capture_controller.start_capture()
+            awaitables[name] = WriteOutputAwaitable(name)
+            loop_thread.run_coroutine(awaitables[name])
+            capture_controller.stop_capture()
+            captured[name] = capture_controller.captured
+            capture_controller.teardown_capture()
+
+        names = ("Alice", "Bob", "Charly")
+        dispatcher.install()
+        loop_thread.start()
+        try:
+            threads = [threading.Thread(target=run_capture, args=(name,))
+                       for name in names]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            loop_thread.stop()
+            dispatcher.uninstall()
+
+        for name in names:
+            assert awaitables[name].thread is not None
+            assert awaitables[name].thread not in threads
+            assert captured[name].stdout == "%s:stdout\n" % name
+            assert captured[name].stderr == "%s:stderr\n" % name
+            assert captured[name].log_output == "INFO:test:%s:log" % name
+
+
+@requires_asyncio
+class TestAsyncRunner(object):
+
+    def test_run_coroutine_without_event_loop_thread_uses_own_event_loop(self):
+        runner = AsyncRunner(Configuration("", load_config=False))
+        assert runner.run_coroutine(asyncio.sleep(0, result=1)) == 1
+        assert runner.event_loop is not None
+        runner.close_event_loop()
+        assert runner.event_loop is None
+
+    def test_worker_runner_uses_event_loop_thread(self):
+        config = Configuration("--jobs=2", load_config=False)
+        runner = AsyncRunner(config)
+        runner.capture_dispatcher = ThreadCaptureDispatcher(config)
+        runner.event_loop_thread = EventLoopThread()
+        runner.event_loop_thread.start()
+        try:
+            worker_runner = runner.make_worker_runner()
+            assert worker_runner.event_loop_thread is runner.event_loop_thread
+            assert worker_runner.run_coroutine(asyncio.sleep(0, result=2)) == 2
+            assert worker_runner.event_loop is None
+        finally:
+            runner.event_loop_thread.stop()
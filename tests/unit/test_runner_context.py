@@ -3,6 +3,7 @@ Unit tests for :class:`behave.runner.Context`.
 """
 
 from __future__ import absolute_import, print_function
+import sys
 import unittest
 import warnings
 from platform import python_implementation
@@ -298,6 +299,20 @@ class TestContext2(unittest.TestCase):
             filename = filename.replace("$py", ".py")
         assert filename in info, "%r not in %r" % (filename, info)
 
+    def test_behave_masking_user_attribute_warning_shows_source_line(self):
+        with self.context.use_with_user_mode():
+            line = sys._getframe().f_lineno + 1
+            self.context.thing = "stuff"
+        # pylint: disable=protected-access
+        self.context._push()
+        with warnings.catch_warnings(record=True) as warns:
+            warnings.simplefilter("always")
+            self.context.thing = "other stuff"
+
+        info = str(warns[0].message)
+        assert 'originally set in self.context.thing = "stuff"' in info
+        assert (":%d)" % line) in info
+
     def test_setting_root_attribute_that_masks_existing_causes_warning(self):
         # pylint: disable=protected-access
         warns = []
@@ -345,6 +360,58 @@ class TestContext2(unittest.TestCase):
         with pytest.raises(AttributeError):
             del self.context.thing
 
+    def test_context_delete_reveals_attribute_of_outer_layer(self):
+        # pylint: disable=protected-access
+        self.context.thing = "stuff"
+        self.context._push()
+        self.context.thing = "other stuff"
+        del self.context.thing
+        assert self.context.thing == "stuff"
+        assert "thing" in self.context
+
+    def test_pop_restores_attributes_of_outer_layer(self):
+        # pylint: disable=protected-access
+        self.context.thing = "stuff"
+        self.context._push()
+        self.context.thing = "other stuff"
+        self.context.other_thing = "more stuff"
+        self.context._pop()
+        assert self.context.thing == "stuff"
+        assert "other_thing" not in self.context
+        assert getattr(self.context, "other_thing", None) is None
+
+    def test_set_root_attribute_is_masked_by_inner_layer(self):
+        # pylint: disable=protected-access
+        self.context._push()
+        self.context.thing = "stuff"
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.context._set_root_attribute("thing", "root stuff")
+        assert self.context.thing == "stuff"
+        self.context._pop()
+        assert self.context.thing == "root stuff"
+
+    def test_attribute_with_name_of_class_attribute_uses_context_stack(self):
+        # pylint: disable=protected-access
+        self.context._push()
+        self.context.LAYER_NAMES = ["foo"]
+        assert "LAYER_NAMES" in self.context
+        assert self.context.LAYER_NAMES == Context.LAYER_NAMES
+        self.context._pop()
+        assert "LAYER_NAMES" not in self.context
+
+    def test_cleanup_errors_are_visible_as_attribute(self):
+        # pylint: disable=protected-access
+        def cleanup_fails():
+            raise RuntimeError("CLEANUP-ERROR")
+
+        self.context.fail_on_cleanup_errors = False
+        self.context.on_cleanup_error = Context.ignore_cleanup_error
+        self.context._push()
+        self.context.add_cleanup(cleanup_fails)
+        self.context._pop()
+        assert self.context.cleanup_errors == 1
+
 
 class ExampleSteps(object):
     text = None
@@ -0,0 +1,349 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :mod:`behave.runner_parallel`.
+"""
+
+from __future__ import absolute_import
+from behave.capture import ThreadCaptureDispatcher, ThreadCaptureController
+from behave.configuration import Configuration
+from behave.duration_history import DurationHistory
+from behave.matchers import Match, NoMatch
+from behave.model import Scenario, ScenarioOutline, Step
+from behave.model_core import Argument, Status
+from behave.parser import parse_feature
+from behave.runner_parallel import (
+    FormatterEventRecorder, ParallelRunner, ThreadedRunner,
+    ThreadSafeStepRegistry,
+    apply_state, collect_model_elements, make_match, make_match_data,
+    snapshot_state, split_event_segments, use_selected_scenarios)
+from behave.step_registry import StepRegistry
+
+
+FEATURE_TEXT = u"""
+Feature: Alice
+  Background:
+    Given a background step passes
+
+  Scenario: A1
+    Given a step passes
+
+  Scenario Outline: A2
+    Given a step with <value> passes
+    Examples:
+      | value |
+      | 1     |
+      | 2     |
+"""
+
+
+FEATURE_WITH_RULES_TEXT = u"""
+Feature: Bob
+  Scenario: B1
+    Given a step passes
+
+  Rule: R1
+    Scenario: R1.1
+      Given a step passes
+
+    Scenario: R1.2
+      Given a step passes
+
+  @serial
+  Rule: R2
+    Scenario: R2.1
+      Given a step passes
+
+    Scenario: R2.2
+      Given a step passes
+"""
+
+
+class UnpicklableError(Exception):
+    def __init__(self, message, extra):
+        # -- HINT: Unpickling fails (requires two args).
+        super(UnpicklableError, self).__init__(message)
+        self.extra = extra
+
+
+class TestCollectModelElements(object):
+
+    def test_collects_elements_in_deterministic_order(self):
+        feature1 = parse_feature(FEATURE_TEXT)
+        feature2 = parse_feature(FEATURE_TEXT)
+        elements1 = collect_model_elements(feature1)
+        elements2 = collect_model_elements(feature2)
+
+        assert len(elements1) == len(elements2)
+        for element1, element2 in zip(elements1, elements2):
+            assert type(element1) is type(element2)
+            assert element1.location == element2.location
+
+    def test_collects_outline_scenarios_and_background_steps(self):
+        feature = parse_feature(FEATURE_TEXT)
+        elements = collect_model_elements(feature)
+        scenarios = [e for e in elements if type(e) is Scenario]
+        outlines = [e for e in elements if isinstance(e, ScenarioOutline)]
+        steps = [e for e in elements if isinstance(e, Step)]
+
+        assert elements[0] is feature
+        assert len(outlines) == 1
+        assert len(scenarios) == 3     # -- A1 and 2 outline scenarios.
+        # -- STEPS: 1 background step + 3 scenarios * (background + own step)
+        assert len(steps) == 7
+        assert len(set(id(e) for e in elements)) == len(elements)
+
+
+class TestModelElementState(object):
+
+    def test_snapshot_state_and_apply_state(self):
+        feature = parse_feature(FEATURE_TEXT)
+        step = feature.scenarios[0].steps[0]
+        step.status = Status.failed
+        step.duration = 1.5
+        step.error_message = u"Assertion Failed: OOPS"
+        step.exception = AssertionError("OOPS")
+        state = snapshot_state(step)
+
+        other_step = parse_feature(FEATURE_TEXT).scenarios[0].steps[0]
+        apply_state(other_step, state)
+        assert other_step.status == Status.failed
+        assert other_step.duration == 1.5
+        assert other_step.error_message == u"Assertion Failed: OOPS"
+        assert isinstance(other_step.exception, AssertionError)
+        assert other_step.exc_traceback is None
+
+    def test_snapshot_state_replaces_unpicklable_exception(self):
+        feature = parse_feature(FEATURE_TEXT)
+        step = feature.scenarios[0].steps[0]
+        step.exception = UnpicklableError("OOPS", 42)
+        state = snapshot_state(step)
+        assert isinstance(state["exception"], RuntimeError)
+        assert "UnpicklableError: OOPS" in str(state["exception"])
+
+    def test_snapshot_state_of_scenario_uses_cached_status(self):
+        feature = parse_feature(FEATURE_TEXT)
+        scenario = feature.scenarios[0]
+        scenario.set_status(Status.passed)
+        state = snapshot_state(scenario)
+        assert state["_cached_status"] == Status.passed
+        assert "status" not in state
+
+
+class TestMatchData(object):
+
+    def test_make_match_with_match_data(self):
+        func = lambda ctx, value: None
+        match = Match(func, [Argument(10, 12, u"42", 42, u"value")])
+        match2 = make_match(make_match_data(match))
+
+        assert match2.location == match.location
+        argument = match2.arguments[0]
+        assert (argument.start, argument.end, argument.original,
+                argument.value, argument.name) == (10, 12, u"42", 42, u"value")
+
+    def test_make_match_with_unpicklable_argument_value_uses_original(self):
+        func = lambda ctx, value: None
+        match = Match(func, [Argument(0, 2, u"42", lambda: 42)])
+        match2 = make_match(make_match_data(match))
+        assert match2.arguments[0].value == u"42"
+
+    def test_make_match_for_undefined_step(self):
+        assert make_match_data(NoMatch()) is None
+        assert isinstance(make_match(None), NoMatch)
+
+
+class TestFormatterEventRecorder(object):
+
+    def test_records_events_with_element_index(self):
+        feature = parse_feature(FEATURE_TEXT)
+        elements = collect_model_elements(feature)
+        recorder = FormatterEventRecorder()
+        recorder.reset(elements)
+
+        scenario = feature.scenarios[0]
+        recorder.uri(feature.filename)
+        recorder.feature(feature)
+        recorder.scenario(scenario)
+        recorder.match(NoMatch())
+        recorder.eof()
+
+        scenario_index = [id(e) for e in elements].index(id(scenario))
+        expected = [
+            ("uri", None), ("feature", 0),
+            ("scenario", scenario_index),
+            ("match", None), ("eof", None),
+        ]
+        assert [event[:2] for event in recorder.events] == expected
+
+    def test_ignores_unknown_elements(self):
+        feature = parse_feature(FEATURE_TEXT)
+        recorder = FormatterEventRecorder()
+        recorder.reset(collect_model_elements(feature))
+
+        unknown_step = Step(u"<string>", 1, u"Given", u"given", u"unknown")
+        recorder.step(unknown_step)
+        assert recorder.events == []
+
+
+class TestSplitEventSegments(object):
+
+    def test_splits_events_by_model_element(self):
+        events = [
+            ("uri", None, u"a.feature"), ("feature", 0, {}), ("background", 1, {}),
+            ("scenario", 3, {}), ("step", 4, {}), ("match", None, None),
+            ("result", 4, {}),
+            ("rule", 5, {}), ("scenario", 6, {}), ("rule_finished", None, None),
+            ("eof", None, None),
+        ]
+        segments = split_event_segments(events)
+
+        assert [e[0] for e in segments[0][0]] == ["uri", "feature", "background"]
+        assert [e[0] for e in segments[0][1]] == ["eof"]
+        assert [e[0] for e in segments[3][0]] == ["scenario", "step", "match", "result"]
+        assert [e[0] for e in segments[5][0]] == ["rule"]
+        assert [e[0] for e in segments[5][1]] == ["rule_finished"]
+        assert [e[0] for e in segments[6][0]] == ["scenario"]
+
+
+class TestUseSelectedScenarios(object):
+
+    def test_runs_only_selected_scenarios_and_restores_feature(self):
+        feature = parse_feature(FEATURE_WITH_RULES_TEXT)
+        rule1 = feature.rules[0]
+        selected_scenario = rule1.scenarios[1]
+        run_items = list(feature.run_items)
+
+        with use_selected_scenarios(feature, set([id(selected_scenario)])):
+            assert feature.run_items == [rule1]
+            assert rule1.run_items == [selected_scenario]
+        assert feature.run_items == run_items
+        assert len(rule1.run_items) == 2
+
+    def test_selects_scenarios_of_scenario_outline(self):
+        feature = parse_feature(FEATURE_TEXT)
+        outline = feature.scenarios[1]
+        selected_scenario = outline.scenarios[1]
+
+        with use_selected_scenarios(feature, set([id(selected_scenario)])):
+            assert feature.run_items == [outline]
+            assert outline.scenarios == [selected_scenario]
+        assert len(outline.scenarios) == 2
+
+
+class TestParallelRunnerWorkItems(object):
+
+    @staticmethod
+    def make_runner(features, cmdline="--jobs=2"):
+        config = Configuration(cmdline, load_config=False)
+        runner = ParallelRunner(config)
+        runner.feature_elements = [collect_model_elements(feature)
+                                   for feature in features]
+        return runner
+
+    def test_make_work_items_splits_scenarios_and_outline_rows(self):
+        feature = parse_feature(FEATURE_TEXT)
+        runner = self.make_runner([feature])
+        work_items = runner.make_work_items([feature])
+
+        elements = runner.feature_elements[0]
+        locations = [item.locations(elements) for item in work_items]
+        assert len(work_items) == 3     # -- A1 and 2 outline scenarios.
+        assert [item.index for item in work_items] == [0, 1, 2]
+        assert [item.primary for item in work_items] == [True, False, False]
+        assert locations == [
+            [u"<string>:6"], [u"<string>:13"], [u"<string>:14"],
+        ]
+
+    def test_make_work_items_keeps_serial_rule_together(self):
+        feature = parse_feature(FEATURE_WITH_RULES_TEXT)
+        runner = self.make_runner([feature])
+        work_items = runner.make_work_items([feature])
+
+        elements = runner.feature_elements[0]
+        scenarios = [[elements[index].name for index in item.scenario_indexes]
+                     for item in work_items]
+        assert scenarios == [
+            [u"B1"], [u"R1.1"], [u"R1.2"], [u"R2.1", u"R2.2"],
+        ]
+
+    def test_make_work_items_keeps_serial_feature_together(self):
+        feature = parse_feature(u"@serial\n" + FEATURE_TEXT.lstrip())
+        runner = self.make_runner([feature])
+        work_items = runner.make_work_items([feature])
+
+        assert len(work_items) == 1
+        assert work_items[0].scenario_indexes is None
+
+    def test_make_work_items_adds_excluded_scenarios_to_primary_work_item(self):
+        feature = parse_feature(FEATURE_WITH_RULES_TEXT)
+        runner = self.make_runner([feature], "--jobs=2 --tags=~@serial")
+        work_items = runner.make_work_items([feature])
+
+        elements = runner.feature_elements[0]
+        scenarios = [set(elements[index].name for index in item.scenario_indexes)
+                     for item in work_items]
+        assert scenarios == [
+            set([u"B1", u"R2.1", u"R2.2"]), set([u"R1.1"]), set([u"R1.2"]),
+        ]
+
+    def test_schedule_work_items_uses_model_order_without_history(self):
+        feature = parse_feature(FEATURE_TEXT)
+        runner = self.make_runner([feature])
+        runner.work_items = runner.make_work_items([feature])
+        assert runner.schedule_work_items([feature]) == [0, 1, 2]
+
+    def test_schedule_work_items_runs_longest_work_items_first(self):
+        feature = parse_feature(FEATURE_TEXT)
+        runner = self.make_runner([feature])
+        runner.work_items = runner.make_work_items([feature])
+        scenarios = feature.walk_scenarios()
+        history = runner.duration_history = DurationHistory()
+        history.entries[history.make_key(scenarios[0])] = 0.1
+        history.entries[history.make_key(scenarios[1])] = 0.1
+        history.entries[history.make_key(scenarios[2])] = 2.0
+        assert runner.schedule_work_items([feature]) == [2, 0, 1]
+
+
+class TestThreadedRunner(object):
+
+    def test_make_worker_runner_uses_own_runtime_state(self):
+        config = Configuration("--jobs=2", load_config=False)
+        runner = ThreadedRunner(config)
+        runner.step_registry = StepRegistry()
+        runner.hooks["before_all"] = lambda ctx: None
+        runner.capture_dispatcher = ThreadCaptureDispatcher(config)
+        worker_runner = runner.make_worker_runner()
+
+        assert worker_runner.config is runner.config
+        assert worker_runner.hooks is runner.hooks
+        assert worker_runner.undefined_steps is not runner.undefined_steps
+        assert worker_runner.formatters is not runner.formatters
+        assert isinstance(worker_runner.capture_controller,
+                          ThreadCaptureController)
+        assert isinstance(worker_runner.step_registry, ThreadSafeStepRegistry)
+        assert worker_runner.step_registry.step_registry is runner.step_registry
+
+    def test_splits_features(self):
+        feature = parse_feature(FEATURE_TEXT)
+        config = Configuration("--jobs=2", load_config=False)
+        runner = ThreadedRunner(config)
+        runner.feature_elements = [collect_model_elements(feature)]
+        work_items = runner.make_work_items([feature])
+        assert len(work_items) == 3
+
+    def test_get_worker_feature_provides_copy_of_feature(self):
+        feature = parse_feature(u"@foo\n" + FEATURE_TEXT.lstrip())
+        config = Configuration("--jobs=2", load_config=False)
+        runner = ThreadedRunner(config)
+        runner.feature_elements = [collect_model_elements(feature)]
+        runner.capture_dispatcher = ThreadCaptureDispatcher(config)
+        worker_runner = runner.make_worker_runner()
+        feature_copy, elements = worker_runner.get_worker_feature(feature, 0)
+
+        assert feature_copy is not feature
+        assert feature_copy.tags == [u"foo"]
+        assert len(elements) == len(runner.feature_elements[0])
+        for element, original in zip(elements, runner.feature_elements[0]):
+            assert element is not original
+            assert element.location == original.location
+        assert worker_runner.get_worker_feature(feature, 0)[0] is feature_copy
@@ -2,9 +2,12 @@
 
 from __future__ import absolute_import, print_function
 from collections import OrderedDict
-from behave.runner_util import FeatureLineDatabase
-from behave.parser import parse_feature
+import io
+from behave.runner_util import FeatureLineDatabase, \
+    make_process_context, parse_features, parse_features_in_parallel
+from behave.parser import parse_feature, ParserError
 from behave.model import Feature, Rule, ScenarioOutline, Scenario, Background
+from behave.model_core import FileLocation
 import pytest
 
 
@@ -173,3 +176,55 @@ class TestFeatureLineDatabase(object):
 
             selected = line_database.select_run_item_by_line(next_line)
             assert selected is run_item
+
+
+# ---------------------------------------------------------------------------------------
+# TEST SUITE FOR: parse_features() with worker processes
+# ---------------------------------------------------------------------------------------
+requires_process_context = pytest.mark.skipif(make_process_context() is None,
+    reason="REQUIRES: multiprocessing with fork start method")
+
+
+@pytest.fixture
+def feature_files(tmp_path):
+    filenames = []
+    for filename, feature_text in sorted(feature_file_map.items()):
+        filename = str(tmp_path/filename)
+        with io.open(filename, "w", encoding="UTF-8") as feature_file:
+            feature_file.write(feature_text)
+        filenames.append(filename)
+    return filenames
+
+
+def select_scenario_names(features):
+    return [[(scenario.name, scenario.should_run())
+             for scenario in feature.walk_scenarios()]
+            for feature in features]
+
+
+@requires_process_context
+class TestParseFeaturesInParallel(object):
+    # pylint: disable=redefined-outer-name
+
+    def test_parse_features_provides_same_features_in_same_order(self, feature_files):
+        locations = [FileLocation(feature_files[2], 11), feature_files[0],
+                     FileLocation(feature_files[1], 5)]
+        features1 = parse_features(locations)
+        features2 = parse_features(locations, jobs=2)
+        assert [f.filename for f in features2] == [f.filename for f in features1]
+        assert select_scenario_names(features2) == select_scenario_names(features1)
+
+    def test_parse_features_raises_same_parser_error(self, feature_files):
+        with io.open(feature_files[1], "w", encoding="UTF-8") as feature_file:
+            feature_file.write(u"Scenario: Before any feature\n")
+        with pytest.raises(ParserError) as exc1:
+            parse_features(feature_files)
+        with pytest.raises(ParserError) as exc2:
+            parse_features(feature_files, jobs=2)
+        assert str(exc2.value) == str(exc1.value)
+
+    def test_parse_features_in_parallel_skips_files_with_errors(self, feature_files):
+        with io.open(feature_files[1], "w", encoding="UTF-8") as feature_file:
+            feature_file.write(u"Scenario: Before any feature\n")
+        features = parse_features_in_parallel(feature_files, jobs=2)
+        assert sorted(features.keys()) == sorted([feature_files[0], feature_files[2]])
@@ -1,9 +1,11 @@
 # -*- coding: UTF-8 -*-
 # pylint: disable=unused-wildcard-import
 from __future__ import absolute_import, with_statement
+import pytest
 from mock import Mock, patch
 from six.moves import range     # pylint: disable=redefined-builtin
 from behave import step_registry
+from behave.matchers import get_matcher_factory
 
 
 class TestStepRegistry(object):
@@ -93,3 +95,335 @@ class TestStepRegistry(object):
         assert wrapper(func) is func
         add_step_definition.assert_called_with(step_type, step_pattern, func)
 
+
+
+class TestStepRegistryIndex(object):
+    # pylint: disable=invalid-name, no-self-use
+
+    @staticmethod
+    def make_step(step_type, name):
+        step = Mock()
+        step.step_type = step_type
+        step.name = name
+        return step
+
+    def test_find_match_uses_first_registered_step_definition(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "a {thing} exists", lambda ctx: 1)
+        registry.add_step_definition("given", "{name} is logged in", lambda ctx: 2)
+        registry.add_step_definition("step", "a user is logged in", lambda ctx: 3)
+
+        step = self.make_step("given", "a user is logged in")
+        match = registry.find_match(step)
+        assert match.func(None) == 2
+
+    def test_find_match_is_case_insensitive_for_parse_matcher(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("when", "I press the {button} button",
+                                     lambda ctx, button: button)
+        step = self.make_step("when", "i press the OK button")
+        match = registry.find_match(step)
+        assert match is not None
+        assert match.arguments[0].value == "OK"
+
+    def test_candidates_are_selected_by_leading_word(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("then", "the result is {value:d}",
+                                     lambda ctx, value: 1)
+        registry.add_step_definition("then", "a warning is shown",
+                                     lambda ctx: 2)
+        registry.add_step_definition("then", "{count:d} items exist",
+                                     lambda ctx, count: 3)
+
+        index = registry.get_index("then")
+        candidates = index.candidates_for("the result is 42")
+        patterns = [x.pattern for x in candidates]
+        assert patterns == ["the result is {value:d}", "{count:d} items exist"]
+
+    def test_index_is_updated_when_step_definitions_are_added(self):
+        registry = step_registry.StepRegistry()
+        step = self.make_step("given", "a step passes")
+        assert registry.find_match(step) is None
+
+        registry.add_step_definition("step", "a step passes", lambda ctx: 1)
+        assert registry.find_match(step) is not None
+        assert registry.find_step_definition(step).pattern == "a step passes"
+
+
+@pytest.mark.parametrize("word, expected", [
+    (u"Given", u"given"),
+    (u"Überweisung", u"überweisung"),
+    (u"ſtep", None),   # -- LATIN SMALL LETTER LONG S: equal to "s" and "S"
+    (u"Straße", None),
+    (u"", None),
+])
+def test_make_index_key(word, expected):
+    assert step_registry.make_index_key(word) == expected
+
+
+class TestStepMatchCache(object):
+    # pylint: disable=invalid-name, no-self-use
+
+    @staticmethod
+    def make_step(step_type, name):
+        step = Mock()
+        step.step_type = step_type
+        step.name = name
+        return step
+
+    def test_find_match_returns_fresh_match_from_cache(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "{count:d} users exist",
+                                     lambda ctx, count: count)
+        step = self.make_step("given", "10 users exist")
+        match1 = registry.find_match(step)
+        match2 = registry.find_match(step)
+
+        assert registry.match_cache.misses == 1
+        assert registry.match_cache.hits == 1
+        assert match1 is not match2
+        assert match1 == match2
+        assert match1.arguments is not match2.arguments
+        assert match1.arguments[0] is not match2.arguments[0]
+        assert match2.arguments[0].value == 10
+
+    def test_find_match_without_evaluate_defers_type_conversion(self):
+        converted = []
+        def parse_number(text):
+            converted.append(text)
+            return int(text)
+        parse_number.pattern = r"\d+"
+
+        from behave.matchers import ParseMatcher, LazyMatch
+        ParseMatcher.register_type(NumberForLazyTest=parse_number)
+        try:
+            registry = step_registry.StepRegistry()
+            registry.add_step_definition("given",
+                                         "{count:NumberForLazyTest} users exist",
+                                         lambda ctx, count: count)
+            step = self.make_step("given", "10 users exist")
+            match1 = registry.find_match(step, evaluate=False)
+            assert isinstance(match1, LazyMatch)
+            assert match1.arguments[0].original == "10"
+            assert converted == []
+
+            match2 = registry.find_match(step)
+            match3 = registry.find_match(step)
+            assert not isinstance(match2, LazyMatch)
+            assert match2.arguments[0].value == 10
+            assert match3.arguments[0].value == 10
+            assert converted == ["10", "10"]
+            assert match1.arguments[0].value == 10
+            assert converted == ["10", "10", "10"]
+        finally:
+            ParseMatcher.custom_types.pop("NumberForLazyTest")
+
+    def test_find_match_provides_unshared_type_converted_values(self):
+        def parse_words(text):
+            return text.split(",")
+        parse_words.pattern = r"[\w,]+"
+
+        from behave.matchers import ParseMatcher
+        ParseMatcher.register_type(WordsForCacheTest=parse_words)
+        try:
+            registry = step_registry.StepRegistry()
+            registry.add_step_definition("given",
+                                         "the words {words:WordsForCacheTest}",
+                                         lambda ctx, words: words)
+            step = self.make_step("given", "the words a,b")
+            match1 = registry.find_match(step)
+            match1.arguments[0].value.append("MUT")
+            match2 = registry.find_match(step)
+            assert registry.match_cache.hits == 1
+            assert match1.arguments[0].value == ["a", "b", "MUT"]
+            assert match2.arguments[0].value == ["a", "b"]
+        finally:
+            ParseMatcher.custom_types.pop("WordsForCacheTest")
+
+    def test_find_match_caches_undefined_step(self):
+        registry = step_registry.StepRegistry()
+        step = self.make_step("when", "an undefined step is used")
+        assert registry.find_match(step) is None
+        assert registry.find_match(step) is None
+        assert registry.match_cache.hits == 1
+
+    def test_add_step_definition_invalidates_cache(self):
+        registry = step_registry.StepRegistry()
+        step = self.make_step("then", "a step passes")
+        assert registry.find_match(step) is None
+
+        registry.add_step_definition("then", "a step passes", lambda ctx: 1)
+        assert len(registry.match_cache) == 0
+        assert registry.find_match(step) is not None
+
+    def test_first_lookup_of_other_step_type_keeps_cache(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("step", "a step passes", lambda ctx: 1)
+        given_step = self.make_step("given", "a step passes")
+        then_step = self.make_step("then", "a step passes")
+        registry.find_match(given_step)
+        registry.find_match(then_step)
+        registry.find_match(given_step)
+        assert len(registry.match_cache) == 2
+        assert registry.match_cache.hits == 1
+
+    def test_register_type_invalidates_cache(self):
+        from behave.matchers import ParseMatcher, register_type
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("step", "a step passes", lambda ctx: 1)
+        step = self.make_step("given", "a step passes")
+        registry.find_match(step)
+        assert len(registry.match_cache) == 1
+
+        register_type(NumberForCacheTest=int)
+        ParseMatcher.custom_types.pop("NumberForCacheTest")
+        assert registry.find_match(step) is not None
+        assert registry.match_cache.hits == 0
+        assert registry.match_cache.misses == 2
+
+    def test_cache_is_bounded(self):
+        registry = step_registry.StepRegistry(match_cache_size=2)
+        for name in ("step 1", "step 2", "step 3"):
+            registry.find_match(self.make_step("given", name))
+        assert len(registry.match_cache) == 2
+
+    def test_cache_can_be_disabled(self):
+        registry = step_registry.StepRegistry(match_cache_size=0)
+        step = self.make_step("given", "a step passes")
+        registry.find_match(step)
+        registry.find_match(step)
+        assert len(registry.match_cache) == 0
+        assert registry.match_cache.hits == 0
+
+    def test_find_match_with_combined_regex_matchers(self):
+        registry = step_registry.StepRegistry(combine_regex_matchers=True)
+        matcher_factory = get_matcher_factory()
+        matcher_factory.use_step_matcher("re")
+        try:
+            registry.add_step_definition("given", r"a (?P<name>\w+) exists",
+                                         lambda ctx, name: 1)
+            registry.add_step_definition("given", r"a (\w+) is (\d+) old",
+                                         lambda ctx, name, age: 2)
+        finally:
+            matcher_factory.use_default_step_matcher()
+
+        step = Mock()
+        step.step_type = "given"
+        step.name = "a tree is 100 old"
+        match = registry.find_match(step)
+        assert match.func(None, None, None) == 2
+        assert [arg.value for arg in match.arguments] == ["tree", "100"]
+
+
+class TestStepRegistryAmbiguousStep(object):
+    # pylint: disable=invalid-name, no-self-use
+
+    def test_add_step_definition_raises_ambiguous_step(self):
+        def step_first(ctx, number, items):
+            pass
+
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "I buy {number:n} {items:w}",
+                                     step_first)
+        registry.add_step_definition("given", "a {name} exists", step_first)
+        with pytest.raises(step_registry.AmbiguousStep) as exc_info:
+            registry.add_step_definition("given", "I buy 10 apples",
+                                         lambda ctx: None)
+
+        expected = u"@given('I buy 10 apples') has already been defined in\n" \
+                   u"  existing step @given('I buy {number:n} {items:w}') at "
+        assert exc_info.value.args[0].startswith(expected)
+
+    def test_add_step_definition_detects_ambiguity_without_leading_word(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("when", "{name} logs in", lambda ctx: 1)
+        with pytest.raises(step_registry.AmbiguousStep):
+            registry.add_step_definition("when", "Alice logs in",
+                                         lambda ctx: 2)
+
+    def test_add_step_definition_ignores_same_step_definition(self):
+        def step_impl(ctx):
+            pass
+
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("then", "{{curly}} is shown", step_impl)
+        registry.add_step_definition("then", "{{curly}} is shown", step_impl)
+        assert len(registry.steps["then"]) == 1
+
+    def test_add_step_definition_checks_only_candidates(self):
+        registry = step_registry.StepRegistry()
+        for word in ("alpha", "beta", "gamma"):
+            registry.add_step_definition("given", word + " {value} exists",
+                                         lambda ctx, value: None)
+        index = registry._get_index_for(("given",), [registry.steps["given"]])
+        candidates = index.ambiguity_candidates_for(u"beta 42 exists")
+        assert [x.pattern for x in candidates] == ["beta {value} exists"]
+
+
+class TestStepMatchStatistics(object):
+    # pylint: disable=invalid-name, no-self-use
+
+    @staticmethod
+    def make_step(step_type, name):
+        step = Mock()
+        step.step_type = step_type
+        step.name = name
+        return step
+
+    def test_get_index_provides_immutable_candidate_views(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "a {thing} exists", lambda ctx: 1)
+        registry.add_step_definition("step", "a step passes", lambda ctx: 2)
+
+        index = registry.get_index("given")
+        candidates = index.candidates_for(u"a step passes")
+        assert isinstance(candidates, tuple)
+        assert [x.pattern for x in candidates] == ["a {thing} exists",
+                                                   "a step passes"]
+        assert registry.get_index("given") is index
+        with pytest.raises(AssertionError):
+            index.add(Mock())
+
+    def test_find_match_counts_per_step_type(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "a {thing} exists", lambda ctx: 1)
+        registry.add_step_definition("step", "a step passes", lambda ctx: 2)
+
+        registry.find_match(self.make_step("given", "a step passes"))
+        registry.find_match(self.make_step("given", "a step passes"))
+        registry.find_match(self.make_step("then", "a step fails"))
+
+        given_statistics = registry.match_statistics["given"]
+        assert given_statistics.lookups == 2
+        assert given_statistics.cache_hits == 1
+        assert given_statistics.matched == 2
+        assert given_statistics.tried_candidates == 2
+        then_statistics = registry.match_statistics["then"]
+        assert then_statistics.lookups == 1
+        assert then_statistics.undefined == 1
+        assert then_statistics.tried_candidates == 1
+        assert "given: lookups=2" in registry.describe_match_statistics()
+
+        registry.reset_match_statistics()
+        assert registry.match_statistics["given"].lookups == 0
+        assert registry.match_cache.hits == 0
+
+    def test_merge_match_statistics_adds_counters(self):
+        registry1 = step_registry.StepRegistry()
+        registry2 = step_registry.StepRegistry()
+        registry2.add_step_definition("given", "a step passes", lambda ctx: 1)
+        registry2.find_match(self.make_step("given", "a step passes"))
+        registry2.find_match(self.make_step("given", "a step passes"))
+        registry2.find_match(self.make_step("when", "a step fails"))
+
+        registry1.merge_match_statistics(registry2.match_statistics,
+                                         registry2.match_cache.hits,
+                                         registry2.match_cache.misses)
+        registry1.merge_match_statistics(registry2.match_statistics)
+        given_statistics = registry1.match_statistics["given"]
+        assert given_statistics.lookups == 4
+        assert given_statistics.cache_hits == 2
+        assert given_statistics.matched == 4
+        assert registry1.match_statistics["when"].undefined == 2
+        assert registry1.match_cache.hits == 1
+        assert registry1.match_cache.misses == 2